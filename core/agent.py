@@ -6,7 +6,7 @@ for the SUI/USD pair, confirming signals with Perplexity AI, and executing trade
 on the Bluefin Exchange.
 
 Requirements:
-- Python 3.8+
+- Python 3.10+
 - Required Python libraries:
   pip install python-dotenv playwright asyncio backoff
   python -m playwright install
@@ -44,57 +44,89 @@ import json
 import asyncio
 import random
 import logging
-import traceback
+from logging.handlers import RotatingFileHandler
 from datetime import datetime, timedelta
+from decimal import Decimal, ROUND_DOWN
 from pathlib import Path
+from types import MappingProxyType
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field, InitVar
 import backoff
 from dotenv import load_dotenv
-try:
-    from playwright.async_api import async_playwright
-    from playwright.sync_api import sync_playwright
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
+import importlib
+import importlib.util
+# Probe for Playwright without importing it; it is only loaded when a chart is captured
+PLAYWRIGHT_AVAILABLE = importlib.util.find_spec("playwright") is not None
+if not PLAYWRIGHT_AVAILABLE:
     logging.warning("Playwright not installed. Browser automation will not work.")
-    PLAYWRIGHT_AVAILABLE = False
-    async_playwright = None
-    sync_playwright = None
 from typing import Dict, List, Optional, Union, Any, TypeVar, Type, cast
-import requests
 import base64
-import aiohttp
-from anthropic import Client, RateLimitError, APITimeoutError
+import mmap
+import hashlib
+import struct
+import itertools
+import httpx
 import re
 import tempfile
 import argparse
-import uvicorn
-from fastapi import FastAPI, Request
+import threading
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import glob
 
-# Fix the import for mock_perplexity
-try:
+def _import_first(module_names):
+    """
+    Import and return the first available module from module_names.
+    
+    Availability is checked with importlib.util.find_spec, so missing modules are
+    skipped without executing an import that raises.
+    
+    Returns:
+        module: The imported module, or None if none of them are installed
+    """
+    for module_name in module_names:
+        try:
+            if importlib.util.find_spec(module_name) is None:
+                continue
+            return importlib.import_module(module_name)
+        except ImportError:
+            continue
+    return None
+
+# Import mock_perplexity relative to the package, or by path for direct script execution
+if __package__:
     from .mock_perplexity import MockPerplexityClient
-except ImportError:
-    # Fallback for direct script execution
-    try:
-        from mock_perplexity import MockPerplexityClient
-    except ImportError:
-        from core.mock_perplexity import MockPerplexityClient
+else:
+    MockPerplexityClient = _import_first(("mock_perplexity", "core.mock_perplexity")).MockPerplexityClient
+
+# Market data helper with a pooled keep-alive session, resolved once for get_market_price
+_bluefin_market = _import_first(("core.bluefin_market",))
+
+# JSON-style log record format, built once at import time
+LOG_FORMAT = json.dumps({
+    "timestamp": "%(asctime)s",
+    "level": "%(levelname)s",
+    "module": "%(module)s",
+    "message": "%(message)s"
+})
+
+# Size-based rotation for the trading log
+LOG_FILE = "logs/trading_log.log"
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
 
 # Configure logging first
 def setup_logging():
     """Set up logging configuration."""
-    log_format = json.dumps({
-        "timestamp": "%(asctime)s",
-        "level": "%(levelname)s",
-        "module": "%(module)s",
-        "message": "%(message)s"
-    })
+    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
     
     logging.basicConfig(
         level=logging.INFO,
-        format=log_format,
+        format=LOG_FORMAT,
         handlers=[
-            logging.FileHandler(f"logs/trading_log_{int(datetime.now().timestamp())}.log"),
+            RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT),
             logging.StreamHandler()
         ]
     )
@@ -149,6 +181,13 @@ except ImportError:
         "confidence_concordance_required": True
     }
 
+# Freeze the loaded parameters so they can't be mutated while the agent runs
+TRADING_PARAMS = MappingProxyType(TRADING_PARAMS)
+RISK_PARAMS = MappingProxyType(RISK_PARAMS)
+
+# Minimum analysis confidence required before acting on a recommendation
+MIN_CONFIDENCE = TRADING_PARAMS.get("min_confidence", 0.7)
+
 # Define default enums for order types and sides
 class ORDER_SIDE_ENUM:
     BUY = "BUY"
@@ -177,42 +216,61 @@ class BaseBluefinClient:
     async def create_order(self, **kwargs): pass
 
 # Initialize global variables
+client = None
 claude_client = None
+_http_session = None  # Shared httpx client for outbound HTTP, see get_http
+_set_leverage_fn = None  # Bound leverage setter, resolved in bind_client_methods
+_batch_set_leverage_fn = None  # Bound batch leverage setter, if the client supports one
+_fetch_account_fn = None  # Account-data reader for the client, resolved in bind_client_methods
+_place_order_fn = None  # Order placement path for the client, resolved in bind_client_methods
+start_time = time.time()
+
+# Anthropic API for Claude; only probed here, imported when the Claude client is created
+CLAUDE_AVAILABLE = importlib.util.find_spec("anthropic") is not None
+if not CLAUDE_AVAILABLE:
+    logger.warning("Anthropic Python SDK not installed. Claude AI will not be available.")
 
-# Import Anthropic API for Claude
+# Import watchdog for event-driven alert pickup
 try:
-    from anthropic import Client, RateLimitError, APITimeoutError
-    CLAUDE_AVAILABLE = True
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
 except ImportError:
-    logger.warning("Anthropic Python SDK not installed. Claude AI will not be available.")
-    CLAUDE_AVAILABLE = False
+    logger.warning("watchdog not installed. Alerts directory will be polled.")
+    WATCHDOG_AVAILABLE = False
 
-# Try to import SUI client first
+# Use msgspec's C JSON codec for API payloads and alert files when it is installed
 try:
-    # Import according to official documentation
-    from bluefin_v2_client import BluefinClient as BluefinSUIClient, Networks
-    BLUEFIN_CLIENT_SUI_AVAILABLE = True
-    BluefinClient = BluefinSUIClient
-    logger.info("Bluefin v2 client available")
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+    # Reusable codec instances skip the per-call setup of msgspec.json.decode/encode
+    json_loads = msgspec.json.Decoder().decode
+    json_dumps = msgspec.json.Encoder().encode
+    JSON_DECODE_ERRORS = (json.JSONDecodeError, msgspec.DecodeError)
 except ImportError:
-    logger.warning("Bluefin v2 client not available, will try SUI client")
-    BLUEFIN_CLIENT_SUI_AVAILABLE = False
+    MSGSPEC_AVAILABLE = False
+    json_loads = json.loads
+    JSON_DECODE_ERRORS = (json.JSONDecodeError,)
     
-    # Try to import SUI client
-    try:
-        # Import according to official documentation
-        from bluefin_client_sui import BluefinClient as BluefinSUIOldClient, Networks
-        BLUEFIN_V2_CLIENT_AVAILABLE = True
-        BluefinClient = BluefinSUIOldClient
-        logger.info("Bluefin SUI client available")
-    except ImportError:
-        logger.warning("Bluefin SUI client not available")
-        BLUEFIN_V2_CLIENT_AVAILABLE = False
-        logger.warning("Running in simulation mode without actual trading capabilities")
-        print("WARNING: No Bluefin client libraries found. Using mock implementation.")
-        print("Please install one of the following:")
-        print("   pip install git+https://github.com/fireflyprotocol/bluefin-v2-client-python.git")
-        print("   pip install git+https://github.com/fireflyprotocol/bluefin-client-python-sui.git")
+    def json_dumps(obj):
+        """Serialize obj to UTF-8 JSON bytes."""
+        return json.dumps(obj).encode()
+
+# Resolve the Bluefin client library once, in order of preference
+_bluefin_module = _import_first(("bluefin_v2_client", "bluefin_client_sui"))
+BLUEFIN_CLIENT_SUI_AVAILABLE = _bluefin_module is not None and _bluefin_module.__name__ == "bluefin_v2_client"
+BLUEFIN_V2_CLIENT_AVAILABLE = _bluefin_module is not None and _bluefin_module.__name__ == "bluefin_client_sui"
+
+if _bluefin_module is not None:
+    # Import according to official documentation
+    BluefinClient = _bluefin_module.BluefinClient
+    Networks = _bluefin_module.Networks
+    logger.info(f"Bluefin client available from {_bluefin_module.__name__}")
+else:
+    logger.warning("Running in simulation mode without actual trading capabilities")
+    print("WARNING: No Bluefin client libraries found. Using mock implementation.")
+    print("Please install one of the following:")
+    print("   pip install git+https://github.com/fireflyprotocol/bluefin-v2-client-python.git")
+    print("   pip install git+https://github.com/fireflyprotocol/bluefin-client-python-sui.git")
 
 # Warn if no Bluefin client libraries are available
 if not BLUEFIN_CLIENT_SUI_AVAILABLE and not BLUEFIN_V2_CLIENT_AVAILABLE:
@@ -230,9 +288,64 @@ class MockNetworks:
 # Set up Networks
 Networks = MockNetworks()
 
+# Network name -> Networks value, resolved once; accepts enum names and lowercase aliases
+_NETWORK_MAP: Dict[str, Any] = {
+    name: getattr(Networks, name)
+    for name in ("MAINNET", "TESTNET", "SUI_STAGING", "SUI_PROD")
+}
+_NETWORK_MAP.update({name.lower(): value for name, value in _NETWORK_MAP.items()})
+
+# Network selected for this run (env vars do not change during a run)
+BLUEFIN_NETWORK = os.getenv("BLUEFIN_NETWORK", "SUI_PROD")
+
 # Update BluefinClient variable definition
 BluefinClient = None  # Will be set to either the real client or MockBluefinClient
 
+# Mock top-of-book prices keyed by base symbol: base -> (bid, ask)
+_MOCK_BOOK_PRICES = {
+    'BTC': (50000, 50100),
+    'ETH': (3000, 3010),
+    'SUI': (1.5, 1.51),
+    'SOL': (100, 101),
+    'BNB': (400, 402)
+}
+_MOCK_BOOK_DEFAULT_PRICE = (100, 101)
+
+# symbol -> base symbol, prepopulated with the known perpetuals
+_base_symbol_cache: Dict[str, str] = {f"{base}-PERP": base for base in _MOCK_BOOK_PRICES}
+
+def get_base_symbol(symbol: str) -> str:
+    """Return the base asset of a trading symbol (e.g. "BTC" for "BTC-PERP")."""
+    base = _base_symbol_cache.get(symbol)
+    if base is None:
+        # Text before the first "-" or "/", e.g. "BTC-PERP" or "BTC/USD"
+        base = symbol.partition("-")[0].partition("/")[0]
+        _base_symbol_cache[symbol] = base
+    return base
+
+# Price multipliers and quantities for the five mock orderbook levels
+_MOCK_BID_FACTORS = (1, 0.99, 0.98, 0.97, 0.96)
+_MOCK_ASK_FACTORS = (1, 1.01, 1.02, 1.03, 1.04)
+_MOCK_LEVEL_QTYS = ('1.0', '2.0', '3.0', '5.0', '10.0')
+
+# Precomputed (bids, asks) level tuples per symbol
+_mock_orderbook_cache = {}
+
+def _mock_orderbook_levels(symbol):
+    """Return the immutable mock (bids, asks) levels for a symbol, building them once."""
+    levels = _mock_orderbook_cache.get(symbol)
+    if levels is None:
+        bid_price, ask_price = _MOCK_BOOK_PRICES.get(get_base_symbol(symbol), _MOCK_BOOK_DEFAULT_PRICE)
+        levels = (
+            tuple((str(bid_price * factor), qty) for factor, qty in zip(_MOCK_BID_FACTORS, _MOCK_LEVEL_QTYS)),
+            tuple((str(ask_price * factor), qty) for factor, qty in zip(_MOCK_ASK_FACTORS, _MOCK_LEVEL_QTYS))
+        )
+        _mock_orderbook_cache[symbol] = levels
+    return levels
+
+# Most open orders the mock client keeps before dropping the oldest
+MOCK_MAX_OPEN_ORDERS = 10_000
+
 # Update the mock BluefinClient to handle all methods needed
 class MockBluefinClient:
     """Mock implementation of the Bluefin client for testing and development"""
@@ -248,7 +361,9 @@ class MockBluefinClient:
             'SOL-PERP': 5,
             'BNB-PERP': 5
         }
-        self.orders = []  # Store mock orders
+        # Open mock orders indexed by id (oldest first) and by hash for O(1) cancels
+        self._by_id: OrderedDict[str, dict] = OrderedDict()
+        self._by_hash: dict[str, dict] = {}
         logger.info(f"Initialized MockBluefinClient on {self.network}")
         
     async def init(self, onboard_user=False):
@@ -301,48 +416,13 @@ class MockBluefinClient:
         
     async def get_orderbook(self, symbol):
         """Mock implementation of get_orderbook"""
-        # Create mock orderbook data with realistic structure
-        mock_prices = {
-            'BTC-PERP': {'bid': 50000, 'ask': 50100},
-            'ETH-PERP': {'bid': 3000, 'ask': 3010},
-            'SUI-PERP': {'bid': 1.5, 'ask': 1.51},
-            'SOL-PERP': {'bid': 100, 'ask': 101},
-            'BNB-PERP': {'bid': 400, 'ask': 402}
-        }
-        
-        # Extract base symbol from the full symbol
-        base_symbol = symbol.split('-')[0] if '-' in symbol else symbol.split('/')[0] if '/' in symbol else symbol
-        
-        # Find matching price or use default
-        price_data = None
-        for key, data in mock_prices.items():
-            if base_symbol in key:
-                price_data = data
-                break
-        
-        if not price_data:
-            price_data = {'bid': 100, 'ask': 101}  # Default fallback
-            
-        # Create mock orderbook with realistic structure
-        bid_price = price_data['bid']
-        ask_price = price_data['ask']
+        # Price levels for a symbol never change, so only the timestamp is built per call
+        bids, asks = _mock_orderbook_levels(symbol)
         
         return {
-            'bids': [
-                [str(bid_price), '1.0'],
-                [str(bid_price * 0.99), '2.0'],
-                [str(bid_price * 0.98), '3.0'],
-                [str(bid_price * 0.97), '5.0'],
-                [str(bid_price * 0.96), '10.0']
-            ],
-            'asks': [
-                [str(ask_price), '1.0'],
-                [str(ask_price * 1.01), '2.0'],
-                [str(ask_price * 1.02), '3.0'],
-                [str(ask_price * 1.03), '5.0'],
-                [str(ask_price * 1.04), '10.0']
-            ],
-            'timestamp': int(time.time() * 1000)
+            'bids': bids,
+            'asks': asks,
+            'timestamp': get_timestamp()
         }
         
     async def close_position(self, position_id):
@@ -395,7 +475,7 @@ class MockBluefinClient:
         Based on https://bluefin-exchange.readme.io/reference/sign-post-orders
         """
         logger.info(f"[MOCK] Posting signed order to exchange")
-        order_id = f"order_{get_timestamp()}"
+        order_id = next_order_id()
         
         # Create order response
         order = {
@@ -411,8 +491,13 @@ class MockBluefinClient:
             "timestamp": get_timestamp()
         }
         
-        # Store order
-        self.orders.append(order)
+        # Store order, evicting the oldest once the cap is reached; mock orders never fill,
+        # so without a bound a long simulation run would keep every order ever placed
+        self._by_id[order_id] = order
+        self._by_hash[order["orderHash"]] = order
+        while len(self._by_id) > MOCK_MAX_OPEN_ORDERS:
+            _, evicted = self._by_id.popitem(last=False)
+            self._by_hash.pop(evicted["orderHash"], None)
         
         return order
     
@@ -445,8 +530,8 @@ class MockBluefinClient:
     
     async def get_orders(self):
         """Mock implementation of get_orders"""
-        logger.info(f"[MOCK] Getting orders, count: {len(self.orders)}")
-        return self.orders
+        logger.info(f"[MOCK] Getting orders, count: {len(self._by_id)}")
+        return list(self._by_id.values())
     
     async def cancel_order(self, order_id=None, order_hash=None):
         """Mock implementation of cancel_order
@@ -454,15 +539,18 @@ class MockBluefinClient:
         """
         logger.info(f"[MOCK] Cancelling order: {order_id or order_hash}")
         
-        # Find order to cancel
-        for i, order in enumerate(self.orders):
-            if (order_id and order["id"] == order_id) or (order_hash and order["orderHash"] == order_hash):
-                # Remove from orders list
-                cancelled_order = self.orders.pop(i)
-                cancelled_order["status"] = "CANCELLED"
-                return {"success": True, "order": cancelled_order}
+        # Look up the order by id first, then by hash
+        cancelled_order = self._by_id.pop(order_id, None) if order_id else None
+        if cancelled_order is None and order_hash:
+            cancelled_order = self._by_hash.pop(order_hash, None)
+        if cancelled_order is None:
+            return {"success": False, "error": "Order not found"}
         
-        return {"success": False, "error": "Order not found"}
+        # Drop the order from both indices
+        self._by_id.pop(cancelled_order["id"], None)
+        self._by_hash.pop(cancelled_order["orderHash"], None)
+        cancelled_order["status"] = "CANCELLED"
+        return {"success": True, "order": cancelled_order}
 
 # Define mock client for testing if no libraries are available
 if BluefinClient is None:
@@ -475,49 +563,49 @@ if BluefinClient is None:
         
         class MockAPI:
             async def close_session(self):
-                print("Mock: Closing session")
+                logger.debug("Mock: Closing session")
                 
         async def init(self, *args, **kwargs):
-            print("Mock: Initializing client")
+            logger.debug("Mock: Initializing client")
             return self
             
         def get_public_address(self):
             return self.address
             
         async def connect(self):
-            print("Mock: Connecting to Bluefin")
+            logger.debug("Mock: Connecting to Bluefin")
             return True
             
         async def disconnect(self):
-            print("Mock: Disconnecting from Bluefin")
+            logger.debug("Mock: Disconnecting from Bluefin")
             return True
             
         async def get_user_account_data(self):
-            print("Mock: Getting user account data")
+            logger.debug("Mock: Getting user account data")
             return {"balance": 1000.0}
             
         async def get_user_margin(self):
-            print("Mock: Getting user margin")
+            logger.debug("Mock: Getting user margin")
             return {"available": 800.0}
             
         async def get_user_positions(self):
-            print("Mock: Getting user positions")
+            logger.debug("Mock: Getting user positions")
             return []
             
         async def get_user_leverage(self, symbol):
-            print(f"Mock: Getting user leverage for {symbol}")
+            logger.debug("Mock: Getting user leverage for %s", symbol)
             return 5
             
         def create_signed_order(self, signature_request):
-            print("Mock: Creating signed order")
+            logger.debug("Mock: Creating signed order")
             return {"signature": "0xmock_signature"}
             
         async def post_signed_order(self, signed_order):
-            print("Mock: Posting signed order")
+            logger.debug("Mock: Posting signed order")
             return {"orderId": "mock_order_id"}
 
         async def get_account_info(self):
-            print("Mock: Getting account info")
+            logger.debug("Mock: Getting account info")
             return {
                 "address": self.address,
                 "network": self.network,
@@ -527,9 +615,12 @@ if BluefinClient is None:
             }
             
         async def place_order(self, **kwargs):
-            print(f"Mock: Placing {kwargs.get('side')} order")
+            logger.debug("Mock: Placing %s order", kwargs.get('side'))
             return {"orderId": "mock_order_id"}
 
+# Layout used to pack mock order fields for hashing: symbol, side, size (1e-8 units), timestamp
+_ORDER_HASH_STRUCT = struct.Struct("<16sBqQ")
+
 # Define a mock OrderSignatureRequest class for simulation
 class MockOrderSignatureRequest:
     """Mock implementation of order signature request"""
@@ -541,21 +632,28 @@ class MockOrderSignatureRequest:
         self.price = price if price is not None else 0.0
         self.order_type = order_type
         self.leverage = leverage
-        self.timestamp = int(time.time() * 1000)
+        self.timestamp = get_timestamp()
         self.expiration = self.timestamp + 60000  # 1 minute expiration
         self.kwargs = kwargs
+        # Fixed-width binary encoding of the fields that identify the order
+        self._packed = _ORDER_HASH_STRUCT.pack(
+            symbol.encode()[:16],
+            0 if side == "BUY" else 1,
+            int(size * 1e8),
+            self.timestamp
+        )
         
     def get_signature_hash(self):
         """Get the signature hash for the order"""
-        # In a real implementation, this would create a hash of the order parameters
-        # For mock purposes, we'll just create a unique string
-        return f"0xSIGHASH_{self.symbol}_{self.side}_{self.size}_{self.timestamp}"
+        # In a real implementation, this would hash the signed order payload
+        # For mock purposes, a 16-byte digest of the order fields is enough
+        return "0x" + hashlib.blake2b(self._packed, digest_size=16, person=b"signature").hexdigest()
         
     def get_order_hash(self):
         """Get the order hash"""
         # In a real implementation, this would be a hash of the order parameters
-        # For mock purposes, we'll just create a unique string
-        return f"0xORDERHASH_{self.symbol}_{self.side}_{self.size}_{self.timestamp}"
+        # For mock purposes, a 16-byte digest of the order fields is enough
+        return "0x" + hashlib.blake2b(self._packed, digest_size=16, person=b"order").hexdigest()
 
 # Set OrderSignatureRequest to the mock class by default
 OrderSignatureRequest = MockOrderSignatureRequest
@@ -568,13 +666,34 @@ def initialize_risk_manager():
     logger.info(f"Risk parameters: {RISK_PARAMS}")
     return RISK_PARAMS
 
+@dataclass(slots=True, frozen=True)
+class RiskParams:
+    """Typed, immutable view of RISK_PARAMS for attribute access on hot paths."""
+    max_risk_per_trade: float = 0.02
+    max_open_positions: int = 3
+    max_daily_loss: float = 0.05
+    min_risk_reward_ratio: float = 2.0
+    initial_account_balance: float = 1000.0
+    # Keys RiskManager has always read. The shipped config doesn't define them,
+    # so these defaults are the limits RiskManager actually enforces.
+    risk_per_trade: float = 0.01
+    max_positions: int = 3
+    max_daily_drawdown: float = 0.05
+    
+    @classmethod
+    def from_mapping(cls, params):
+        """Build RiskParams from a config mapping, ignoring unknown keys."""
+        return cls(**{name: params[name] for name in cls.__dataclass_fields__ if name in params})
+
+RISK = RiskParams.from_mapping(RISK_PARAMS)
+
 # Add a simple RiskManager class to replace references to the risk_manager module
 class RiskManager:
-    def __init__(self, risk_params):
-        self.account_balance = risk_params.get("initial_account_balance", 1000)
-        self.max_risk_per_trade = risk_params.get("risk_per_trade", 0.01)
-        self.max_open_trades = risk_params.get("max_positions", 3)
-        self.max_daily_drawdown = risk_params.get("max_daily_drawdown", 0.05)
+    def __init__(self, risk: RiskParams):
+        self.account_balance = risk.initial_account_balance
+        self.max_risk_per_trade = risk.risk_per_trade
+        self.max_open_trades = risk.max_positions
+        self.max_daily_drawdown = risk.max_daily_drawdown
         self.daily_pnl = 0
         
     def update_account_balance(self, balance):
@@ -586,7 +705,7 @@ class RiskManager:
         if price_risk == 0:
             return 0
         return risk_amount / price_risk
-        
+    
     def can_open_new_trade(self):
         # Check if we have too many open positions
         if self.current_positions >= self.max_open_trades:
@@ -605,17 +724,36 @@ class RiskManager:
         return 0
 
 # Initialize the risk manager
-risk_manager = RiskManager(RISK_PARAMS)
+risk_manager = RiskManager(RISK)
+
+# Transient network errors retried on account reads
+RETRYABLE_ERRORS = (asyncio.TimeoutError, ConnectionError, OSError)
+
+async def _retry(fn, *args, tries=3, base=0.1, **kwargs):
+    """
+    Await fn(*args, **kwargs), retrying RETRYABLE_ERRORS with jittered exponential backoff.
+    
+    A plain loop rather than a decorator keeps the successful path to a single await.
+    
+    Args:
+        fn: Coroutine function to call
+        tries: Maximum number of attempts
+        base: Delay in seconds before the first retry; doubled on each further retry
+    """
+    for attempt in range(tries):
+        try:
+            return await fn(*args, **kwargs)
+        except RETRYABLE_ERRORS:
+            if attempt == tries - 1:
+                raise
+            await asyncio.sleep(base * 2 ** attempt + random.random() * 0.05)
 
-# Add retry decorator for API calls
-@backoff.on_exception(backoff.expo, 
-                     (asyncio.TimeoutError, ConnectionError, OSError),
-                     max_tries=3,
-                     max_time=30)
 async def get_account_info(client):
     """
     Retrieve account information and balances from Bluefin API.
     
+    Transient network errors are retried via _retry.
+    
     Note: The specific method calls and response format will depend on whether
     you're using the bluefin_client_sui library or bluefin.v2.client.
     
@@ -627,23 +765,37 @@ async def get_account_info(client):
     For bluefin.v2.client:
     - The API structure is slightly different; refer to its documentation
     """
+    fetch = _fetch_account_fn or select_account_fetcher(client)
+    return await _retry(_fetch_account_info, client, fetch)
+
+async def _fetch_account_sui(client):
+    """Read account data with bluefin_client_sui; the three reads are independent so run them concurrently."""
+    account_data, margin_data, positions = await asyncio.gather(
+        client.get_user_account_data(),
+        client.get_user_margin(),
+        client.get_user_positions()
+    )
+    return {
+        "balance": float(account_data.get("totalCollateralValue", 0)),
+        "availableMargin": float(margin_data.get("availableMargin", 0)),
+        "positions": positions or []
+    }
+
+async def _fetch_account_generic(client):
+    """Read account data from clients that expose get_account_info (bluefin.v2.client, mock)."""
+    return await client.get_account_info()
+
+def select_account_fetcher(trading_client):
+    """Pick the account-data reader matching the client's API."""
+    if hasattr(trading_client, 'get_user_account_data'):
+        return _fetch_account_sui
+    return _fetch_account_generic
+
+async def _fetch_account_info(client, fetch):
+    """Single attempt of get_account_info."""
     try:
-        # Get account data based on API
-        if hasattr(client, 'get_user_account_data'):
-            # bluefin_client_sui approach
-            account_data = await client.get_user_account_data()
-            margin_data = await client.get_user_margin()
-            positions = await client.get_user_positions() or []
-            
-            account_info = {
-                "balance": float(account_data.get("totalCollateralValue", 0)),
-                "availableMargin": float(margin_data.get("availableMargin", 0)),
-                "positions": positions
-            }
-        else:
-            # Fallback for other client implementations
-            account_info = await client.get_account_info()
-            
+        account_info = await fetch(client)
+        
         logger.info(f"Account info retrieved: balance={account_info['balance']}, "
                    f"margin={account_info['availableMargin']}, "
                    f"positions={len(account_info['positions'])}")
@@ -654,6 +806,35 @@ async def get_account_info(client):
         # Re-raise the exception to trigger the retry mechanism
         raise
 
+async def get_market_snapshot(client, symbols):
+    """
+    Fetch orderbooks for several symbols together with open orders and account equity.
+    
+    All requests are issued concurrently so the snapshot costs a single round-trip.
+    Transient network errors are retried via _retry.
+    
+    Args:
+        client: The Bluefin client
+        symbols: Trading symbols to fetch orderbooks for
+        
+    Returns:
+        dict: {"orderbooks": {symbol: orderbook}, "orders": [...], "equity": float}
+    """
+    return await _retry(_fetch_market_snapshot, client, symbols)
+
+async def _fetch_market_snapshot(client, symbols):
+    """Single attempt of get_market_snapshot."""
+    *orderbooks, orders, equity = await asyncio.gather(
+        *(client.get_orderbook(symbol) for symbol in symbols),
+        client.get_orders(),
+        client.get_account_equity()
+    )
+    return {
+        "orderbooks": dict(zip(symbols, orderbooks)),
+        "orders": orders,
+        "equity": equity
+    }
+
 # Default trading parameters
 DEFAULT_PARAMS = {
     "symbol": "SUI/USD",
@@ -698,10 +879,13 @@ def init_bluefin_client():
     
     If no environment variables are set or there's an error, it falls back to a mock client.
     
+    The global client is not set here; connect_bluefin_client publishes it once the
+    client is connected and bound, so no caller can pick up a half-initialized client.
+    
     Returns:
-        client: The initialized Bluefin client
+        client: The created, not yet connected, Bluefin client
     """
-    global client, MOCK_TRADING
+    global MOCK_TRADING
     
     try:
         # Check if we should use mock trading
@@ -716,15 +900,8 @@ def init_bluefin_client():
         if BLUEFIN_CLIENT_SUI_AVAILABLE and os.getenv("BLUEFIN_PRIVATE_KEY"):
             try:
                 # Get network configuration
-                network_name = os.getenv("BLUEFIN_NETWORK", "SUI_PROD")
-                
-                # Determine network value
-                network_value = None
-                if Networks is not None:
-                    if hasattr(Networks, network_name):
-                        network_value = getattr(Networks, network_name)
-                    elif network_name in ["mainnet", "testnet", "MAINNET", "TESTNET"]:
-                        network_value = getattr(Networks, network_name.upper(), None)
+                network_name = BLUEFIN_NETWORK
+                network_value = _NETWORK_MAP.get(network_name)
                 
                 if network_value is None:
                     logger.warning(f"Network {network_name} not found, using SUI_PROD as default")
@@ -732,18 +909,15 @@ def init_bluefin_client():
                 
                 logger.info(f"Initializing Bluefin SUI client with network: {network_name}")
                 
-                # Initialize the SUI-based client
-                client = BluefinClient(
+                # Initialize the SUI-based client; connect_bluefin_client awaits its init()
+                sui_client = BluefinClient(
                     are_terms_accepted=True,
                     network=network_value,
                     private_key=os.getenv("BLUEFIN_PRIVATE_KEY")
                 )
                 
-                # Initialize the client asynchronously
-                asyncio.create_task(client.init(onboard_user=True))
-                
-                logger.info("Bluefin SUI client initialized successfully")
-                return client
+                logger.info("Bluefin SUI client created")
+                return sui_client
                 
             except Exception as e:
                 logger.error(f"Error initializing Bluefin SUI client: {e}")
@@ -755,14 +929,14 @@ def init_bluefin_client():
                 logger.info("Initializing Bluefin API client")
                 
                 # Initialize the API-based client
-                client = BluefinClient(
+                api_client = BluefinClient(
                     api_key=os.getenv("BLUEFIN_API_KEY"),
                     api_secret=os.getenv("BLUEFIN_API_SECRET"),
                     use_testnet=os.getenv("BLUEFIN_TESTNET", "false").lower() in ["true", "1", "yes"]
                 )
                 
                 logger.info("Bluefin API client initialized successfully")
-                return client
+                return api_client
                 
             except Exception as e:
                 logger.error(f"Error initializing Bluefin API client: {e}")
@@ -798,43 +972,80 @@ def init_claude_client():
         
         # Initialize Claude client with API key
         logger.info("Initializing Claude client with Anthropic API key")
-        claude_client = Client(api_key=api_key, max_retries=3)
+        from anthropic import AsyncAnthropic
+        claude_client = AsyncAnthropic(
+            api_key=api_key,
+            max_retries=3,
+            timeout=httpx.Timeout(30.0, connect=5.0)
+        )
         
         return claude_client
     except Exception as e:
         logger.error(f"Failed to initialize Claude client: {e}")
         return None
 
+_client_init_lock = asyncio.Lock()
+
+async def connect_bluefin_client():
+    """
+    Create and connect the shared Bluefin client once for the whole process.
+    
+    Concurrent callers wait for the same initialization; later calls return the
+    existing client. The client is kept open for the lifetime of the agent.
+    
+    Returns:
+        client: The connected Bluefin client (real or mock)
+    """
+    global client
+    
+    async with _client_init_lock:
+        if client is not None:
+            return client
+        
+        # Initialize Bluefin client
+        logger.info("Initializing Bluefin client")
+        new_client = init_bluefin_client()
+        
+        # Initialize the Bluefin client if it's not a mock client
+        if not isinstance(new_client, MockBluefinClient) and not MOCK_TRADING:
+            try:
+                # According to https://bluefin-exchange.readme.io/reference/initialization
+                # The client needs to be initialized with await client.init()
+                logger.info("Initializing real Bluefin client connection...")
+                await new_client.init(onboard_user=True)
+                logger.info("Bluefin client initialized successfully")
+                
+                # Get and log the public address
+                public_address = new_client.get_public_address()
+                logger.info(f"Connected with wallet address: {public_address}")
+                
+                # Get account details
+                account_details = await new_client.get_account_info()
+                logger.info(f"Account details: {account_details}")
+            except Exception as e:
+                logger.exception("Error initializing Bluefin client: %s", e)
+                logger.warning("Falling back to mock client")
+                new_client = MockBluefinClient()
+        
+        # Resolve client-specific methods once for the hot trading paths
+        bind_client_methods(new_client)
+        
+        # Publish only now: callers skip the lock when client is already set
+        client = new_client
+        return client
+
 async def init_clients():
     """Initialize API clients"""
-    # Define a global client for the whole application
-    global client, claude_client
+    global claude_client
     
-    # Initialize Bluefin client
-    logger.info("Initializing Bluefin client")
-    client = init_bluefin_client()
+    await connect_bluefin_client()
     
-    # Initialize the Bluefin client if it's not a mock client
-    if not isinstance(client, MockBluefinClient) and not MOCK_TRADING:
+    # Warm up the browser so the first chart capture doesn't pay the launch cost
+    if PLAYWRIGHT_AVAILABLE:
         try:
-            # According to https://bluefin-exchange.readme.io/reference/initialization
-            # The client needs to be initialized with await client.init()
-            logger.info("Initializing real Bluefin client connection...")
-            await client.init(onboard_user=True)
-            logger.info("Bluefin client initialized successfully")
-            
-            # Get and log the public address
-            public_address = client.get_public_address()
-            logger.info(f"Connected with wallet address: {public_address}")
-            
-            # Get account details
-            account_details = await client.get_account_info()
-            logger.info(f"Account details: {account_details}")
+            await browser_pool.start()
         except Exception as e:
-            logger.error(f"Error initializing Bluefin client: {e}")
-            logger.error(traceback.format_exc())
-            logger.warning("Falling back to mock client")
-            client = MockBluefinClient()
+            logger.warning(f"Could not start browser pool, it will be retried on the first chart capture: {e}")
     
     # Initialize Claude client 
     logger.info("Initializing Claude client")
@@ -842,51 +1053,300 @@ async def init_clients():
     
     return client
 
-def get_timestamp():
-    """Get current timestamp in YYYYMMDD_HHMMSS format"""
-    return datetime.now().strftime("%Y%m%d_%H%M%S")
+def bind_client_methods(trading_client):
+    """
+    Resolve the client's optional methods once so hot paths avoid per-call hasattr checks.
+    
+    Args:
+        trading_client: The initialized Bluefin client (real or mock)
+    """
+    global _set_leverage_fn, _batch_set_leverage_fn, _fetch_account_fn, _place_order_fn
+    
+    _fetch_account_fn = select_account_fetcher(trading_client)
+    _place_order_fn = select_order_placer(trading_client)
+    
+    _set_leverage_fn = getattr(trading_client, 'set_leverage', None) or getattr(trading_client, 'adjust_leverage', None)
+    if _set_leverage_fn is None:
+        logger.warning("Client has no set_leverage or adjust_leverage method, leverage cannot be adjusted")
+    
+    _batch_set_leverage_fn = getattr(trading_client, 'batch_set_leverage', None)
+
+def get_timestamp() -> int:
+    """Get the current Unix timestamp in milliseconds"""
+    return time.time_ns() // 1_000_000
+
+# Last second formatted by get_file_timestamp and its formatted value
+_file_ts_second = None
+_file_ts_value = ""
+
+def get_file_timestamp() -> str:
+    """Get the current local time in YYYYMMDD_HHMMSS format, reformatting at most once per second"""
+    global _file_ts_second, _file_ts_value
+    
+    second = int(time.time())
+    if second != _file_ts_second:
+        t = time.localtime(second)
+        _file_ts_value = f"{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}_{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}"
+        _file_ts_second = second
+    return _file_ts_value
+
+# (second, formatted value) last produced by get_iso_timestamp; one tuple so the API thread reads a consistent pair
+_iso_ts_cache = (None, "")
+
+def get_iso_timestamp() -> str:
+    """Get the current local time as an ISO 8601 string, reformatting at most once per second"""
+    global _iso_ts_cache
+    
+    second = int(time.time())
+    cached_second, value = _iso_ts_cache
+    if second != cached_second:
+        value = datetime.fromtimestamp(second).isoformat()
+        _iso_ts_cache = (second, value)
+    return value
+
+# Sequence for mock order IDs; unique even for orders placed in the same millisecond
+_ORDER_SEQ = itertools.count(int(time.time()))
+
+def next_order_id() -> str:
+    """Get the next unique mock order ID"""
+    return f"order_{next(_ORDER_SEQ)}"
+
+# Maximum number of TradingView pages loaded at the same time
+CHART_CAPTURE_CONCURRENCY = 3
+
+# Navigation timeout for TradingView chart pages
+CHART_PAGE_TIMEOUT_MS = 15000
+
+# Browser context options for chart pages; service workers only add load overhead
+CHART_CONTEXT_OPTIONS = {"service_workers": "block"}
+
+# Resource types the chart screenshot doesn't need; the chart itself is drawn on a canvas.
+# Matched on the request's resource type rather than a URL glob, because CDN asset URLs
+# usually carry query strings (logo.png?v=3) that an extension glob doesn't match.
+CHART_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
 
 def opposite_type(order_type: str) -> str:
     """Get the opposite order type (BUY -> SELL, SELL -> BUY)"""
     return "BUY" if order_type == "SELL" else "SELL"
 
-def capture_chart_screenshot(ticker, timeframe="1D"):
-    """Capture a screenshot of the TradingView chart for the given ticker and timeframe"""
+async def _block_chart_resources(route):
+    """Abort requests for resources the chart screenshot does not use and let the rest through."""
+    if route.request.resource_type in CHART_BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def _new_chart_context(browser):
+    """Open a browser context tuned for loading TradingView chart pages."""
+    context = await browser.new_context(**CHART_CONTEXT_OPTIONS)
+    await context.route("**/*", _block_chart_resources)
+    return context
+
+def _async_playwright():
+    """Import Playwright on first use and return its async context manager."""
+    from playwright.async_api import async_playwright
+    return async_playwright()
+
+class BrowserPool:
+    """
+    Keeps one warm Chromium browser and a fixed set of browser contexts alive
+    for the lifetime of the agent so chart captures skip the browser launch.
+    """
+    
+    def __init__(self):
+        self.browser = None
+        self._playwright = None
+        self._contexts = None
+        self._start_lock = asyncio.Lock()
+    
+    @property
+    def started(self):
+        return self.browser is not None
+    
+    async def start(self, size=CHART_CAPTURE_CONCURRENCY):
+        """Launch the browser and pre-open `size` contexts; concurrent callers share one launch."""
+        async with self._start_lock:
+            if self.started:
+                return
+            try:
+                self._playwright = await _async_playwright().start()
+                self.browser = await self._playwright.chromium.launch(headless=True)
+                self._contexts = asyncio.Queue()
+                for _ in range(size):
+                    self._contexts.put_nowait(await _new_chart_context(self.browser))
+            except Exception:
+                # Don't leave a half-started browser behind; the next call retries from scratch
+                await self.close()
+                raise
+            logger.info(f"Browser pool started with {size} contexts")
+    
+    async def acquire(self):
+        """Wait for a free browser context."""
+        return await self._contexts.get()
+    
+    def release(self, context):
+        """Return a browser context to the pool."""
+        self._contexts.put_nowait(context)
+    
+    async def close(self):
+        """Close the browser and stop Playwright."""
+        if self.browser is not None:
+            await self.browser.close()
+            self.browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        self._contexts = None
+
+# Shared browser pool, started in init_clients when Playwright is available
+browser_pool = BrowserPool()
+
+async def _capture_chart(context, ticker, timeframe):
+    """Capture a single TradingView chart in the given browser context."""
+    page = await context.new_page()
+    try:
+        # Navigate to TradingView chart for the specified ticker
+        # Don't wait for the full load event; third-party trackers and ads hold it back
+        await page.goto(f"https://www.tradingview.com/chart/?symbol={ticker}", wait_until="domcontentloaded", timeout=CHART_PAGE_TIMEOUT_MS)
+        
+        # Wait for the chart container to be rendered and visible
+        await page.locator(".chart-container").wait_for(state="visible", timeout=CHART_PAGE_TIMEOUT_MS)
+        
+        # Take screenshot
+        timestamp = get_file_timestamp()
+        screenshot_path = f"screenshots/{ticker}_{timeframe}_{timestamp}.png"
+        await page.screenshot(path=screenshot_path)
+        
+        return screenshot_path
+    finally:
+        await page.close()
+
+async def _capture_chart_pooled(ticker, timeframe):
+    """Capture a chart using a context borrowed from the shared browser pool."""
+    context = await browser_pool.acquire()
+    try:
+        return await _capture_chart(context, ticker, timeframe)
+    finally:
+        browser_pool.release(context)
+
+async def capture_chart_screenshots(tickers, timeframe="1D"):
+    """
+    Capture TradingView chart screenshots for several tickers concurrently.
+    
+    Pages are loaded in contexts borrowed from the shared browser pool, which is
+    started on first use if init_clients has not already done so. The pool's
+    CHART_CAPTURE_CONCURRENCY contexts bound how many pages load at the same time.
+    
+    Args:
+        tickers: Symbols to capture
+        timeframe: Chart timeframe used in the screenshot file names
+        
+    Returns:
+        list: Screenshot paths in the same order as tickers, None for failed captures
+    """
     # Check if Playwright is available
-    if not PLAYWRIGHT_AVAILABLE or sync_playwright is None:
+    if not PLAYWRIGHT_AVAILABLE:
         logger.error("Playwright is not available. Cannot capture chart screenshot.")
-        return None
-        
+        return [None] * len(tickers)
+    
+    # Create screenshots directory if it doesn't exist
+    os.makedirs("screenshots", exist_ok=True)
+    
     try:
-        with sync_playwright() as p:
-            # Create screenshots directory if it doesn't exist
-            os.makedirs("screenshots", exist_ok=True)
-            
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            
-            # Navigate to TradingView chart for the specified ticker
-            page.goto(f"https://www.tradingview.com/chart/?symbol={ticker}")
-            
-            # Wait for chart to load completely
-            page.wait_for_selector(".chart-container")
-            
-            # Take screenshot
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            screenshot_path = f"screenshots/{ticker}_{timeframe}_{timestamp}.png"
-            page.screenshot(path=screenshot_path)
-            browser.close()
-            
-            return screenshot_path
+        await browser_pool.start()
     except Exception as e:
-        logger.error(f"Error capturing chart screenshot: {e}")
+        logger.error(f"Error capturing chart screenshots: {e}")
+        return [None] * len(tickers)
+    
+    async def capture(ticker):
+        try:
+            return await _capture_chart_pooled(ticker, timeframe)
+        except Exception as e:
+            logger.error(f"Error capturing chart screenshot for {ticker}: {e}")
+            return None
+    
+    return await asyncio.gather(*(capture(ticker) for ticker in tickers))
+
+async def capture_chart_screenshot(ticker, timeframe="1D"):
+    """Capture a screenshot of the TradingView chart for the given ticker and timeframe"""
+    screenshot_paths = await capture_chart_screenshots([ticker], timeframe)
+    return screenshot_paths[0]
+
+async def get_http():
+    """
+    Return the shared httpx client, creating it on first use.
+    
+    HTTP/2 is enabled when the h2 package is installed, so concurrent requests to
+    the same API are multiplexed over a single TLS connection.
+    """
+    global _http_session
+    
+    if _http_session is None or _http_session.is_closed:
+        _http_session = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            timeout=httpx.Timeout(20.0, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    return _http_session
+
+async def close_http():
+    """Close the shared httpx client."""
+    global _http_session
+    
+    if _http_session is not None and not _http_session.is_closed:
+        await _http_session.aclose()
+    _http_session = None
+
+# How long an LLM analysis of the same input is reused, and how many are kept
+ANALYSIS_CACHE_TTL = 300
+ANALYSIS_CACHE_SIZE = 512
+
+# LRU cache of analyses: key -> (monotonic time stored, analysis)
+_analysis_cache = OrderedDict()
+
+def get_cached_analysis(key):
+    """Return a cached analysis for key if it is younger than ANALYSIS_CACHE_TTL, else None."""
+    entry = _analysis_cache.get(key)
+    if entry is None:
         return None
+    stored_at, analysis = entry
+    if time.monotonic() - stored_at > ANALYSIS_CACHE_TTL:
+        del _analysis_cache[key]
+        return None
+    _analysis_cache.move_to_end(key)
+    return analysis
+
+def cache_analysis(key, analysis):
+    """Store an analysis, evicting the least recently used entries beyond ANALYSIS_CACHE_SIZE."""
+    _analysis_cache[key] = (time.monotonic(), analysis)
+    _analysis_cache.move_to_end(key)
+    while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+        _analysis_cache.popitem(last=False)
+
+# Perplexity responses worth retrying (rate limiting and transient server errors)
+PERPLEXITY_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_perplexity_headers = None  # Request headers, built once from PERPLEXITY_API_KEY
+
+def get_perplexity_headers():
+    """Return the Perplexity request headers, or None if no API key is configured."""
+    global _perplexity_headers
+    
+    if _perplexity_headers is None:
+        api_key = os.environ.get("PERPLEXITY_API_KEY")
+        if not api_key:
+            return None
+        _perplexity_headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+    return _perplexity_headers
 
-def analyze_chart_with_perplexity(screenshot_path, ticker):
+@backoff.on_exception(backoff.expo, httpx.HTTPError, max_tries=3)
+async def analyze_chart_with_perplexity(screenshot_path, ticker):
     """Analyze a chart screenshot using Perplexity AI"""
-    # Get API key from environment
-    api_key = os.environ.get("PERPLEXITY_API_KEY")
-    if not api_key:
+    headers = get_perplexity_headers()
+    if headers is None:
         logger.error("Perplexity API key not found in environment variables")
         return None
     
@@ -902,25 +1362,46 @@ def analyze_chart_with_perplexity(screenshot_path, ticker):
         "max_tokens": 1000
     }
     
-    # Setup headers
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
+    # Reuse a recent answer to the identical prompt
+    cache_key = ("perplexity", ticker, prompt["model"], prompt["messages"][0]["content"])
+    cached = get_cached_analysis(cache_key)
+    if cached is not None:
+        logger.info(f"Using cached Perplexity analysis for {ticker}")
+        return cached
     
-    # Send to Perplexity API
-    response = requests.post("https://api.perplexity.ai/chat/completions", json=prompt, headers=headers)
+    # Send to Perplexity API over the shared keep-alive client
+    http = await get_http()
+    response = await http.post("https://api.perplexity.ai/chat/completions", content=json_dumps(prompt), headers=headers)
     
     # Process response
     if response.status_code == 200:
-        analysis = response.json()
-        # Debug: Print the raw response
-        logger.info(f"Raw Perplexity response: {json.dumps(analysis, indent=2)}")
+        analysis = json_loads(response.content)
+        # Debug: Print the raw response (only serialized when debug logging is on)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Raw Perplexity response: %s", json.dumps(analysis, indent=2))
+        cache_analysis(cache_key, analysis)
         return analysis
+    elif response.status_code in PERPLEXITY_RETRY_STATUSES:
+        # Raise HTTPStatusError so the backoff decorator retries the request
+        logger.warning(f"Perplexity API returned {response.status_code}, retrying")
+        response.raise_for_status()
     else:
         logger.error(f"Error from Perplexity API: {response.status_code} - {response.text}")
         return None
 
+def _claude_giveup(e):
+    """Give up on anything but rate limits and timeouts; anthropic is loaded once a Claude client exists."""
+    from anthropic import RateLimitError, APITimeoutError
+    return not isinstance(e, (RateLimitError, APITimeoutError))
+
+@backoff.on_exception(backoff.expo,
+                      Exception,
+                      giveup=_claude_giveup,
+                      max_tries=3)
+async def create_claude_message(**kwargs):
+    """Send a message request to Claude, retrying on rate limits and timeouts."""
+    return await claude_client.messages.create(**kwargs)
+
 async def analyze_chart_with_claude(screenshot_path, ticker):
     """
     Analyze a chart screenshot using Claude AI
@@ -951,14 +1432,22 @@ async def analyze_chart_with_claude(screenshot_path, ticker):
             model = os.getenv("CLAUDE_MODEL", "claude-3.7-sonnet")
             temperature = float(os.getenv("CLAUDE_TEMPERATURE", 0.2))
         
-        # Check if screenshot exists
-        if not os.path.exists(screenshot_path):
+        # Map the screenshot instead of copying it into a bytes object; a missing file is reported below
+        try:
+            with open(screenshot_path, "rb") as image_file, \
+                    mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as image:
+                # Reuse a recent analysis of the identical chart image
+                cache_key = ("claude", hashlib.sha256(image).hexdigest(), ticker, model)
+                cached = get_cached_analysis(cache_key)
+                if cached is not None:
+                    logger.info(f"Using cached Claude analysis for {ticker}")
+                    return cached
+                
+                # Convert image to base64 for transmission
+                encoded_image = base64.b64encode(image).decode('ascii')
+        except FileNotFoundError:
             logger.error(f"Screenshot not found at {screenshot_path}")
             return {"error": f"Screenshot not found at {screenshot_path}"}
-            
-        # Convert image to base64 for transmission
-        with open(screenshot_path, "rb") as image_file:
-            encoded_image = base64.b64encode(image_file.read()).decode('utf-8')
         
         # Construct system prompt
         system_prompt = f"""You are an expert cryptocurrency trader and technical analyst.
@@ -976,8 +1465,8 @@ Format your analysis in a structured way with clear sections."""
         # Make API call to Claude
         logger.info(f"Sending chart analysis request to Claude for {ticker}")
         
-        # Create message with anthropic.Client - using correct schema
-        response = claude_client.messages.create(
+        # Create message with anthropic.AsyncAnthropic - using correct schema
+        response = await create_claude_message(
             model=model,
             max_tokens=max_tokens,
             temperature=temperature,
@@ -1003,41 +1492,15 @@ Format your analysis in a structured way with clear sections."""
             ]
         )
         
-        # Extract text from response safely
-        analysis_text = ""
-        
-        # Handle different possible response structures
+        # Extract text from the response's text content blocks
         try:
-            # If response is an object with content attribute
-            if hasattr(response, "content"):
-                content = response.content
-                if isinstance(content, list):
-                    for block in content:
-                        if isinstance(block, dict) and "text" in block:
-                            analysis_text += block["text"]
-                        elif hasattr(block, "type") and getattr(block, "type", "") == "text":
-                            # Use getattr with default to avoid attribute errors
-                            text = getattr(block, "text", "")
-                            if text:
-                                analysis_text += text
-                        elif isinstance(block, str):
-                            analysis_text += block
-            # If response is a dictionary
-            elif isinstance(response, dict) and "content" in response:
-                content = response["content"]
-                if isinstance(content, list):
-                    for block in content:
-                        if isinstance(block, dict) and "text" in block:
-                            analysis_text += block["text"]
-                elif isinstance(content, str):
-                    analysis_text = content
-                    
-            # If no text extracted but we have a response, use string representation as fallback
-            if not analysis_text and response:
-                analysis_text = str(response)
-        except Exception as e:
+            analysis_text = "".join(block.text for block in response.content if getattr(block, "type", None) == "text")
+        except (AttributeError, TypeError) as e:
             logger.error(f"Error parsing Claude response: {str(e)}")
-            # Fallback to string representation
+            analysis_text = ""
+        
+        # If no text extracted but we have a response, use string representation as fallback
+        if not analysis_text and response:
             analysis_text = str(response)
                 
         if not analysis_text:
@@ -1046,6 +1509,7 @@ Format your analysis in a structured way with clear sections."""
             
         # Parse the analysis to extract trading recommendation
         trading_analysis = parse_claude_analysis(analysis_text, ticker)
+        cache_analysis(cache_key, trading_analysis)
         
         return trading_analysis
             
@@ -1053,6 +1517,19 @@ Format your analysis in a structured way with clear sections."""
         logger.error(f"Error in Claude chart analysis: {str(e)}")
         return {"error": f"Claude analysis error: {str(e)}"}
 
+# Patterns for pulling trade levels out of Claude's analysis text
+# One alternation for all levels; the named group that matched is the recommendation field
+_CLAUDE_LEVELS_RE = re.compile(
+    r"confidence[:\s]+(?P<confidence>\d+)"
+    r"|entry[:\s]+[$]?(?P<entry_price>\d+(?:\.\d+)?)"
+    r"|stop[:\s]*loss[:\s]+[$]?(?P<stop_loss>\d+(?:\.\d+)?)"
+    r"|take[:\s]*profit[:\s]+[$]?(?P<take_profit>\d+(?:\.\d+)?)",
+    re.IGNORECASE
+)
+# Action/trend keywords; the lookahead also reports keywords that overlap each other
+_CLAUDE_KEYWORD_RE = re.compile(r"(?=(buy|long|sell|short|hold|neutral|bullish|bearish))", re.IGNORECASE)
+_CLAUDE_RISK_REWARD_RE = re.compile(r"risk[:/]reward[:\s]+(\d+(?:\.\d+)?)[:\s]*(?:to)[:\s]*(\d+(?:\.\d+)?)", re.IGNORECASE)
+
 def parse_claude_analysis(analysis_text, ticker):
     """
     Parse Claude's analysis to extract trading recommendations
@@ -1077,43 +1554,35 @@ def parse_claude_analysis(analysis_text, ticker):
     }
     
     try:
+        # Collect every action/trend keyword in a single pass over the text
+        keywords = {match.group(1).upper() for match in _CLAUDE_KEYWORD_RE.finditer(analysis_text)}
+        
         # Extract action (BUY/SELL/HOLD)
-        if "BUY" in analysis_text.upper() or "LONG" in analysis_text.upper():
+        if "BUY" in keywords or "LONG" in keywords:
             recommendation["action"] = "BUY"
-        elif "SELL" in analysis_text.upper() or "SHORT" in analysis_text.upper():
+        elif "SELL" in keywords or "SHORT" in keywords:
             recommendation["action"] = "SELL"
-        elif "HOLD" in analysis_text.upper() or "NEUTRAL" in analysis_text.upper():
+        elif "HOLD" in keywords or "NEUTRAL" in keywords:
             recommendation["action"] = "NONE"
             
         # Extract trend
-        if "BULLISH" in analysis_text.upper():
+        if "BULLISH" in keywords:
             recommendation["trend"] = "BULLISH"
-        elif "BEARISH" in analysis_text.upper():
+        elif "BEARISH" in keywords:
             recommendation["trend"] = "BEARISH"
             
         # Extract confidence score (1-10)
-        confidence_match = re.search(r"confidence[:\s]+(\d+)(?:\s*\/\s*10)?", analysis_text.lower())
-        if confidence_match:
-            recommendation["confidence"] = int(confidence_match.group(1))
-            
-        # Extract price levels (using regex)
-        # Entry price
-        entry_match = re.search(r"entry[:\s]+[$]?(\d+(?:\.\d+)?)", analysis_text.lower())
-        if entry_match:
-            recommendation["entry_price"] = float(entry_match.group(1))
-            
-        # Stop loss
-        sl_match = re.search(r"stop[:\s]*loss[:\s]+[$]?(\d+(?:\.\d+)?)", analysis_text.lower())
-        if sl_match:
-            recommendation["stop_loss"] = float(sl_match.group(1))
-            
-        # Take profit
-        tp_match = re.search(r"take[:\s]*profit[:\s]+[$]?(\d+(?:\.\d+)?)", analysis_text.lower())
-        if tp_match:
-            recommendation["take_profit"] = float(tp_match.group(1))
+        # Extract confidence and price levels in one pass; the first mention of each wins
+        found = set()
+        for match in _CLAUDE_LEVELS_RE.finditer(analysis_text):
+            field = match.lastgroup
+            if field not in found:
+                found.add(field)
+                value = match.group(field)
+                recommendation[field] = int(value) if field == "confidence" else float(value)
             
         # Risk/reward ratio
-        rr_match = re.search(r"risk[:/]reward[:\s]+(\d+(?:\.\d+)?)[:\s]*(?:to)[:\s]*(\d+(?:\.\d+)?)", analysis_text.lower())
+        rr_match = _CLAUDE_RISK_REWARD_RE.search(analysis_text)
         if rr_match:
             reward = float(rr_match.group(2))
             risk = float(rr_match.group(1))
@@ -1131,22 +1600,44 @@ async def execute_trade_when_appropriate(analysis):
         logger.warning("Invalid analysis data, cannot execute trade")
         return
         
-    trade_rec = analysis.get("recommendation", {})
+    trade_rec = analysis.get("recommendation") or {}
     action = trade_rec.get("action", "NONE")
     confidence = trade_rec.get("confidence", 0)
     
-    # Default min confidence
-    min_confidence = 0.7
-    
-    # Get min_confidence from TRADING_PARAMS if available
-    if 'TRADING_PARAMS' in globals() and isinstance(TRADING_PARAMS, dict):
-        min_confidence = TRADING_PARAMS.get("min_confidence", min_confidence)
+    # Cheapest rejection first: no action means nothing to compare
+    if action == "NONE" or confidence < MIN_CONFIDENCE:
+        logger.info("Not executing trade. Action: %s, Confidence: %s", action, confidence)
+        return
     
-    if action != "NONE" and confidence >= min_confidence:
-        logger.info(f"Executing {action} trade with confidence {confidence}")
-        # Execute trade logic here
-    else:
-        logger.info(f"Not executing trade. Action: {action}, Confidence: {confidence}")
+    logger.info("Executing %s trade with confidence %s", action, confidence)
+    # Execute trade logic here
+
+# Explicit recommendation statements in Perplexity's analysis text
+_PERPLEXITY_BUY_RE = re.compile(r'recommendation.*?\b(buy|long)\b|\b(buy|long)\b.*?recommended', re.IGNORECASE)
+_PERPLEXITY_SELL_RE = re.compile(r'recommendation.*?\b(sell|short)\b|\b(sell|short)\b.*?recommended', re.IGNORECASE)
+_PERPLEXITY_HOLD_RE = re.compile(r'recommendation.*?\b(hold|neutral|accumulate)\b|\b(hold|neutral|accumulate)\b.*?recommended', re.IGNORECASE)
+
+# Sentiment indicator words per recommendation bucket
+_SENTIMENT_INDICATORS = {
+    "buy": ("buy", "bullish", "uptrend", "long", "positive", "increase", "growth"),
+    "sell": ("sell", "bearish", "downtrend", "short", "negative", "decrease", "fall"),
+    "hold": ("hold", "neutral", "mixed", "cautious", "moderate", "balanced", "sideways", "accumulate")
+}
+_SENTIMENT_BUCKET = {word: bucket for bucket, words in _SENTIMENT_INDICATORS.items() for word in words}
+
+# Finds every indicator occurrence in one scan; the lookahead also reports overlapping words
+_SENTIMENT_RE = re.compile(
+    "(?=(" + "|".join(_SENTIMENT_BUCKET) + "))",
+    re.IGNORECASE
+)
+
+# Price levels mentioned in Perplexity's analysis text
+_PERPLEXITY_LEVELS_RE = re.compile(
+    r"(?:current|price|trading at)[:\s]+\$?(?P<entry_price>\d+(?:\.\d+)?)"
+    r"|(?:stop[- ]loss|support)[:\s]+\$?(?P<stop_loss>\d+(?:\.\d+)?)"
+    r"|(?:take[- ]profit|target|resistance)[:\s]+\$?(?P<take_profit>\d+(?:\.\d+)?)",
+    re.IGNORECASE
+)
 
 def parse_perplexity_analysis(analysis, ticker):
     """
@@ -1190,34 +1681,34 @@ def parse_perplexity_analysis(analysis, ticker):
             return recommendation
             
         # Debug: Print the extracted text
-        logger.info(f"Extracted analysis text: {analysis_text[:200]}...")
+        logger.info("Extracted analysis text: %.200s...", analysis_text)
+        
+        # Lowercase once for the plain substring checks below
+        lowered = analysis_text.lower()
         
         # Detect recommendation type based on explicit statements
         recommendation_type = "NONE"
         confidence = 0.0
         
         # Look for explicit recommendations
-        if re.search(r'recommendation.*?\b(buy|long)\b', analysis_text.lower()) or re.search(r'\b(buy|long)\b.*?recommended', analysis_text.lower()):
+        if _PERPLEXITY_BUY_RE.search(analysis_text):
             recommendation_type = "BUY"
             confidence = 0.8
-        elif re.search(r'recommendation.*?\b(sell|short)\b', analysis_text.lower()) or re.search(r'\b(sell|short)\b.*?recommended', analysis_text.lower()):
+        elif _PERPLEXITY_SELL_RE.search(analysis_text):
             recommendation_type = "SELL"
             confidence = 0.8
-        elif re.search(r'recommendation.*?\b(hold|neutral|accumulate)\b', analysis_text.lower()) or re.search(r'\b(hold|neutral|accumulate)\b.*?recommended', analysis_text.lower()):
+        elif _PERPLEXITY_HOLD_RE.search(analysis_text):
             recommendation_type = "HOLD"
             confidence = 0.7
             
         # If no explicit recommendation, use sentiment analysis
         if recommendation_type == "NONE":
-            # Look for buy/sell signals
-            buy_indicators = ["buy", "bullish", "uptrend", "long", "positive", "increase", "growth"]
-            sell_indicators = ["sell", "bearish", "downtrend", "short", "negative", "decrease", "fall"]
-            hold_indicators = ["hold", "neutral", "mixed", "cautious", "moderate", "balanced", "sideways", "accumulate"]
-            
-            # Count mentions of bullish/bearish terms
-            buy_count = sum(1 for indicator in buy_indicators if indicator in analysis_text.lower())
-            sell_count = sum(1 for indicator in sell_indicators if indicator in analysis_text.lower())
-            hold_count = sum(1 for indicator in hold_indicators if indicator in analysis_text.lower())
+            # Count how many distinct bullish/bearish/neutral terms are mentioned, in a single pass
+            mentioned = {match.group(1).lower() for match in _SENTIMENT_RE.finditer(analysis_text)}
+            counts = {"buy": 0, "sell": 0, "hold": 0}
+            for word in mentioned:
+                counts[_SENTIMENT_BUCKET[word]] += 1
+            buy_count, sell_count, hold_count = counts["buy"], counts["sell"], counts["hold"]
             
             # Determine action based on sentiment
             if buy_count > sell_count + hold_count:
@@ -1233,27 +1724,21 @@ def parse_perplexity_analysis(analysis, ticker):
         recommendation["recommendation"]["action"] = recommendation_type
         recommendation["recommendation"]["confidence"] = confidence
             
-        # Extract price targets if available
-        price_match = re.search(r"(?:current|price|trading at)[:\s]+\$?(\d+(?:\.\d+)?)", analysis_text.lower())
-        if price_match:
-            recommendation["recommendation"]["entry_price"] = float(price_match.group(1))
-            
-        # Look for support levels as potential stop loss
-        sl_match = re.search(r"(?:stop[- ]loss|support)[:\s]+\$?(\d+(?:\.\d+)?)", analysis_text.lower())
-        if sl_match:
-            recommendation["recommendation"]["stop_loss"] = float(sl_match.group(1))
-            
-        # Look for resistance as potential take profit
-        tp_match = re.search(r"(?:take[- ]profit|target|resistance)[:\s]+\$?(\d+(?:\.\d+)?)", analysis_text.lower())
-        if tp_match:
-            recommendation["recommendation"]["take_profit"] = float(tp_match.group(1))
+        # Extract the current price, support (stop loss) and resistance/target (take profit)
+        # levels in one pass; the first mention of each wins
+        found = set()
+        for match in _PERPLEXITY_LEVELS_RE.finditer(analysis_text):
+            field = match.lastgroup
+            if field not in found:
+                found.add(field)
+                recommendation["recommendation"][field] = float(match.group(field))
             
         # Try to extract timeframe
-        if "short-term" in analysis_text.lower() or "day" in analysis_text.lower() or "hourly" in analysis_text.lower():
+        if "short-term" in lowered or "day" in lowered or "hourly" in lowered:
             recommendation["recommendation"]["timeframe"] = "short-term"
-        elif "medium-term" in analysis_text.lower() or "week" in analysis_text.lower() or "monthly" in analysis_text.lower():
+        elif "medium-term" in lowered or "week" in lowered or "monthly" in lowered:
             recommendation["recommendation"]["timeframe"] = "medium-term"
-        elif "long-term" in analysis_text.lower() or "year" in analysis_text.lower():
+        elif "long-term" in lowered or "year" in lowered:
             recommendation["recommendation"]["timeframe"] = "long-term"
             
         # Calculate risk/reward if both stop-loss and take-profit are available
@@ -1280,6 +1765,89 @@ def parse_perplexity_analysis(analysis, ticker):
         
     return recommendation
 
+async def analyze_chart_with_ai(screenshot_path, ticker):
+    """
+    Analyze a chart with Claude and Perplexity concurrently.
+    
+    Both providers are network-bound, so running them together halves the
+    wall time of the AI confirmation step.
+    
+    Args:
+        screenshot_path: Path to the chart screenshot
+        ticker: Symbol being analyzed
+        
+    Returns:
+        dict: Claude analysis, parsed Perplexity analysis and whether their actions agree
+    """
+    claude_analysis, perplexity_response = await asyncio.gather(
+        analyze_chart_with_claude(screenshot_path, ticker),
+        analyze_chart_with_perplexity(screenshot_path, ticker),
+        return_exceptions=True
+    )
+    
+    if isinstance(claude_analysis, BaseException):
+        logger.error(f"Claude analysis failed for {ticker}: {claude_analysis}")
+        claude_analysis = None
+    if isinstance(perplexity_response, BaseException):
+        logger.error(f"Perplexity analysis failed for {ticker}: {perplexity_response}")
+        perplexity_response = None
+    
+    perplexity_analysis = parse_perplexity_analysis(perplexity_response, ticker) if perplexity_response else None
+    
+    # Reconcile the two recommendations
+    claude_action = (claude_analysis or {}).get("action", "NONE")
+    perplexity_action = (perplexity_analysis or {}).get("recommendation", {}).get("action", "NONE")
+    
+    return {
+        "symbol": ticker,
+        "claude": claude_analysis,
+        "perplexity": perplexity_analysis,
+        "actions_agree": claude_action == perplexity_action and claude_action != "NONE"
+    }
+
+async def _place_order_signed(trading_client, symbol, side, size, price, order_type, leverage, **kwargs):
+    """Place an order through the Bluefin sign-and-post flow."""
+    # Step 1: Create order signature request
+    signature_request = trading_client.create_order_signature_request(
+        symbol=symbol,
+        side=side,
+        size=size,
+        price=price,
+        order_type=order_type,
+        leverage=leverage,
+        **kwargs
+    )
+    
+    # Step 2: Sign the order
+    signed_order = trading_client.create_signed_order(signature_request)
+    logger.info("Created signed order: %s", signed_order)
+    
+    # Step 3: Post the signed order
+    return await trading_client.post_signed_order(signed_order)
+
+async def _place_order_direct(trading_client, symbol, side, size, price, order_type, leverage, **kwargs):
+    """Place an order directly, for clients without the signature flow."""
+    return await trading_client.place_order(
+        symbol=symbol,
+        side=side,
+        quantity=size,
+        price=price,
+        order_type=order_type,
+        leverage=leverage,
+        **kwargs
+    )
+
+def select_order_placer(trading_client):
+    """Pick the order placement path supported by the client."""
+    if (hasattr(trading_client, "create_order_signature_request")
+            and hasattr(trading_client, "create_signed_order")
+            and hasattr(trading_client, "post_signed_order")):
+        return _place_order_signed
+    return _place_order_direct
+
+class TradeNotSubmitted(RuntimeError):
+    """Raised when a transient error stops a trade before any order is sent to the exchange."""
+
 async def execute_trade(symbol: str, side: str, position_size: float = None, risk_percentage: float = None, stop_loss_percentage: float = None, take_profit_percentage: float = None, leverage: int = None, order_type: str = "MARKET", price: float = None):
     """
     Execute a real trade on the Bluefin exchange.
@@ -1303,7 +1871,11 @@ async def execute_trade(symbol: str, side: str, position_size: float = None, ris
     5. Calculate and place a stop loss order based on the environment variable
     
     Returns:
-        dict: The order response from Bluefin (real or mock)
+        dict: The order response from Bluefin (real or mock), or None if the trade failed
+        
+    Raises:
+        TradeNotSubmitted: If no market price was available or the exchange could not be
+            reached before the order was placed; the trade can safely be retried
     """
     global client
     
@@ -1324,71 +1896,48 @@ async def execute_trade(symbol: str, side: str, position_size: float = None, ris
         if leverage is None and os.getenv("DEFAULT_LEVERAGE"):
             leverage = int(os.getenv("DEFAULT_LEVERAGE", 5))
             
-        # Check if client is initialized
-        if client is None:
-            logger.error("Trade client not initialized")
-            return None
-        
-        # Calculate position size if not provided
-        if position_size is None:
-            position_size = await calculate_position_size(
-                symbol=symbol,
-                side=side,
-                risk_percentage=risk_percentage,
-                stop_loss_percentage=stop_loss_percentage
-            )
-            
-        logger.info(f"Executing trade: {side} {position_size} of {symbol} with order type {order_type}")
-        
         # Get parameters for symbol
         leverage_value = leverage or int(os.getenv("DEFAULT_LEVERAGE", "5"))
         
-        # Ensure leverage is set correctly
-        await ensure_leverage(symbol, leverage_value)
-        
-        # Get current market price from Bluefin exchange API
-        logger.info(f"Getting current market price for {symbol} from Bluefin exchange")
-        market_price = await get_market_price(symbol)
+        try:
+            # Connect the shared client on first use; it stays open between trades
+            if client is None:
+                await connect_bluefin_client()
+            
+            # Setting leverage, fetching the market price and sizing the position are
+            # independent round-trips, so run them together. Sizing reads the same price
+            # through get_market_price's cache, so the price is only fetched once.
+            logger.info(f"Getting current market price for {symbol} from Bluefin exchange")
+            pre_trade = [ensure_leverage(symbol, leverage_value), get_market_price(symbol)]
+            if position_size is None:
+                pre_trade.append(calculate_position_size(
+                    symbol=symbol,
+                    side=side,
+                    risk_percentage=risk_percentage,
+                    stop_loss_percentage=stop_loss_percentage
+                ))
+            _, market_price, *sized = await asyncio.gather(*pre_trade)
+        except (MarketPriceUnavailable, *RETRYABLE_ERRORS) as e:
+            # Nothing has been sent to the exchange yet, so the caller may retry
+            raise TradeNotSubmitted(f"{symbol}: {e!r}") from e
+        if sized:
+            position_size = sized[0]
         logger.info(f"Current market price for {symbol}: {market_price}")
         
+        logger.info(f"Executing trade: {side} {position_size} of {symbol} with order type {order_type}")
+        
         # For LIMIT orders, use the current market price if none provided
         if order_type == "LIMIT" and price is None:
             price = market_price
             logger.info(f"Setting limit price to current market price: {price}")
         
-        # Create order using the signature flow
+        # Order placement path (signature flow or direct) resolved at client init
+        place_order = _place_order_fn or select_order_placer(client)
+        
+        # Place the main order
         try:
-            # Check if client supports the signature flow
-            if hasattr(client, "create_order_signature_request") and hasattr(client, "create_signed_order") and hasattr(client, "post_signed_order"):
-                # Step 1: Create order signature request
-                signature_request = client.create_order_signature_request(
-                    symbol=symbol,
-                    side=side,
-                    size=position_size,
-                    price=price,
-                    order_type=order_type,
-                    leverage=leverage_value
-                )
-                logger.info(f"Created order signature request")
-                
-                # Step 2: Sign the order
-                signed_order = client.create_signed_order(signature_request)
-                logger.info(f"Created signed order: {signed_order}")
-                
-                # Step 3: Post the signed order
-                main_order = await client.post_signed_order(signed_order)
-                logger.info(f"Posted signed order, response: {main_order}")
-            else:
-                # Fallback to direct order placement if signature flow not supported
-                main_order = await client.place_order(
-                    symbol=symbol,
-                    side=side,
-                    quantity=position_size,
-                    price=price,
-                    order_type=order_type,
-                    leverage=leverage_value
-                )
-                logger.info(f"Placed order directly, response: {main_order}")
+            main_order = await place_order(client, symbol, side, position_size, price, order_type, leverage_value)
+            logger.info("Placed order, response: %s", main_order)
             
             # Place stop loss order using STOP_MARKET type
             if stop_loss_percentage and stop_loss_percentage > 0 and main_order:
@@ -1409,32 +1958,11 @@ async def execute_trade(symbol: str, side: str, position_size: float = None, ris
                     
                     logger.info(f"Placing stop loss order at {stop_price} for {position_size} {symbol}")
                     
-                    if hasattr(client, "create_order_signature_request"):
-                        # Use signature flow for stop loss
-                        sl_signature_request = client.create_order_signature_request(
-                            symbol=symbol,
-                            side=stop_loss_side,
-                            size=position_size,
-                            price=stop_price,
-                            order_type="STOP_MARKET",
-                            reduce_only=True,
-                            leverage=leverage_value
-                        )
-                        sl_signed_order = client.create_signed_order(sl_signature_request)
-                        sl_order = await client.post_signed_order(sl_signed_order)
-                        logger.info(f"Placed stop loss order, response: {sl_order}")
-                    else:
-                        # Use direct order placement
-                        sl_order = await client.place_order(
-                            symbol=symbol,
-                            side=stop_loss_side,
-                            quantity=position_size,
-                            price=stop_price,
-                            order_type="STOP_MARKET",
-                            reduce_only=True,
-                            leverage=leverage_value
-                        )
-                        logger.info(f"Placed stop loss order, response: {sl_order}")
+                    sl_order = await place_order(
+                        client, symbol, stop_loss_side, position_size, stop_price, "STOP_MARKET", leverage_value,
+                        reduce_only=True
+                    )
+                    logger.info("Placed stop loss order, response: %s", sl_order)
                 except Exception as e:
                     logger.error(f"Error placing stop loss order: {e}", exc_info=True)
             
@@ -1456,32 +1984,11 @@ async def execute_trade(symbol: str, side: str, position_size: float = None, ris
                     
                     logger.info(f"Placing take profit order at {take_profit_price} for {position_size} {symbol}")
                     
-                    if hasattr(client, "create_order_signature_request"):
-                        # Use signature flow for take profit
-                        tp_signature_request = client.create_order_signature_request(
-                            symbol=symbol,
-                            side=take_profit_side,
-                            size=position_size,
-                            price=take_profit_price,
-                            order_type="LIMIT",
-                            reduce_only=True,
-                            leverage=leverage_value
-                        )
-                        tp_signed_order = client.create_signed_order(tp_signature_request)
-                        tp_order = await client.post_signed_order(tp_signed_order)
-                        logger.info(f"Placed take profit order, response: {tp_order}")
-                    else:
-                        # Use direct order placement
-                        tp_order = await client.place_order(
-                            symbol=symbol,
-                            side=take_profit_side,
-                            quantity=position_size,
-                            price=take_profit_price,
-                            order_type="LIMIT",
-                            reduce_only=True,
-                            leverage=leverage_value
-                        )
-                        logger.info(f"Placed take profit order, response: {tp_order}")
+                    tp_order = await place_order(
+                        client, symbol, take_profit_side, position_size, take_profit_price, "LIMIT", leverage_value,
+                        reduce_only=True
+                    )
+                    logger.info("Placed take profit order, response: %s", tp_order)
                 except Exception as e:
                     logger.error(f"Error placing take profit order: {e}", exc_info=True)
             
@@ -1489,10 +1996,318 @@ async def execute_trade(symbol: str, side: str, position_size: float = None, ris
         except Exception as e:
             logger.error(f"Error executing trade: {e}", exc_info=True)
             return None
+    except TradeNotSubmitted as e:
+        logger.warning(f"Trade not submitted for {symbol}: {e.__cause__!r}")
+        raise
     except Exception as e:
         logger.error(f"Error in execute_trade: {e}", exc_info=True)
         return None
 
+# Seconds between safety rescans of the alerts directory while the watcher is active
+ALERT_RESCAN_INTERVAL = 30
+
+# Grace period after a file event so the webhook server can finish writing the file
+ALERT_SETTLE_DELAY = 0.2
+
+class AlertWatcher:
+    """
+    Wakes the alert loop when a JSON file lands in the alerts directory.
+    
+    Uses watchdog's native observer (inotify on Linux, FSEvents on macOS); the
+    observer thread only sets an asyncio.Event on the agent's loop.
+    """
+    
+    def __init__(self, directory="alerts"):
+        self.directory = directory
+        self._observer = None
+        self._loop = None
+        self._wakeup = asyncio.Event()
+    
+    def start(self):
+        """Start watching; returns False when watchdog is unavailable and polling must be used."""
+        if not WATCHDOG_AVAILABLE:
+            return False
+        self._loop = asyncio.get_running_loop()
+        self._observer = Observer()
+        self._observer.schedule(self, self.directory, recursive=False)
+        self._observer.start()
+        logger.info(f"Watching {self.directory} for new alerts")
+        return True
+    
+    def dispatch(self, event):
+        """watchdog callback, runs on the observer thread."""
+        if event.is_directory or event.event_type not in ("created", "moved", "closed"):
+            return
+        path = getattr(event, "dest_path", "") or event.src_path
+        if str(path).endswith(".json"):
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+    
+    async def wait(self, timeout=ALERT_RESCAN_INTERVAL):
+        """Wait until a new alert file appears or timeout seconds pass."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return
+        await asyncio.sleep(ALERT_SETTLE_DELAY)
+        self._wakeup.clear()
+    
+    def stop(self):
+        """Stop the observer thread."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+# VuManChu Cipher B signal types that can trigger a trade
+CIPHER_B_SIGNALS = frozenset({"GREEN_CIRCLE", "RED_CIRCLE", "GOLD_CIRCLE", "PURPLE_TRIANGLE"})
+
+# Cipher B alert action -> (trade direction, order side)
+CIPHER_B_ACTIONS = MappingProxyType({
+    "BUY": ("Bullish", ORDER_SIDE.BUY),
+    "SELL": ("Bearish", ORDER_SIDE.SELL)
+})
+
+# Concurrent alert handlers per scan; bounds the number of trades in flight at once
+ALERT_WORKERS = max(1, int(os.getenv("ALERT_WORKERS", "4")))
+
+# Scans an alert may fail in before it is moved to the dead-letter directory
+ALERT_MAX_ATTEMPTS = 3
+ALERT_DEAD_LETTER_DIR = os.path.join("alerts", "dead")
+
+# Alert path -> failed attempts so far
+_alert_attempts: Dict[str, int] = {}
+
+def _list_alert_files(directory="alerts"):
+    """Return the paths of pending alert files, creating the directory if needed (run in a worker thread)."""
+    try:
+        with os.scandir(directory) as entries:
+            # DirEntry carries the file type from the directory read, so this costs no stat() per file
+            return [
+                entry.path for entry in entries
+                if entry.name.endswith(".json") and entry.is_file(follow_symlinks=False)
+            ]
+    except FileNotFoundError:
+        os.makedirs(directory, exist_ok=True)
+        return []
+
+# Read size for alert files; webhook payloads are a few hundred bytes
+ALERT_READ_SIZE = 65536
+
+def _read_small(path):
+    """Read a small file with raw fd calls, skipping the buffered file object layer."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        data = os.read(fd, ALERT_READ_SIZE)
+        if len(data) < ALERT_READ_SIZE:
+            return data
+        # Larger than expected: read the remainder rather than truncating the alert
+        chunks = [data]
+        while data:
+            data = os.read(fd, ALERT_READ_SIZE)
+            chunks.append(data)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+def _load_alert(alert_path):
+    """Read and decode one alert file (run in a worker thread)."""
+    return json_loads(_read_small(alert_path))
+
+def _scan_and_load_alerts(directory="alerts"):
+    """
+    List and decode all pending alert files in a single worker thread.
+    
+    Args:
+        directory: Directory holding the alert files
+        
+    Returns:
+        list: (path, alert) pairs, where alert is the exception raised if the file could not be loaded
+    """
+    results = []
+    for alert_path in _list_alert_files(directory):
+        try:
+            results.append((alert_path, _load_alert(alert_path)))
+        except Exception as e:
+            results.append((alert_path, e))
+    return results
+
+def _remove_alert_files(alert_paths, directory="alerts"):
+    """Delete processed alert files, then sync the directory once for the whole batch (run in a worker thread)."""
+    for alert_path in alert_paths:
+        try:
+            os.unlink(alert_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Error deleting alert file {alert_path}: {e}")
+    
+    # Persist the directory entry removals with a single fsync (not supported on Windows)
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+def _dead_letter_alert_files(alert_paths, directory=ALERT_DEAD_LETTER_DIR):
+    """Move alert files that keep failing out of the scan directory (run in a worker thread)."""
+    os.makedirs(directory, exist_ok=True)
+    for alert_path in alert_paths:
+        try:
+            os.replace(alert_path, os.path.join(directory, os.path.basename(alert_path)))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Error moving alert file {alert_path} to {directory}: {e}")
+
+def _record_alert_failures(alert_paths):
+    """Count a failed attempt for each alert and return the ones that have used up their retries."""
+    exhausted = []
+    for alert_path in alert_paths:
+        attempts = _alert_attempts.get(alert_path, 0) + 1
+        if attempts >= ALERT_MAX_ATTEMPTS:
+            _alert_attempts.pop(alert_path, None)
+            exhausted.append(alert_path)
+        else:
+            _alert_attempts[alert_path] = attempts
+    return exhausted
+
+async def handle_alert(alert_path, alert):
+    """
+    Act on a single decoded alert.
+    
+    Args:
+        alert_path: Path of the alert file, used for logging
+        alert: The decoded alert payload
+        
+    Returns:
+        bool: True once the alert has been handled and its file can be deleted,
+            False if its trade failed in a way that must not be retried because
+            the order may already have reached the exchange
+    
+    Raises:
+        TradeNotSubmitted: If a transient error stopped the trade before any order was sent
+    """
+    logger.info(f"New alert received: {alert}")
+    
+    # Handle direct alert format from webhook server
+    if "symbol" in alert and "type" in alert:
+        symbol = alert.get("symbol")
+        trade_type = alert.get("type")
+        position_size = alert.get("position_size", float(os.getenv("DEFAULT_POSITION_SIZE_PCT", "0.05")))
+        leverage = alert.get("leverage", int(os.getenv("DEFAULT_LEVERAGE", "5")))
+        stop_loss = alert.get("stop_loss", float(os.getenv("DEFAULT_STOP_LOSS_PCT", "0.15")))
+        take_profit = alert.get("take_profit", float(os.getenv("DEFAULT_TAKE_PROFIT_PCT", "0.3")))
+        
+        # Determine the order side
+        trade_type_lower = trade_type.lower()
+        if trade_type_lower == "buy":
+            side = ORDER_SIDE.BUY
+        elif trade_type_lower == "sell":
+            side = ORDER_SIDE.SELL
+        else:
+            logger.warning(f"Invalid trade type in alert: {trade_type}")
+            return True
+        
+        # Execute the trade
+        if MOCK_TRADING:
+            # Mock trade only - log the intent
+            logger.info(f"MOCK TRADE: Would execute a {side} trade for {symbol} with position size {position_size}, leverage {leverage}, stop loss {stop_loss}, take profit {take_profit}")
+        else:
+            # Execute real trade on Bluefin
+            try:
+                logger.info(f"Executing {side} trade for {symbol} with position size {position_size}, leverage {leverage}, stop loss {stop_loss}, take profit {take_profit}")
+                
+                # Execute the trade; execute_trade sets the leverage alongside its other pre-trade calls
+                order = await execute_trade(
+                    symbol=symbol, 
+                    side=side, 
+                    position_size=position_size,
+                    leverage=leverage,
+                    stop_loss_percentage=stop_loss,
+                    take_profit_percentage=take_profit
+                )
+            except TradeNotSubmitted:
+                # Nothing reached the exchange, so a later scan can safely retry the alert
+                raise
+            except Exception as e:
+                logger.error(f"Error executing trade: {e}", exc_info=True)
+                return False
+            # execute_trade logs its own errors; None means the order may or may not have been placed
+            if order is None:
+                return False
+    
+    # Extract key data from the original TradingView alert format
+    elif "indicator" in alert and alert["indicator"] == "vmanchu_cipher_b":
+        symbol = alert.get("symbol", os.getenv("DEFAULT_SYMBOL", "SUI/USD"))
+        timeframe = alert.get("timeframe", os.getenv("DEFAULT_TIMEFRAME", "5m"))
+        signal_type = alert.get("signal_type", "")
+        action = alert.get("action", "")
+        
+        logger.info(f"Processing VuManChu Cipher B signal: {signal_type}")
+        logger.info(f"Symbol: {symbol}, Timeframe: {timeframe}, Action: {action}")
+        
+        # Map TradingView symbol to Bluefin format
+        if "/" in symbol:
+            base_currency = symbol.split("/")[0]
+            bluefin_symbol = f"{base_currency}-PERP"
+        else:
+            bluefin_symbol = f"{symbol}-PERP"
+        
+        # Determine trade direction based on signal type and action
+        try:
+            trade_direction, side = CIPHER_B_ACTIONS[action]
+        except KeyError:
+            logger.warning(f"Invalid action in alert: {action}")
+            return True
+        
+        # Check if this is a valid signal type
+        if signal_type not in CIPHER_B_SIGNALS:
+            logger.warning(f"Invalid signal type: {signal_type}")
+            return True
+        
+        # Execute trade based on the signal
+        if MOCK_TRADING:
+            # Mock trade only - log the intent
+            logger.info(f"MOCK TRADE: Would execute a {side} trade for {bluefin_symbol} based on {signal_type} signal")
+            logger.info(f"Trade direction: {trade_direction}")
+        else:
+            # Execute real trade on Bluefin
+            try:
+                position_size = float(os.getenv("DEFAULT_POSITION_SIZE_PCT", "0.05"))
+                leverage = int(os.getenv("DEFAULT_LEVERAGE", "5"))
+                stop_loss = float(os.getenv("DEFAULT_STOP_LOSS_PCT", "0.15"))
+                take_profit = float(os.getenv("DEFAULT_TAKE_PROFIT_PCT", "0.3"))
+                
+                logger.info(f"Executing {side} trade for {bluefin_symbol} with position size {position_size}, leverage {leverage}, stop loss {stop_loss}, take profit {take_profit}")
+                
+                # Execute the trade; execute_trade sets the leverage alongside its other pre-trade calls
+                order = await execute_trade(
+                    symbol=bluefin_symbol, 
+                    side=side, 
+                    position_size=position_size,
+                    leverage=leverage,
+                    stop_loss_percentage=stop_loss,
+                    take_profit_percentage=take_profit
+                )
+            except TradeNotSubmitted:
+                # Nothing reached the exchange, so a later scan can safely retry the alert
+                raise
+            except Exception as e:
+                logger.error(f"Error executing trade: {e}", exc_info=True)
+                return False
+            # execute_trade logs its own errors; None means the order may or may not have been placed
+            if order is None:
+                return False
+    else:
+        logger.warning(f"Unsupported alert format: {alert}")
+    
+    return True
+
 async def process_alerts():
     """
     Process incoming alerts from the webhook server.
@@ -1506,147 +2321,76 @@ async def process_alerts():
     
     Unsupported alert types are logged and skipped.
     
+    Pending alert files are read in a worker thread and handled concurrently by up to
+    ALERT_WORKERS workers, so the trades for a backlog of alerts overlap instead of
+    running one after another. An alert whose trade failed before any order was sent
+    (TradeNotSubmitted) or whose file could not be read is retried on later scans and
+    moved to ALERT_DEAD_LETTER_DIR after ALERT_MAX_ATTEMPTS failures. Any other failure
+    may have left an order on the exchange, so that alert is dead-lettered right away
+    instead of being replayed.
+    
     The processed alert files are deleted to avoid double-processing.
     """
     
-    if not os.path.exists("alerts"):
-        os.makedirs("alerts", exist_ok=True)
-        return
+    # Scan and read the pending alerts in one worker thread hop, off the event loop
+    loaded = await asyncio.to_thread(_scan_and_load_alerts)
+    
+    # Forget attempt counts for alert files that have disappeared since the last scan
+    if _alert_attempts:
+        pending_paths = {alert_path for alert_path, _ in loaded}
+        for alert_path in _alert_attempts.keys() - pending_paths:
+            del _alert_attempts[alert_path]
+    
+    if loaded:
+        processed_paths = []
+        failed_paths = []
+        dead_paths = []
+        queue = asyncio.Queue()
+        for alert_path, alert in loaded:
+            if isinstance(alert, JSON_DECODE_ERRORS):
+                logger.error(f"Error decoding JSON from file: {alert_path}")
+                processed_paths.append(alert_path)
+            elif isinstance(alert, Exception):
+                logger.error(f"Error processing alert file {alert_path}: {alert}", exc_info=alert)
+                failed_paths.append(alert_path)
+            else:
+                queue.put_nowait((alert_path, alert))
         
-    # Check for new alert files
-    for file in os.listdir("alerts"):
-        if file.endswith(".json"):
-            alert_path = os.path.join("alerts", file)
-            
-            try:
-                # Read the alert data
-                with open(alert_path, "r") as f:
-                    alert = json.load(f)
-                
-                logger.info(f"New alert received: {alert}")
-                
-                # Handle direct alert format from webhook server
-                if "symbol" in alert and "type" in alert:
-                    symbol = alert.get("symbol")
-                    trade_type = alert.get("type")
-                    position_size = alert.get("position_size", float(os.getenv("DEFAULT_POSITION_SIZE_PCT", "0.05")))
-                    leverage = alert.get("leverage", int(os.getenv("DEFAULT_LEVERAGE", "5")))
-                    stop_loss = alert.get("stop_loss", float(os.getenv("DEFAULT_STOP_LOSS_PCT", "0.15")))
-                    take_profit = alert.get("take_profit", float(os.getenv("DEFAULT_TAKE_PROFIT_PCT", "0.3")))
-                    
-                    # Determine the order side
-                    if trade_type.lower() == "buy":
-                        side = ORDER_SIDE.BUY
-                    elif trade_type.lower() == "sell":
-                        side = ORDER_SIDE.SELL
-                    else:
-                        logger.warning(f"Invalid trade type in alert: {trade_type}")
-                        os.remove(alert_path)
-                        continue
-                    
-                    # Execute the trade
-                    if MOCK_TRADING:
-                        # Mock trade only - log the intent
-                        logger.info(f"MOCK TRADE: Would execute a {side} trade for {symbol} with position size {position_size}, leverage {leverage}, stop loss {stop_loss}, take profit {take_profit}")
-                    else:
-                        # Execute real trade on Bluefin
-                        try:
-                            logger.info(f"Executing {side} trade for {symbol} with position size {position_size}, leverage {leverage}, stop loss {stop_loss}, take profit {take_profit}")
-                            
-                            # Ensure the leverage is set correctly
-                            await ensure_leverage(symbol, leverage)
-                            
-                            # Execute the trade
-                            await execute_trade(
-                                symbol=symbol, 
-                                side=side, 
-                                position_size=position_size,
-                                leverage=leverage,
-                                stop_loss_percentage=stop_loss,
-                                take_profit_percentage=take_profit
-                            )
-                        except Exception as e:
-                            logger.error(f"Error executing trade: {e}", exc_info=True)
-                
-                # Extract key data from the original TradingView alert format
-                elif "indicator" in alert and alert["indicator"] == "vmanchu_cipher_b":
-                    symbol = alert.get("symbol", os.getenv("DEFAULT_SYMBOL", "SUI/USD"))
-                    timeframe = alert.get("timeframe", os.getenv("DEFAULT_TIMEFRAME", "5m"))
-                    signal_type = alert.get("signal_type", "")
-                    action = alert.get("action", "")
-                    
-                    logger.info(f"Processing VuManChu Cipher B signal: {signal_type}")
-                    logger.info(f"Symbol: {symbol}, Timeframe: {timeframe}, Action: {action}")
-                    
-                    # Map TradingView symbol to Bluefin format
-                    if "/" in symbol:
-                        base_currency = symbol.split("/")[0]
-                        bluefin_symbol = f"{base_currency}-PERP"
-                    else:
-                        bluefin_symbol = f"{symbol}-PERP"
-                    
-                    # Determine trade direction based on signal type and action
-                    if action == "BUY":
-                        trade_direction = "Bullish"
-                        side = ORDER_SIDE.BUY
-                    elif action == "SELL":
-                        trade_direction = "Bearish"
-                        side = ORDER_SIDE.SELL
-                    else:
-                        logger.warning(f"Invalid action in alert: {action}")
-                        os.remove(alert_path)
-                        continue
-                    
-                    # Check if this is a valid signal type
-                    valid_signals = ["GREEN_CIRCLE", "RED_CIRCLE", "GOLD_CIRCLE", "PURPLE_TRIANGLE"]
-                    if signal_type not in valid_signals:
-                        logger.warning(f"Invalid signal type: {signal_type}")
-                        os.remove(alert_path)
-                        continue
-                    
-                    # Execute trade based on the signal
-                    if MOCK_TRADING:
-                        # Mock trade only - log the intent
-                        logger.info(f"MOCK TRADE: Would execute a {side} trade for {bluefin_symbol} based on {signal_type} signal")
-                        logger.info(f"Trade direction: {trade_direction}")
+        async def worker():
+            # One failing alert only affects its own file; the worker moves on to the next
+            while not queue.empty():
+                alert_path, alert = queue.get_nowait()
+                try:
+                    if await handle_alert(alert_path, alert):
+                        processed_paths.append(alert_path)
                     else:
-                        # Execute real trade on Bluefin
-                        try:
-                            position_size = float(os.getenv("DEFAULT_POSITION_SIZE_PCT", "0.05"))
-                            leverage = int(os.getenv("DEFAULT_LEVERAGE", "5"))
-                            stop_loss = float(os.getenv("DEFAULT_STOP_LOSS_PCT", "0.15"))
-                            take_profit = float(os.getenv("DEFAULT_TAKE_PROFIT_PCT", "0.3"))
-                            
-                            logger.info(f"Executing {side} trade for {bluefin_symbol} with position size {position_size}, leverage {leverage}, stop loss {stop_loss}, take profit {take_profit}")
-                            
-                            # Ensure the leverage is set correctly
-                            await ensure_leverage(bluefin_symbol, leverage)
-                            
-                            # Execute the trade
-                            await execute_trade(
-                                symbol=bluefin_symbol, 
-                                side=side, 
-                                position_size=position_size,
-                                leverage=leverage,
-                                stop_loss_percentage=stop_loss,
-                                take_profit_percentage=take_profit
-                            )
-                        except Exception as e:
-                            logger.error(f"Error executing trade: {e}", exc_info=True)
-                else:
-                    logger.warning(f"Unsupported alert format: {alert}")
-                
-                # Clean up the processed alert file
-                os.remove(alert_path)
-                
-            except json.JSONDecodeError:
-                logger.error(f"Error decoding JSON from file: {alert_path}")
-                os.remove(alert_path)
-            except Exception as e:
-                logger.error(f"Error processing alert file {alert_path}: {e}", exc_info=True)
-    
-    # Small delay to avoid high CPU usage
-    await asyncio.sleep(1)
+                        dead_paths.append(alert_path)
+                except TradeNotSubmitted:
+                    failed_paths.append(alert_path)
+                except Exception as e:
+                    logger.error(f"Error processing alert file {alert_path}: {e}", exc_info=True)
+                    dead_paths.append(alert_path)
+        
+        # Handle the alerts concurrently with a bounded pool of workers
+        await asyncio.gather(*(worker() for _ in range(min(ALERT_WORKERS, queue.qsize()))))
+        
+        for alert_path in processed_paths:
+            _alert_attempts.pop(alert_path, None)
+        
+        # Failed alerts are retried on later scans until they run out of attempts
+        exhausted_paths = _record_alert_failures(failed_paths)
+        if exhausted_paths:
+            logger.error(f"Moving {len(exhausted_paths)} alert file(s) to {ALERT_DEAD_LETTER_DIR} after {ALERT_MAX_ATTEMPTS} failed attempts")
+        if dead_paths:
+            logger.error(f"Moving {len(dead_paths)} alert file(s) to {ALERT_DEAD_LETTER_DIR}; their trades failed and must not be replayed")
+            for alert_path in dead_paths:
+                _alert_attempts.pop(alert_path, None)
+        if exhausted_paths or dead_paths:
+            await asyncio.to_thread(_dead_letter_alert_files, exhausted_paths + dead_paths)
+        
+        # Clean up the processed alert files in one worker-thread batch
+        if processed_paths:
+            await asyncio.to_thread(_remove_alert_files, processed_paths)
 
 # Define a main function for running the agent
 async def main():
@@ -1657,46 +2401,215 @@ async def main():
     os.makedirs("alerts", exist_ok=True)
     os.makedirs("logs", exist_ok=True)
     
-    # Initialize clients
-    await init_clients()
+    try:
+        # Initialize clients
+        await init_clients()
+        
+        # Serve the API from its own loop so it can't delay alert handling
+        global _agent_loop
+        _agent_loop = asyncio.get_running_loop()
+        api_server, api_thread = start_api_thread()
+        
+        # Wake on new alert files when watchdog is available, otherwise poll
+        alert_watcher = AlertWatcher()
+        watching = alert_watcher.start()
+        
+        # Start alert processing loop
+        try:
+            while True:
+                try:
+                    await process_alerts()
+                except Exception as e:
+                    logger.error(f"Error processing alerts: {e}")
+                if watching:
+                    await alert_watcher.wait()
+                else:
+                    await asyncio.sleep(1)
+        finally:
+            alert_watcher.stop()
+            # The API's shutdown hook closes connections on this loop, so keep it running meanwhile
+            api_server.should_exit = True
+            await asyncio.to_thread(api_thread.join, 10)
+    finally:
+        # Don't leave Chromium running if we stop before the API lifespan closes it,
+        # e.g. Ctrl-C during startup or a crash in the alert loop
+        await browser_pool.close()
+
+# Static fallback payloads served by the API when no live data is available.
+# Built once at import time so the polling endpoints don't rebuild them per request.
+_MOCK_POSITIONS = (
+    MappingProxyType({
+        "id": "pos_1",
+        "symbol": "BTC/USD",
+        "size": 0.5,
+        "entry_price": 45000,
+        "current_price": 47500,
+        "pnl": 1250
+    }),
+    MappingProxyType({
+        "id": "pos_2",
+        "symbol": "ETH/USD",
+        "size": 2.0,
+        "entry_price": 3000,
+        "current_price": 2900,
+        "pnl": -200
+    })
+)
+
+_MOCK_TRADES = (
+    MappingProxyType({
+        "id": "trade_1",
+        "symbol": "BTC/USD",
+        "side": "BUY",
+        "size": 0.5,
+        "price": 45000
+    }),
+    MappingProxyType({
+        "id": "trade_2",
+        "symbol": "ETH/USD",
+        "side": "SELL",
+        "size": 1.0,
+        "price": 3200
+    })
+)
+
+# Constant response bodies, encoded once so FastAPI skips validation and serialization per request
+_ROOT_JSON = json_dumps({"status": "online", "message": "Trading Agent API is running"})
+_MOCK_POSITIONS_JSON = json_dumps([dict(position) for position in _MOCK_POSITIONS])
+
+def run_flask_compat_server():
+    """Run a Flask webhook server for compatibility with existing code."""
+    from flask import Flask, request, jsonify
+    flask_app = Flask(__name__)
     
-    # Start API server in the background
-    api_task = asyncio.create_task(start_api_server())
+    @flask_app.route('/health', methods=['GET'])
+    def flask_health():
+        return jsonify({"status": "ok"})
     
-    # Start alert processing loop
-    while True:
+    @flask_app.route('/webhook', methods=['POST'])
+    def webhook():
         try:
-            await process_alerts()
+            data = request.json
+            logger.info(f"Received webhook: {data}")
+            
+            # Save the alert to the alerts directory
+            os.makedirs("alerts", exist_ok=True)
+            alert_file = os.path.join("alerts", f"alert_{int(time.time())}.json")
+            with open(alert_file, "w") as f:
+                json.dump(data, f)
+            
+            return jsonify({"status": "success"})
         except Exception as e:
-            logger.error(f"Error processing alerts: {e}")
-        await asyncio.sleep(1)
+            logger.error(f"Error processing webhook: {e}")
+            return jsonify({"status": "error", "message": str(e)}), 500
+    
+    flask_port = int(os.getenv("FLASK_RUN_PORT", "5000"))
+    flask_app.run(host="0.0.0.0", port=flask_port)
+
+# Event loop that owns the trading client, browser pool and outbound connections.
+# Set by main() when the API is served from its own thread; None when the API runs standalone.
+_agent_loop: Optional[asyncio.AbstractEventLoop] = None
+
+async def on_agent_loop(coro):
+    """Run a coroutine on the agent's event loop and await its result from the API loop."""
+    loop = _agent_loop
+    if loop is None or loop is asyncio.get_running_loop():
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+async def release_resources():
+    """Close the warm browser, outbound HTTP client and pooled market data connections."""
+    await browser_pool.close()
+    await close_http()
+    if _bluefin_market is not None:
+        await _bluefin_market.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize clients and start background workers once per process."""
+    if client is None:
+        await on_agent_loop(init_clients())
+    
+    # Also start a Flask server for compatibility with existing code
+    threading.Thread(target=run_flask_compat_server, daemon=True).start()
+    
+    yield
+    
+    # Connections belong to the agent loop, so they are closed there
+    await on_agent_loop(release_resources())
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with json_dumps (msgspec when installed) instead of the stdlib encoder."""
+    
+    def render(self, content) -> bytes:
+        return json_dumps(content)
 
 # Define FastAPI app
-app = FastAPI(title="Trading Agent API", description="API for the trading agent")
+app = FastAPI(
+    title="PerplexityTrader Agent API",
+    description="API for the trading agent",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
+)
+
+# Add CORS middleware
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
 
 @app.get("/")
 async def root():
-    return {"status": "online", "message": "Trading Agent API is running"}
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
     """Simple health check endpoint."""
     return {
         "status": "OK", 
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": get_iso_timestamp(),
         "version": "1.0.0"
     }
 
 @app.get("/status")
 async def get_status():
-    """Get the current status of the trading agent."""
-    # TODO: Return actual agent status
-    return {
-        "status": "running",
-        "last_analysis": get_timestamp(),
-        "open_positions": 2,
-        "recent_trades": 5
-    }
+    """Get the current status of the agent."""
+    try:
+        # Get account info
+        account_info = None
+        if client:
+            try:
+                if hasattr(client, "get_account_info"):
+                    account_info = await on_agent_loop(client.get_account_info())
+                elif hasattr(client, "get_user_account_data"):
+                    account_info = await on_agent_loop(client.get_user_account_data())
+            except Exception as e:
+                logger.error(f"Error getting account info: {e}")
+        
+        # Get active positions
+        positions = []
+        if client:
+            try:
+                if hasattr(client, "get_positions"):
+                    positions = await on_agent_loop(client.get_positions())
+                elif hasattr(client, "get_user_positions"):
+                    positions = await on_agent_loop(client.get_user_positions())
+            except Exception as e:
+                logger.error(f"Error getting positions: {e}")
+        
+        return {
+            "status": "running",
+            "mock_trading": MOCK_TRADING,
+            "account_info": account_info,
+            "positions": positions,
+            "uptime": int(time.time() - start_time)
+        }
+    except Exception as e:
+        logger.error(f"Error in status endpoint: {e}")
+        return {"status": "error", "message": str(e)}
 
 @app.get("/positions")
 async def get_positions():
@@ -1705,9 +2618,11 @@ async def get_positions():
         # Get positions from the client
         if client:
             if hasattr(client, "get_positions"):
-                positions = await client.get_positions()
+                positions = await on_agent_loop(client.get_positions())
+            elif hasattr(client, "get_user_positions"):
+                positions = await on_agent_loop(client.get_user_positions())
             elif hasattr(client, "get_account_details"):
-                account_details = await client.get_account_details()
+                account_details = await on_agent_loop(client.get_account_details())
                 positions = account_details.get("positions", [])
             else:
                 logger.warning("Client does not have get_positions or get_account_details method")
@@ -1733,47 +2648,37 @@ async def get_positions():
     except Exception as e:
         logger.error(f"Error getting positions: {e}")
         # Fallback to mock data if there's an error
-        return [
-            {
-                "id": "pos_1",
-                "symbol": "BTC/USD",
-                "size": 0.5,
-                "entry_price": 45000,
-                "current_price": 47500,
-                "pnl": 1250
-            },
-            {
-                "id": "pos_2", 
-                "symbol": "ETH/USD",
-                "size": 2.0,
-                "entry_price": 3000,
-                "current_price": 2900,
-                "pnl": -200
-            }
-        ]
+        return Response(content=_MOCK_POSITIONS_JSON, media_type="application/json")
+
+@app.post("/add_mock_position")
+async def add_mock_position(position: dict):
+    """Add a mock position for testing purposes."""
+    try:
+        if client and hasattr(client, "positions"):
+            # Check if this is a MockBluefinClient
+            if client.__class__.__name__ == "MockBluefinClient":
+                # Add the position to the mock client's positions list
+                client.positions.append(position)
+                logger.info(f"Added mock position: {position}")
+                return {"status": "success", "message": "Mock position added"}
+            else:
+                logger.warning("Cannot add mock position to non-mock client")
+                return {"status": "error", "message": "Not a mock client"}
+        else:
+            logger.warning("Client does not support mock positions")
+            return {"status": "error", "message": "Client does not support mock positions"}
+    except Exception as e:
+        logger.error(f"Error adding mock position: {e}")
+        return {"status": "error", "message": str(e)}
 
 @app.get("/trades")
 async def get_trades(limit: int = 10):
     """Get the list of recent trades."""
     # TODO: Return actual recent trades
-    return [
-        {
-            "id": "trade_1",
-            "symbol": "BTC/USD",
-            "side": "BUY",
-            "size": 0.5,
-            "price": 45000,
-            "timestamp": get_timestamp()
-        },
-        {
-            "id": "trade_2",
-            "symbol": "ETH/USD", 
-            "side": "SELL",
-            "size": 1.0,
-            "price": 3200,
-            "timestamp": get_timestamp()
-        }
-    ][:limit]
+    timestamp = get_timestamp()
+    # Only the timestamp varies, so encode directly instead of going through FastAPI's encoder
+    trades = [{**trade, "timestamp": timestamp} for trade in _MOCK_TRADES[:limit]]
+    return Response(content=json_dumps(trades), media_type="application/json")
 
 @app.post("/open_trade")
 async def open_trade(trade: dict):
@@ -1781,253 +2686,137 @@ async def open_trade(trade: dict):
     # TODO: Validate trade parameters
     # TODO: Open actual trade
     logger.info(f"Opening trade: {trade}")
-    return {"status": "success", "trade_id": f"trade_{get_timestamp()}"}
+    # Monotonic nanosecond counter keeps IDs unique for bursts within the same second
+    return {"status": "success", "trade_id": f"trade_{time.monotonic_ns():x}"}
 
 @app.post("/close_trade")
-async def close_trade(trade_id: str):
-    """Close an open trade."""
-    # TODO: Validate trade ID
-    # TODO: Close actual trade
+async def close_trade(trade_id: str = Query(...)):
+    """Close a trade by ID."""
     logger.info(f"Closing trade: {trade_id}")
-    return {"status": "success"}
-
-async def start_api_server():
-    """Start the FastAPI server for the agent API."""
-    from fastapi import FastAPI, HTTPException, Query, Request, Response
-    from fastapi.middleware.cors import CORSMiddleware
-    import uvicorn
     
-    app = FastAPI(title="PerplexityTrader Agent API")
-    
-    # Add CORS middleware
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
-    
-    @app.get("/health")
-    async def health_check():
-        """Health check endpoint."""
-        return {"status": "ok"}
-    
-    @app.get("/status")
-    async def get_status():
-        """Get the current status of the agent."""
-        global client
+    try:
+        if not client:
+            raise HTTPException(status_code=422, detail="Trading client not initialized")
         
+        # Get positions
+        positions = []
         try:
-            # Get account info
-            account_info = None
-            if client:
-                try:
-                    if hasattr(client, "get_account_info"):
-                        account_info = await client.get_account_info()
-                    elif hasattr(client, "get_user_account_data"):
-                        account_info = await client.get_user_account_data()
-                except Exception as e:
-                    logger.error(f"Error getting account info: {e}")
-            
-            # Get active positions
-            positions = []
-            if client:
-                try:
-                    if hasattr(client, "get_positions"):
-                        positions = await client.get_positions()
-                    elif hasattr(client, "get_user_positions"):
-                        positions = await client.get_user_positions()
-                except Exception as e:
-                    logger.error(f"Error getting positions: {e}")
-            
-            return {
-                "status": "running",
-                "mock_trading": MOCK_TRADING,
-                "account_info": account_info,
-                "positions": positions,
-                "uptime": int(time.time() - start_time)
-            }
+            if hasattr(client, "get_positions"):
+                positions = await on_agent_loop(client.get_positions())
+            elif hasattr(client, "get_user_positions"):
+                positions = await on_agent_loop(client.get_user_positions())
         except Exception as e:
-            logger.error(f"Error in status endpoint: {e}")
-            return {"status": "error", "message": str(e)}
-    
-    @app.get("/positions")
-    async def get_positions():
-        """Get current positions."""
-        global client
-        
-        try:
+            logger.error(f"Error getting positions: {e}")
             positions = []
-            if client:
-                try:
-                    if hasattr(client, "get_positions"):
-                        positions = await client.get_positions()
-                    elif hasattr(client, "get_user_positions"):
-                        positions = await client.get_user_positions()
-                except Exception as e:
-                    logger.warning(f"Client does not have get_positions or get_account_details method")
-            
-            return positions
-        except Exception as e:
-            logger.error(f"Error in positions endpoint: {e}")
-            return []
-    
-    @app.post("/add_mock_position")
-    async def add_mock_position(position: dict):
-        """Add a mock position for testing purposes."""
-        global client
         
-        try:
-            if client and hasattr(client, "positions"):
-                # Check if this is a MockBluefinClient
-                if client.__class__.__name__ == "MockBluefinClient":
-                    # Add the position to the mock client's positions list
-                    client.positions.append(position)
-                    logger.info(f"Added mock position: {position}")
-                    return {"status": "success", "message": "Mock position added"}
-                else:
-                    logger.warning("Cannot add mock position to non-mock client")
-                    return {"status": "error", "message": "Not a mock client"}
-            else:
-                logger.warning("Client does not support mock positions")
-                return {"status": "error", "message": "Client does not support mock positions"}
-        except Exception as e:
-            logger.error(f"Error adding mock position: {e}")
-            return {"status": "error", "message": str(e)}
-    
-    @app.get("/trades")
-    async def get_trades():
-        """Get trade history."""
-        # This is a mock implementation for now
-        return [
-            {
-                "id": "trade_1",
-                "symbol": "BTC/USD",
-                "side": "BUY",
-                "size": 0.5,
-                "price": 45000,
-                "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S")
-            },
-            {
-                "id": "trade_2",
-                "symbol": "ETH/USD",
-                "side": "SELL",
-                "size": 1.0,
-                "price": 3200,
-                "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S")
-            }
-        ]
-    
-    @app.post("/open_trade")
-    async def open_trade(alert: dict):
-        """Open a new trade based on the provided alert."""
-        logger.info(f"Opening trade: {alert}")
+        # Find the position by ID
+        position = next((p for p in positions if p.get("id") == trade_id), None)
         
-        try:
-            # Process the alert
-            await process_alert(alert)
-            return {"status": "success", "trade_id": f"trade_{datetime.now().strftime('%Y%m%d_%H%M%S')}"}
-        except Exception as e:
-            logger.error(f"Error opening trade: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
-    
-    @app.post("/close_trade")
-    async def close_trade(trade_id: str = Query(...)):
-        """Close a trade by ID."""
-        logger.info(f"Closing trade: {trade_id}")
+        if not position:
+            raise HTTPException(status_code=422, detail=f"Position {trade_id} not found")
         
-        try:
-            global client
-            
-            if not client:
-                raise HTTPException(status_code=422, detail="Trading client not initialized")
-            
-            # Get positions
-            positions = []
-            try:
-                if hasattr(client, "get_positions"):
-                    positions = await client.get_positions()
-                elif hasattr(client, "get_user_positions"):
-                    positions = await client.get_user_positions()
-            except Exception as e:
-                logger.error(f"Error getting positions: {e}")
-                positions = []
-            
-            # Find the position by ID
-            position = next((p for p in positions if p.get("id") == trade_id), None)
-            
-            if not position:
-                raise HTTPException(status_code=422, detail=f"Position {trade_id} not found")
-            
-            # Close the position
-            if hasattr(client, "close_position"):
-                result = await client.close_position(position.get("symbol"))
-                return {"status": "success", "result": result}
-            else:
-                raise HTTPException(status_code=422, detail="Client does not support closing positions")
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error closing trade: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
-    
-    @app.post("/analyze")
-    async def analyze_market(request: dict):
-        """Analyze the market using Claude."""
-        try:
-            # Extract data from request
-            symbol = request.get("symbol", "BTC/USD")
-            timeframe = request.get("timeframe", "1h")
-            data = request.get("data", {})
-            
-            # Call Claude for analysis
-            analysis = await analyze_with_claude(symbol, timeframe, data)
-            
-            return analysis
-        except Exception as e:
-            logger.error(f"Error in analyze endpoint: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
+        # Close the position
+        if hasattr(client, "close_position"):
+            result = await on_agent_loop(client.close_position(position.get("symbol")))
+            return {"status": "success", "result": result}
+        else:
+            raise HTTPException(status_code=422, detail="Client does not support closing positions")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error closing trade: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/analyze")
+async def analyze_market(request: dict):
+    """Analyze the market using Claude."""
+    try:
+        # Extract data from request
+        symbol = request.get("symbol", "BTC/USD")
+        timeframe = request.get("timeframe", "1h")
+        data = request.get("data", {})
+        
+        # Call Claude for analysis
+        analysis = await on_agent_loop(analyze_with_claude(symbol, timeframe, data))
+        
+        return analysis
+    except Exception as e:
+        logger.error(f"Error in analyze endpoint: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _build_api_server():
+    """Create the uvicorn server for the agent API."""
+    import uvicorn
     
-    # Start the server
     port = int(os.getenv("PORT", "5002"))
-    config = uvicorn.Config(app, host="0.0.0.0", port=port)
-    server = uvicorn.Server(config)
+    # httptools is the C HTTP parser
+    http_impl = "httptools" if importlib.util.find_spec("httptools") else "auto"
+    config = uvicorn.Config(app, host="0.0.0.0", port=port, http=http_impl)
     logger.info(f"API server started on port {port}")
+    return uvicorn.Server(config)
+
+async def start_api_server():
+    """Start the FastAPI server for the agent API on the current event loop."""
+    await _build_api_server().serve()
+
+def _new_event_loop():
+    """Create a new event loop, preferring uvloop (or winloop on Windows) when installed."""
+    try:
+        import uvloop
+        return uvloop.new_event_loop()
+    except ImportError:
+        pass
+    try:
+        import winloop
+        return winloop.new_event_loop()
+    except ImportError:
+        return asyncio.new_event_loop()
+
+def start_api_thread():
+    """
+    Serve the agent API from its own event loop in a daemon thread.
     
-    # Also start a Flask server for compatibility with existing code
-    import threading
-    def run_flask():
-        from flask import Flask, request, jsonify
-        flask_app = Flask(__name__)
-        
-        @flask_app.route('/health', methods=['GET'])
-        def flask_health():
-            return jsonify({"status": "ok"})
-        
-        @flask_app.route('/webhook', methods=['POST'])
-        def webhook():
-            try:
-                data = request.json
-                logger.info(f"Received webhook: {data}")
-                
-                # Save the alert to the alerts directory
-                os.makedirs("alerts", exist_ok=True)
-                alert_file = os.path.join("alerts", f"alert_{int(time.time())}.json")
-                with open(alert_file, "w") as f:
-                    json.dump(data, f)
-                
-                return jsonify({"status": "success"})
-            except Exception as e:
-                logger.error(f"Error processing webhook: {e}")
-                return jsonify({"status": "error", "message": str(e)}), 500
-        
-        flask_port = int(os.getenv("FLASK_RUN_PORT", "5000"))
-        flask_app.run(host="0.0.0.0", port=flask_port)
+    Request parsing and dashboard polling then never queue behind alert
+    processing or order placement on the agent loop; endpoints that touch
+    the trading client hand that work back via on_agent_loop.
     
-    threading.Thread(target=run_flask, daemon=True).start()
+    Returns:
+        tuple: The uvicorn server and the thread running it
+    """
+    server = _build_api_server()
+    
+    def run():
+        loop = _new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(server.serve())
+        finally:
+            loop.close()
+    
+    thread = threading.Thread(target=run, name="agent-api", daemon=True)
+    thread.start()
+    return server, thread
+
+# Minimum order size increment per symbol, used to quantize position sizes.
+# Symbols without an entry fall back to DEFAULT_LOT_STEP.
+DEFAULT_LOT_STEP = Decimal("0.001")
+LOT_STEP = {
+    'BTC-PERP': DEFAULT_LOT_STEP,
+    'ETH-PERP': DEFAULT_LOT_STEP,
+    'SUI-PERP': DEFAULT_LOT_STEP,
+    'SOL-PERP': DEFAULT_LOT_STEP,
+    'BNB-PERP': DEFAULT_LOT_STEP
+}
+
+def round_down_to_lot_step(symbol, quantity):
+    """
+    Truncate a quantity to the symbol's lot step.
     
-    await server.serve()
+    The float goes through str() first: Decimal(0.3) is 0.29999..., which
+    ROUND_DOWN would cut to 0.299 and undersize the order by a whole lot.
+    """
+    lot_step = LOT_STEP.get(symbol, DEFAULT_LOT_STEP)
+    return float(Decimal(str(quantity)).quantize(lot_step, rounding=ROUND_DOWN))
 
 async def calculate_position_size(symbol, side, risk_percentage=None, stop_loss_percentage=None):
     """
@@ -2045,27 +2834,19 @@ async def calculate_position_size(symbol, side, risk_percentage=None, stop_loss_
     global client
     
     # Use default risk parameters if not provided
-    risk_percentage = risk_percentage or RISK_PARAMS.get("max_risk_per_trade", 0.02)
+    risk_percentage = risk_percentage or RISK.max_risk_per_trade
     stop_loss_percentage = stop_loss_percentage or RISK_PARAMS.get("stop_loss_percentage", 0.05)
     
     try:
-        # Get margin bank balance
-        # Based on https://bluefin-exchange.readme.io/reference/get-deposit-withdraw-usdc-from-marginbank
-        if hasattr(client, 'get_margin_bank_balance'):
-            margin_balance = await client.get_margin_bank_balance()
-            logger.info(f"Margin bank balance: {margin_balance} USDC")
-        else:
-            # Fallback to account details
-            account_details = await client.get_account_details()
-            margin_balance = account_details.get("margin_balance", 0)
-            logger.info(f"Account margin balance: {margin_balance} USDC")
+        # The balance and the market price are independent round-trips, so fetch them together
+        margin_balance, current_price = await asyncio.gather(
+            _get_margin_balance(),
+            get_market_price(symbol)
+        )
         
         # Calculate the dollar amount to risk
         risk_amount = margin_balance * risk_percentage
-        logger.info(f"Risking {risk_percentage*100}% of balance: {risk_amount} USDC")
-        
-        # Get current market price for the symbol
-        current_price = await get_market_price(symbol)
+        logger.info("Risking %s%% of balance: %s USDC", risk_percentage*100, risk_amount)
         
         # Calculate position size based on risk and stop loss
         # Formula: Position Size = Risk Amount / (Current Price * Stop Loss Percentage)
@@ -2075,42 +2856,99 @@ async def calculate_position_size(symbol, side, risk_percentage=None, stop_loss_
         max_position_size = TRADING_PARAMS.get("max_position_size_usd", 1000) / current_price
         position_size = min(position_size, max_position_size)
         
-        # Round to appropriate precision (e.g., 0.001 BTC)
-        position_size = round(position_size, 3)
+        # Truncate to the exchange lot step (e.g., 0.001 BTC); rounding down
+        # guarantees the order never exceeds the sized risk or gets rejected
+        position_size = round_down_to_lot_step(symbol, position_size)
         
-        logger.info(f"Calculated position size: {position_size} for {symbol} {side}")
+        logger.info("Calculated position size: %s for %s %s", position_size, symbol, side)
         return position_size
     
+    except MarketPriceUnavailable:
+        # Without a price the size is meaningless; let the caller skip the trade
+        raise
     except Exception as e:
-        logger.error(f"Error calculating position size: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error calculating position size: %s", e)
         # Return a safe default
         return 0.001  # Minimal position size as fallback
 
+async def _get_margin_balance():
+    """Return the account's margin balance in USDC."""
+    # Based on https://bluefin-exchange.readme.io/reference/get-deposit-withdraw-usdc-from-marginbank
+    if hasattr(client, 'get_margin_bank_balance'):
+        margin_balance = await client.get_margin_bank_balance()
+        logger.info("Margin bank balance: %s USDC", margin_balance)
+    else:
+        # Fallback to account details
+        account_details = await client.get_account_details()
+        margin_balance = account_details.get("margin_balance", 0)
+        logger.info("Account margin balance: %s USDC", margin_balance)
+    return margin_balance
+
+class MarketPriceUnavailable(RuntimeError):
+    """Raised when no market price can be determined for a symbol."""
+
+# Seconds a fetched market price is reused; alert bursts for one symbol share a lookup
+PRICE_CACHE_TTL = 0.5
+
+# Last-resort prices keyed by base asset, used when every live price source fails
+DEFAULT_PRICE_BY_BASE = MappingProxyType({
+    'BTC': 50000,
+    'ETH': 3000,
+    'SUI': 1.5,
+    'SOL': 100,
+    'BNB': 400
+})
+
+# symbol -> (monotonic expiry, price)
+_price_cache: Dict[str, tuple] = {}
+
+# One lock per symbol so concurrent lookups wait for a single fetch
+_price_locks = defaultdict(asyncio.Lock)
+
 async def get_market_price(symbol):
     """
     Get the current market price for a symbol from Bluefin Exchange.
     
     This function first tries to use the BluefinMarket utility, then falls back
-    to direct API calls, and finally to default values if all else fails.
+    to direct API calls, and finally to default values for known symbols.
+    Prices are reused for PRICE_CACHE_TTL seconds, and concurrent lookups for
+    the same symbol share one fetch.
     
     Args:
         symbol (str): The trading symbol (e.g., 'BTC-PERP')
         
     Returns:
         float: The current market price
+        
+    Raises:
+        MarketPriceUnavailable: If no price could be determined for the symbol
     """
+    cached = _price_cache.get(symbol)
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+    
+    async with _price_locks[symbol]:
+        # Another caller may have fetched the price while we waited for the lock
+        cached = _price_cache.get(symbol)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+        
+        price = await _fetch_market_price(symbol)
+        _price_cache[symbol] = (time.monotonic() + PRICE_CACHE_TTL, price)
+        return price
+
+async def _fetch_market_price(symbol):
+    """Look up the market price for a symbol without caching; see get_market_price."""
     global client
     
     try:
         # First try using BluefinMarket utility if available
-        try:
-            from core.bluefin_market import get_price
-            price = await get_price(symbol)
+        if _bluefin_market is not None:
+            price = await _bluefin_market.get_price(symbol)
             if price is not None:
-                logger.info(f"Got market price from BluefinMarket utility for {symbol}: {price}")
+                logger.info("Got market price from BluefinMarket utility for %s: %s", symbol, price)
                 return price
-        except ImportError:
+        else:
             # BluefinMarket utility not available, falling back to direct methods
             logger.debug("BluefinMarket utility not available, using fallback methods")
         
@@ -2120,7 +2958,7 @@ async def get_market_price(symbol):
         else:
             api_symbol = symbol
             
-        logger.info(f"Getting market price for {api_symbol}")
+        logger.info("Getting market price for %s", api_symbol)
         
         # Try to get market price directly from Bluefin API
         if client and hasattr(client, '_request'):
@@ -2129,19 +2967,19 @@ async def get_market_price(symbol):
                 response = await client._request("GET", f"/marketData?symbol={api_symbol}")
                 if response and isinstance(response, dict) and "marketPrice" in response:
                     price = float(response["marketPrice"]) / 1e18
-                    logger.info(f"Got oracle price from Bluefin API for {api_symbol}: {price}")
+                    logger.info("Got oracle price from Bluefin API for %s: %s", api_symbol, price)
                     return price
             except Exception as e:
-                logger.warning(f"Error getting price from Bluefin API: {e}")
+                logger.warning("Error getting price from Bluefin API: %s", e)
         
         # Try to get market price using client's method
         if client and hasattr(client, 'get_market_price'):
             try:
                 price = await client.get_market_price(api_symbol)
-                logger.info(f"Got market price using client for {api_symbol}: {price}")
+                logger.info("Got market price using client for %s: %s", api_symbol, price)
                 return float(price)
             except Exception as e:
-                logger.warning(f"Error getting price using client's get_market_price: {e}")
+                logger.warning("Error getting price using client's get_market_price: %s", e)
         
         # Try to get orderbook and use mid price
         if client and hasattr(client, 'get_orderbook'):
@@ -2152,43 +2990,54 @@ async def get_market_price(symbol):
                         bid = float(orderbook['bids'][0][0])
                         ask = float(orderbook['asks'][0][0])
                         mid_price = (bid + ask) / 2
-                        logger.info(f"Calculated mid price for {api_symbol}: {mid_price}")
+                        logger.info("Calculated mid price for %s: %s", api_symbol, mid_price)
                         return mid_price
             except Exception as e:
-                logger.warning(f"Error getting orderbook: {e}")
+                logger.warning("Error getting orderbook: %s", e)
         
         # Fallback to default prices for common symbols
-        default_prices = {
-            'BTC-PERP': 50000,
-            'ETH-PERP': 3000,
-            'SUI-PERP': 1.5,
-            'SOL-PERP': 100,
-            'BNB-PERP': 400
-        }
+        price = DEFAULT_PRICE_BY_BASE.get(get_base_symbol(symbol))
+        if price is not None:
+            logger.warning("Using default price for %s: %s", symbol, price)
+            return price
         
-        # Extract base symbol from the full symbol
-        base_symbol = symbol.split('-')[0] if '-' in symbol else symbol.split('/')[0] if '/' in symbol else symbol
-        
-        # Try to find a matching default price
-        for key, price in default_prices.items():
-            if base_symbol in key:
-                logger.warning(f"Using default price for {symbol}: {price}")
-                return price
-        
-        # Last resort fallback
-        logger.warning(f"No price found for {symbol}, using default price: 100")
-        return 100
+        # No price source available; refuse to guess a price for order sizing
+        raise MarketPriceUnavailable(symbol)
     
+    except MarketPriceUnavailable:
+        raise
     except Exception as e:
-        logger.error(f"Error getting market price: {e}")
-        logger.error(traceback.format_exc())
-        # Return a safe default
-        return 100
+        logger.exception("Error getting market price: %s", e)
+        raise MarketPriceUnavailable(symbol) from e
+
+# Seconds a confirmed leverage setting is trusted before re-reading it from the exchange
+LEVERAGE_CACHE_TTL = 60
+
+# Seconds to wait for a single leverage-set request before retrying
+LEVERAGE_SET_TIMEOUT = 2.0
+
+# Exchange error messages meaning the requested leverage is already in effect
+LEVERAGE_UNCHANGED_MESSAGES = (
+    "leverage not modified",
+    "leverage not changed",
+    "leverage is already",
+    "same leverage"
+)
+
+# Last confirmed leverage per symbol: symbol -> (monotonic timestamp, leverage)
+_leverage_cache = {}
+
+# In-flight leverage adjustment per symbol: symbol -> (leverage, Future shared by concurrent callers)
+_leverage_inflight = {}
 
 async def ensure_leverage(symbol, target_leverage):
     """
     Ensure that the leverage for a symbol is set to the target value.
     
+    Only one adjustment per symbol is sent to the exchange at a time. Callers asking
+    for the leverage already in flight share its result; callers asking for a different
+    leverage wait for it to finish and then apply their own.
+    
     Args:
         symbol (str): The trading symbol (e.g., 'BTC-PERP')
         target_leverage (int): The desired leverage value
@@ -2196,76 +3045,186 @@ async def ensure_leverage(symbol, target_leverage):
     Returns:
         bool: True if leverage is set successfully, False otherwise
     """
+    while True:
+        # Skip the exchange round-trip if the leverage was confirmed recently
+        cached_at, cached_leverage = _leverage_cache.get(symbol, (0.0, None))
+        if cached_leverage == target_leverage and time.monotonic() - cached_at < LEVERAGE_CACHE_TTL:
+            return True
+        
+        inflight = _leverage_inflight.get(symbol)
+        if inflight is None:
+            break
+        
+        # asyncio.wait doesn't raise when the other caller was cancelled, only when we are
+        inflight_leverage, pending = inflight
+        await asyncio.wait((pending,))
+        if inflight_leverage == target_leverage and not pending.cancelled():
+            return pending.result()
+        # A different leverage finished, or its caller was cancelled: check again and take over
+    
+    pending = asyncio.get_running_loop().create_future()
+    _leverage_inflight[symbol] = (target_leverage, pending)
+    try:
+        result = await _apply_leverage(symbol, target_leverage)
+        pending.set_result(result)
+        return result
+    finally:
+        _leverage_inflight.pop(symbol, None)
+        if not pending.done():
+            pending.cancel()
+
+@backoff.on_exception(backoff.fibo,
+                      (asyncio.TimeoutError, ConnectionError, OSError),
+                      max_tries=3)
+async def _set_leverage_with_retry(symbol, target_leverage):
+    """Set leverage with a bounded timeout, retrying transient failures with Fibonacci backoff."""
+    return await asyncio.wait_for(_set_leverage_fn(symbol, target_leverage), LEVERAGE_SET_TIMEOUT)
+
+def _is_leverage_unchanged(response):
+    """Check whether an exchange response or error means the leverage was already at the target."""
+    message = str(response).lower()
+    return any(marker in message for marker in LEVERAGE_UNCHANGED_MESSAGES)
+
+async def _apply_leverage(symbol, target_leverage):
+    """Set the leverage on the exchange, treating an 'already set' rejection as success."""
     global client
     
     try:
-        # Get current leverage
-        current_leverage = await client.get_user_leverage(symbol)
-        logger.info(f"Current leverage for {symbol}: {current_leverage}x")
-        
-        # Check if adjustment is needed
-        if current_leverage == target_leverage:
-            logger.info(f"Leverage for {symbol} already set to {target_leverage}x")
-            return True
-            
-        # Adjust leverage
-        logger.info(f"Adjusting leverage for {symbol} from {current_leverage}x to {target_leverage}x")
-        
-        # Try different method names that might be available in the client
-        if hasattr(client, 'set_leverage'):
-            result = await client.set_leverage(symbol, target_leverage)
-        elif hasattr(client, 'adjust_leverage'):
-            result = await client.adjust_leverage(symbol, target_leverage)
-        else:
-            logger.warning(f"No method available to set leverage for {symbol}")
+        # Without a setter the best we can do is confirm the current value
+        if _set_leverage_fn is None:
+            current_leverage = await client.get_user_leverage(symbol)
+            if current_leverage == target_leverage:
+                logger.info("Leverage for %s already set to %sx", symbol, target_leverage)
+                _leverage_cache[symbol] = (time.monotonic(), target_leverage)
+                return True
+            logger.warning("No method available to set leverage for %s", symbol)
             return False
         
+        # Set leverage directly; the exchange rejects no-op changes, which saves a read round-trip
+        logger.info("Setting leverage for %s to %sx", symbol, target_leverage)
+        try:
+            result = await _set_leverage_with_retry(symbol, target_leverage)
+        except Exception as e:
+            if not _is_leverage_unchanged(e):
+                raise
+            result = {"success": True, "unchanged": True}
+        
         if isinstance(result, dict) and result.get('success', False):
-            logger.info(f"Successfully adjusted leverage for {symbol} to {target_leverage}x")
+            logger.info("Leverage for %s set to %sx", symbol, target_leverage)
+            _leverage_cache[symbol] = (time.monotonic(), target_leverage)
+            return True
+        elif _is_leverage_unchanged(result):
+            logger.info("Leverage for %s already set to %sx", symbol, target_leverage)
+            _leverage_cache[symbol] = (time.monotonic(), target_leverage)
             return True
         else:
-            logger.warning(f"Failed to adjust leverage for {symbol}: {result}")
+            logger.warning("Failed to adjust leverage for %s: %s", symbol, result)
+            _leverage_cache.pop(symbol, None)
             return False
             
     except Exception as e:
-        logger.error(f"Error adjusting leverage for {symbol}: {e}")
-        logger.error(traceback.format_exc())
+        _leverage_cache.pop(symbol, None)
+        logger.exception("Error adjusting leverage for %s: %s", symbol, e)
         return False
 
+async def ensure_leverage_batch(pairs):
+    """
+    Ensure leverage for several symbols at once.
+    
+    Uses the client's batch endpoint when available so N symbols cost a single
+    round-trip, otherwise runs ensure_leverage for each symbol concurrently.
+    
+    Args:
+        pairs (dict): Mapping of trading symbol to desired leverage
+        
+    Returns:
+        dict: Mapping of trading symbol to True if leverage is set, False otherwise
+    """
+    # Only symbols whose leverage hasn't been confirmed recently need a request
+    now = time.monotonic()
+    results = {}
+    pending = {}
+    for symbol, target_leverage in pairs.items():
+        cached_at, cached_leverage = _leverage_cache.get(symbol, (0.0, None))
+        if cached_leverage == target_leverage and now - cached_at < LEVERAGE_CACHE_TTL:
+            results[symbol] = True
+        else:
+            pending[symbol] = target_leverage
+    
+    if not pending:
+        return results
+    
+    if _batch_set_leverage_fn is not None:
+        try:
+            payload = [{"symbol": symbol, "leverage": leverage} for symbol, leverage in pending.items()]
+            result = await _batch_set_leverage_fn(payload)
+            success = isinstance(result, dict) and result.get('success', False)
+            if success:
+                logger.info(f"Successfully adjusted leverage for {len(pending)} symbols in one batch")
+            else:
+                logger.warning(f"Failed to batch adjust leverage: {result}")
+            now = time.monotonic()
+            for symbol, leverage in pending.items():
+                if success:
+                    _leverage_cache[symbol] = (now, leverage)
+                else:
+                    _leverage_cache.pop(symbol, None)
+                results[symbol] = success
+            return results
+        except Exception as e:
+            logger.error(f"Error batch adjusting leverage, falling back to per-symbol calls: {e}")
+    
+    outcomes = await asyncio.gather(*(ensure_leverage(symbol, leverage) for symbol, leverage in pending.items()))
+    results.update(zip(pending, outcomes))
+    return results
+
 # Define a simple Order class to track order state
+@dataclass(slots=True, eq=False)
 class Order:
-    def __init__(self, 
-                 symbol: str, 
-                 side: str, 
-                 quantity: float, 
-                 order_type: str,
-                 price: float = 0.0,
-                 leverage: int = 1,
-                 order_hash: str = "",
-                 status: str = "pending"):
-        self.symbol = symbol
-        self.side = side
-        self.quantity = quantity
-        self.order_type = order_type
-        self.price = price
-        self.leverage = leverage
+    symbol: str
+    side: str
+    quantity: float
+    order_type: str
+    price: float = 0.0
+    leverage: int = 1
+    hash: str = field(default="", init=False)
+    order_hash: InitVar[str] = ""
+    status: str = "pending"
+    # Epoch seconds; cheaper than datetime.now() and still meaningful once serialized
+    created_at: float = field(default_factory=time.time, init=False)
+    
+    # Settlement status fields
+    settlement_status: str = field(default="pending", init=False)
+    requeue_count: int = field(default=0, init=False)
+    cancelled: bool = field(default=False, init=False)
+    fill_price: float = field(default=0.0, init=False)
+    matched_quantity: float = field(default=0.0, init=False)
+    is_maker: bool = field(default=False, init=False)
+    
+    def __post_init__(self, order_hash):
         self.hash = order_hash
-        self.status = status
-        self.created_at = datetime.now()
-        
-        # Settlement status fields
-        self.settlement_status = "pending"
-        self.requeue_count = 0
-        self.cancelled = False
-        self.fill_price = 0.0
-        self.matched_quantity = 0.0
-        self.is_maker = False
         
     def __str__(self):
+        # Log orders with logger.debug("%s", order) so this only runs when the record is emitted
         return f"Order({self.symbol}, {self.side}, {self.quantity}, {self.order_type}, price={self.price}, leverage={self.leverage}, status={self.status}, settlement_status={self.settlement_status}, requeue_count={self.requeue_count}, cancelled={self.cancelled})"
     
-    def __repr__(self):
-        return self.__str__()
+    __repr__ = __str__
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # Run the agent and the API thread on the same libuv-backed loop type without
+    # replacing the global event loop policy
+    if hasattr(asyncio, "Runner"):
+        with asyncio.Runner(loop_factory=_new_event_loop) as runner:
+            runner.run(main())
+    else:
+        # Python 3.10 has no asyncio.Runner
+        loop = _new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(main())
+        finally:
+            # KeyboardInterrupt skips main()'s cleanup here, unlike asyncio.Runner which cancels it
+            loop.run_until_complete(browser_pool.close())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            asyncio.set_event_loop(None)
+            loop.close()
\ No newline at end of file
@@ -3,14 +3,71 @@ Bluefin API client implementation for PerplexityTrader.
 """
 
 import os
+import time
 import logging
 import asyncio
-from typing import Dict, List, Optional, Union, Any
+import functools
+from collections import defaultdict
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Resolve the SDK once at import instead of on every initialize() call
+try:
+    from bluefin_client_sui import BluefinClient
+    BLUEFIN_CLIENT_SUI_AVAILABLE = True
+except ImportError:
+    BluefinClient = None
+    BLUEFIN_CLIENT_SUI_AVAILABLE = False
+
+# Network names accepted in BLUEFIN_NETWORK
+BLUEFIN_NETWORKS = frozenset({"SUI_PROD", "SUI_STAGING", "MAINNET", "TESTNET"})
+
+# Accepted order side spellings -> the exchange's upper-case side
+ORDER_SIDES = {side: side.upper() for side in ("BUY", "SELL", "buy", "sell", "Buy", "Sell")}
+
+# Seconds a fetched position list is reused before asking the exchange again
+POSITIONS_CACHE_TTL = 0.5
+
+# Seconds a fetched market price is reused
+MARKET_PRICE_CACHE_TTL = 0.25
+
+# Most trades the exchange returns per trade history page
+TRADES_HISTORY_MAX_LIMIT = 50
+
+def async_ttl_cache(ttl_seconds: float):
+    """
+    Cache an async client method's result per instance and arguments.
+    
+    Concurrent calls with the same arguments wait on a per-key lock and share a
+    single request. Error results (dicts with an "error" key) are not cached.
+    
+    Args:
+        ttl_seconds: How long a result is reused
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            key = (func.__name__, args, frozenset(kwargs.items()))
+            entry = self._ttl_cache.get(key)
+            if entry is not None and time.monotonic() < entry[0]:
+                return entry[1]
+            
+            async with self._ttl_locks[key]:
+                # Another caller may have filled the entry while we waited
+                entry = self._ttl_cache.get(key)
+                if entry is not None and time.monotonic() < entry[0]:
+                    return entry[1]
+                
+                result = await func(self, *args, **kwargs)
+                if not (isinstance(result, dict) and "error" in result):
+                    self._ttl_cache[key] = (time.monotonic() + ttl_seconds, result)
+                return result
+        return wrapper
+    return decorator
+
 class BluefinClientWrapper:
     """
     Wrapper for the Bluefin API client to provide a consistent interface
@@ -20,17 +77,36 @@ class BluefinClientWrapper:
     def __init__(self):
         self.client = None
         self.initialized = False
-        self.network = os.getenv('BLUEFIN_NETWORK', 'SUI_PROD')
+        # Serializes initialize() so concurrent first calls share one connection attempt
+        self._init_lock = asyncio.Lock()
+        # Validate the network up front so a typo fails here rather than inside the SDK
+        network = os.getenv('BLUEFIN_NETWORK', 'SUI_PROD').upper()
+        if network not in BLUEFIN_NETWORKS:
+            raise ValueError(f"Unknown BLUEFIN_NETWORK {network!r}, expected one of {sorted(BLUEFIN_NETWORKS)}")
+        self.network = network
         self.private_key = os.getenv('BLUEFIN_PRIVATE_KEY')
         self.api_key = os.getenv('BLUEFIN_API_KEY')
         self.api_secret = os.getenv('BLUEFIN_API_SECRET')
         
+        # Last fetched positions, as returned and indexed by symbol, valid until the monotonic expiry
+        self._positions: List[Dict] = []
+        self._positions_by_symbol: Dict[str, Dict] = {}
+        self._positions_expiry = 0.0
+        
+        # Results of async_ttl_cache-decorated reads: key -> (monotonic expiry, result)
+        self._ttl_cache: Dict[tuple, tuple] = {}
+        self._ttl_locks = defaultdict(asyncio.Lock)
+        
+        # In-flight reads shared by concurrent identical calls: key -> Future
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        
     async def initialize(self) -> bool:
         """Initialize the Bluefin client."""
+        if not BLUEFIN_CLIENT_SUI_AVAILABLE:
+            logger.error("Failed to import BluefinClient. Make sure the package is installed.")
+            return False
+        
         try:
-            # Import here to avoid issues if the package is not installed
-            from bluefin_client_sui import BluefinClient
-            
             # Create the client instance
             self.client = BluefinClient(
                 network=self.network,
@@ -45,18 +121,55 @@ class BluefinClientWrapper:
             logger.info("Bluefin client initialized successfully")
             return True
             
-        except ImportError:
-            logger.error("Failed to import BluefinClient. Make sure the package is installed.")
-            return False
         except Exception as e:
             logger.error(f"Failed to initialize Bluefin client: {e}")
             return False
     
+    async def _single_flight(self, key: tuple, factory):
+        """
+        Run factory() once for concurrent callers using the same key.
+        
+        Args:
+            key: Identifies identical requests
+            factory: Zero-argument callable returning the coroutine to run
+            
+        Returns:
+            The result of the shared call; its exception is raised to every caller
+        """
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        
+        pending = asyncio.get_running_loop().create_future()
+        self._inflight[key] = pending
+        try:
+            result = await factory()
+        except Exception as e:
+            pending.set_exception(e)
+            # Mark the exception retrieved so a call without waiters doesn't log a warning
+            pending.exception()
+            raise
+        else:
+            pending.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+            if not pending.done():
+                pending.cancel()
+    
+    async def _get_account_data(self) -> Dict:
+        """Fetch account data, sharing one request among concurrent callers."""
+        return await self._single_flight(("get_account_data",), self.client.get_account_data)
+    
     async def ensure_initialized(self) -> bool:
-        """Ensure the client is initialized before making API calls."""
-        if not self.initialized:
+        """Ensure the client is initialized before making API calls; cheap once it is."""
+        if self.initialized:
+            return True
+        async with self._init_lock:
+            # Another caller may have finished initializing while we waited
+            if self.initialized:
+                return True
             return await self.initialize()
-        return True
     
     async def get_account_info(self) -> Dict:
         """Get account information."""
@@ -64,24 +177,50 @@ class BluefinClientWrapper:
             return {"error": "Client not initialized"}
         
         try:
-            account_data = await self.client.get_account_data()
+            account_data = await self._get_account_data()
             return account_data
         except Exception as e:
             logger.error(f"Error getting account info: {e}")
             return {"error": str(e)}
     
     async def get_positions(self) -> List[Dict]:
-        """Get current positions."""
+        """Get current positions, reusing a fetch from the last POSITIONS_CACHE_TTL seconds."""
+        # Callers get their own list, so mutating it can't corrupt the cache other readers share
+        if time.monotonic() < self._positions_expiry:
+            return list(self._positions)
+        
         if not await self.ensure_initialized():
+            self._invalidate_positions()
             return [{"error": "Client not initialized"}]
         
         try:
-            account_data = await self.client.get_account_data()
-            return account_data.get("positions", [])
+            account_data = await self._get_account_data()
+            positions = account_data.get("positions", [])
         except Exception as e:
             logger.error(f"Error getting positions: {e}")
+            # Never let a later lookup fall back to positions from before the failure
+            self._invalidate_positions()
             return [{"error": str(e)}]
+        
+        self._positions = positions
+        self._positions_by_symbol = {p.get("symbol"): p for p in positions}
+        self._positions_expiry = time.monotonic() + POSITIONS_CACHE_TTL
+        return list(positions)
+    
+    async def get_position(self, symbol: str) -> Optional[Dict]:
+        """Get the current position for a symbol, or None if there is none or it can't be fetched."""
+        positions = await self.get_positions()
+        if any("error" in p for p in positions):
+            return None
+        return self._positions_by_symbol.get(symbol)
     
+    def _invalidate_positions(self) -> None:
+        """Drop the cached positions so the next read goes to the exchange."""
+        self._positions = []
+        self._positions_by_symbol = {}
+        self._positions_expiry = 0.0
+    
+    @async_ttl_cache(MARKET_PRICE_CACHE_TTL)
     async def get_market_price(self, symbol: str) -> Dict:
         """Get current market price for a symbol."""
         if not await self.ensure_initialized():
@@ -113,7 +252,7 @@ class BluefinClientWrapper:
             # Prepare order parameters
             params = {
                 "symbol": symbol,
-                "side": side.upper(),
+                "side": ORDER_SIDES.get(side) or side.upper(),
                 "quantity": quantity,
                 "leverage": leverage,
                 "reduceOnly": reduce_only,
@@ -125,8 +264,10 @@ class BluefinClientWrapper:
             if price is not None and order_type == "LIMIT":
                 params["price"] = price
             
-            # Place the order
+            # Place the order; it may move positions and prices, so drop the cached reads
             order = await self.client.place_order(params)
+            self._invalidate_positions()
+            self._ttl_cache.clear()
             return order
         except Exception as e:
             logger.error(f"Error placing order: {e}")
@@ -151,8 +292,7 @@ class BluefinClientWrapper:
         
         try:
             # Get current position
-            positions = await self.get_positions()
-            position = next((p for p in positions if p.get("symbol") == symbol), None)
+            position = await self.get_position(symbol)
             
             if not position:
                 return {"error": f"No open position for {symbol}"}
@@ -175,6 +315,28 @@ class BluefinClientWrapper:
             logger.error(f"Error closing position for {symbol}: {e}")
             return {"error": str(e)}
     
+    async def close_positions(self, symbols: List[str]) -> List:
+        """
+        Close positions for several symbols concurrently.
+        
+        Closes are submitted together, so the order in which they reach the
+        exchange is not guaranteed. A failure closing one symbol does not
+        affect the others.
+        
+        Args:
+            symbols: Market symbols whose positions should be closed
+            
+        Returns:
+            One entry per symbol, in the same order: the close_position result
+            or the exception it raised
+        """
+        results = await asyncio.gather(
+            *(self.close_position(symbol) for symbol in symbols),
+            return_exceptions=True
+        )
+        self._invalidate_positions()
+        return results
+    
     async def set_leverage(self, symbol: str, leverage: int) -> Dict:
         """Set leverage for a symbol."""
         if not await self.ensure_initialized():
@@ -187,15 +349,33 @@ class BluefinClientWrapper:
             logger.error(f"Error setting leverage for {symbol}: {e}")
             return {"error": str(e)}
     
-    async def get_user_trades_history(self, symbol: Optional[str] = None) -> List[Dict]:
-        """Get user trade history."""
+    async def get_user_trades_history(
+        self,
+        symbol: Optional[str] = None,
+        maker: Optional[bool] = None,
+        order_type: Optional[str] = None,
+        from_id: Optional[str] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[int] = None
+    ) -> List[Dict]:
+        """Get user trade history, optionally filtered; filters left as None are not sent."""
         if not await self.ensure_initialized():
             return [{"error": "Client not initialized"}]
         
         try:
-            params = {}
-            if symbol:
-                params["symbol"] = symbol
+            filters = (
+                ("symbol", symbol),
+                ("maker", maker),
+                ("orderType", order_type),
+                ("fromId", from_id),
+                ("startTime", start_time),
+                ("endTime", end_time),
+                ("limit", None if limit is None else min(limit, TRADES_HISTORY_MAX_LIMIT)),
+                ("cursor", cursor)
+            )
+            params = {key: value for key, value in filters if value is not None}
             
             trades = await self.client.get_user_trades_history(params)
             return trades
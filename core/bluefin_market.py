@@ -37,6 +37,12 @@ ADDITIONAL_TRADING_PAIRS = [
     "ARB-PERP",   # Arbitrum
 ]
 
+# Connection pool settings for the shared market data session
+HTTP_CONNECTOR_LIMIT = 100
+HTTP_CONNECTOR_LIMIT_PER_HOST = 30
+HTTP_KEEPALIVE_TIMEOUT = 60
+HTTP_TOTAL_TIMEOUT = 10
+
 # Track sessions for cleanup
 _SESSIONS = weakref.WeakSet()
 
@@ -87,9 +93,21 @@ class BluefinMarket:
         self.network = "testnet" if use_testnet else "mainnet"
         
     async def ensure_session(self):
-        """Ensure aiohttp session is created"""
+        """Ensure the pooled aiohttp session is created.
+        
+        The session is kept alive and reused across requests so that
+        keep-alive connections avoid a TCP/TLS handshake per call.
+        """
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=HTTP_CONNECTOR_LIMIT,
+                    limit_per_host=HTTP_CONNECTOR_LIMIT_PER_HOST,
+                    keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                    enable_cleanup_closed=True
+                ),
+                timeout=aiohttp.ClientTimeout(total=HTTP_TOTAL_TIMEOUT)
+            )
             _SESSIONS.add(self.session)
         return self.session
         
@@ -115,26 +133,26 @@ class BluefinMarket:
         url = f"{self.base_url}/marketData?symbol={symbol}"
         
         try:
-            # Use the context manager for session management
-            async with get_session() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        # Try to get the price from different possible fields
-                        price_fields = ['marketPrice', 'oraclePrice', 'indexPrice', 'lastPrice']
-                        
-                        for field in price_fields:
-                            if field in data and data[field]:
-                                # Convert from blockchain native format (with 18 decimals)
-                                raw_price = data[field]
-                                price = float(raw_price) / 1e18
-                                logger.debug(f"Got {symbol} price from {field}: {price}")
-                                return price
-                        
-                        logger.warning(f"No price fields found for {symbol}")
-                    else:
-                        logger.warning(f"Failed to get price for {symbol}: HTTP {response.status}")
+            # Reuse the pooled session to keep connections alive between calls
+            session = await self.ensure_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    
+                    # Try to get the price from different possible fields
+                    price_fields = ['marketPrice', 'oraclePrice', 'indexPrice', 'lastPrice']
+                    
+                    for field in price_fields:
+                        if field in data and data[field]:
+                            # Convert from blockchain native format (with 18 decimals)
+                            raw_price = data[field]
+                            price = float(raw_price) / 1e18
+                            logger.debug(f"Got {symbol} price from {field}: {price}")
+                            return price
+                    
+                    logger.warning(f"No price fields found for {symbol}")
+                else:
+                    logger.warning(f"Failed to get price for {symbol}: HTTP {response.status}")
         except Exception as e:
             logger.error(f"Error fetching price for {symbol}: {e}")
             
@@ -193,13 +211,13 @@ class BluefinMarket:
         url = f"{self.base_url}/exchangeInfo"
         
         try:
-            async with get_session() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data
-                    else:
-                        logger.warning(f"Failed to get exchange info: HTTP {response.status}")
+            session = await self.ensure_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return data
+                else:
+                    logger.warning(f"Failed to get exchange info: HTTP {response.status}")
         except Exception as e:
             logger.error(f"Error fetching exchange info: {e}")
             
@@ -251,4 +269,8 @@ async def get_eth_price() -> Optional[float]:
 
 async def get_sol_price() -> Optional[float]:
     """Quick helper to get SOL-PERP price"""
-    return await market.get_sol_price() 
\ No newline at end of file
+    return await market.get_sol_price()
+
+async def close() -> None:
+    """Close the shared market data session"""
+    await market.close() 
\ No newline at end of file
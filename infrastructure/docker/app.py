@@ -1,33 +1,121 @@
+# gevent must patch the stdlib before anything else imports socket/threading
+try:
+    from gevent import monkey
+    monkey.patch_all()
+    GEVENT_AVAILABLE = True
+except ImportError:
+    GEVENT_AVAILABLE = False
+
 import os
 import json
 import logging
+import logging.handlers
+import queue
 import time
+import hashlib
+import hmac
+import itertools
+import atexit
 import subprocess
 import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from core.config import TRADING_PARAMS, RISK_PARAMS, AI_PARAMS
 import jwt
+import httpx
 from datetime import datetime, timedelta
 from functools import wraps
 from flask import Flask, request, jsonify, g, render_template
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import BadRequest
 from flask_socketio import SocketIO
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from anthropic import Client
 from flask_cors import CORS
 
-# Setup logging
+# Use msgspec's C JSON codec for API responses and request bodies when it is installed
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+    json_loads = msgspec.json.Decoder().decode
+    JSON_DECODE_ERRORS = (ValueError, msgspec.DecodeError)
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+    json_loads = json.loads
+    JSON_DECODE_ERRORS = (ValueError,)
+
+# Ensure output directories exist once at startup instead of per request
+for _dir in ("logs", "analysis", "alerts", "config"):
+    os.makedirs(_dir, exist_ok=True)
+
+# Sequence suffix keeping saved payload names unique within the same nanosecond
+_file_seq = itertools.count()
+
+# Setup logging: request threads only enqueue records, a listener thread does the writes
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler("logs/webhook_server.log"),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("logs/webhook_server.log"),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger("webhook_server")
 
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider serializing jsonify() responses with msgspec.
+    
+    Indented output (debug mode or compact=False) and values msgspec cannot
+    encode fall back to the default stdlib-based provider.
+    """
+    
+    _encode = msgspec.json.Encoder().encode if MSGSPEC_AVAILABLE else None
+    
+    def response(self, *args, **kwargs):
+        indented = (self.compact is None and self._app.debug) or self.compact is False
+        if self._encode is not None and not indented:
+            obj = self._prepare_response_obj(args, kwargs)
+            try:
+                body = self._encode(obj)
+            except (TypeError, msgspec.EncodeError):
+                pass
+            else:
+                return self._app.response_class(body, mimetype=self.mimetype)
+        return super().response(*args, **kwargs)
+    
+    def dumps(self, obj, **kwargs):
+        if self._encode is not None and not kwargs:
+            try:
+                return self._encode(obj).decode()
+            except (TypeError, msgspec.EncodeError):
+                pass
+        return super().dumps(obj, **kwargs)
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
+
+def _body_json(raw=None):
+    """Parse the request body as JSON without caching the raw bytes on the request.
+    
+    An empty body parses as None; malformed JSON raises BadRequest like request.json.
+    """
+    if raw is None:
+        raw = request.get_data(cache=False)
+    try:
+        return json_loads(raw or b'null')
+    except JSON_DECODE_ERRORS as e:
+        raise BadRequest(f"Invalid JSON body: {e}")
 
 # Configure static file serving
 if os.path.exists('frontend/dist'):
@@ -40,18 +128,29 @@ elif os.path.exists('static'):
     app.static_folder = 'static'
     app.static_url_path = '/static'
 
-# Configure CORS
-CORS(app)
+# Configure CORS; browsers may cache preflight results for a day
+CORS(app, max_age=86400)
 
 # Initialize Flask-SocketIO
-socketio = SocketIO(app, cors_allowed_origins="*")
+# Cooperative gevent workers let blocking I/O (Claude, agent runs, file writes) yield
+socketio = SocketIO(app, async_mode="gevent" if GEVENT_AVAILABLE else None, cors_allowed_origins="*")
+
+# Claude model used by /test-claude
+CLAUDE_MODEL = os.environ.get("CLAUDE_MODEL", "claude-3.7-sonnet")
 
 # Initialize Claude client
 claude_client = None
 try:
     api_key = os.environ.get("ANTHROPIC_API_KEY")
     if api_key and api_key != "your_api_key_here":
-        claude_client = Client(api_key=api_key)
+        # One long-lived HTTP/2 pool keeps the TLS session warm across calls
+        claude_client = Client(
+            api_key=api_key,
+            http_client=httpx.Client(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+            )
+        )
         logger.info("Claude client initialized")
     else:
         logger.warning("Claude API key not found or not set")
@@ -76,15 +175,75 @@ trading_state = {
     "last_analysis": None
 }
 
-# Initialize rate limiter
+# Prebuilt /status and /health bodies: status is rebuilt after trading_state changes,
+# health at most once per clock second
+_status_version = 0
+_status_cache = (-1, None)
+_health_cache = (None, None)
+
+def _invalidate_status():
+    """Mark the cached /status body stale after a trading_state change"""
+    global _status_version
+    _status_version += 1
+
+def _json_body_response(body):
+    """Wrap an already-encoded JSON body in a response"""
+    return app.response_class(body, mimetype="application/json")
+
+# Bounded pool for agent runs triggered by webhooks
+AGENT_WORKERS = int(os.environ.get("AGENT_WORKERS", "4"))
+# Seconds an agent subprocess may run before it is killed
+AGENT_TIMEOUT = int(os.environ.get("AGENT_TIMEOUT", "300"))
+AGENT_POOL = ThreadPoolExecutor(max_workers=AGENT_WORKERS, thread_name_prefix="agent")
+atexit.register(AGENT_POOL.shutdown)
+
+# Initialize rate limiter; point RATELIMIT_STORAGE at Redis (e.g. redis://localhost:6379/0)
+# so limits are shared across worker processes. Defaults to per-process memory for dev.
 limiter = Limiter(
     get_remote_address,
     app=app,
     default_limits=["200 per day", "50 per hour"],
-    storage_uri="memory://",
+    storage_uri=os.environ.get("RATELIMIT_STORAGE", "memory://"),
     strategy="fixed-window"
 )
 
+# Saved webhook/alert payloads waiting for the background disk writer
+DISK_QUEUE_MAXSIZE = 1024
+_disk_q = queue.Queue(maxsize=DISK_QUEUE_MAXSIZE)
+
+def _write_file(filename, payload):
+    """Write bytes via a temp file and rename, so pollers never see a partial file"""
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_filename, filename)
+
+def _disk_writer():
+    """Background worker draining _disk_q"""
+    while True:
+        filename, payload = _disk_q.get()
+        try:
+            _write_file(filename, payload)
+        except Exception as e:
+            logger.error(f"Error writing {filename}: {e}")
+        finally:
+            _disk_q.task_done()
+
+def _save_payload(filename, data, indent=None):
+    """Queue a JSON payload to be written off the request path"""
+    payload = json.dumps(data, indent=indent).encode()
+    try:
+        _disk_q.put_nowait((filename, payload))
+    except queue.Full:
+        # Writer is behind; apply backpressure by writing inline
+        _write_file(filename, payload)
+
+threading.Thread(target=_disk_writer, name="disk-writer", daemon=True).start()
+atexit.register(_disk_q.join)
+
+# Parsed config/config.json and the st_mtime_ns it was read at
+_cfg_cache = {'mtime': 0, 'data': None}
+
 # JWT Configuration
 JWT_SECRET = os.environ.get('JWT_SECRET', 'dev-secret-key')
 if JWT_SECRET == 'dev-secret-key' and os.environ.get('FLASK_ENV') == 'production':
@@ -92,13 +251,61 @@ if JWT_SECRET == 'dev-secret-key' and os.environ.get('FLASK_ENV') == 'production
 JWT_ALGORITHM = 'HS256'
 JWT_EXPIRATION_DELTA = timedelta(days=1)
 
+# Signing key, algorithm list and claim requirements built once rather than per call
+_JWT_KEY = JWT_SECRET.encode() if isinstance(JWT_SECRET, str) else JWT_SECRET
+_JWT_ALGORITHMS = [JWT_ALGORITHM]
+_JWT_DECODE_OPTIONS = {'require': ['exp', 'user_id']}
+
+# Validated token payloads are reused for this many seconds (never past the token's exp)
+JWT_CACHE_TTL = 30
+JWT_CACHE_MAXSIZE = 10000
+
+# sha256(token) prefix -> (payload, expires_at); only tokens that passed validation are stored
+_jwt_cache = {}
+_jwt_cache_lock = threading.Lock()
+
+# Admin credentials are read once at startup; only digests are kept for comparison
+_ADMIN_USERNAME = os.environ.get('ADMIN_USERNAME', 'admin')
+_ADMIN_USING_DEFAULTS = _ADMIN_USERNAME == 'admin' and os.environ.get('ADMIN_PASSWORD', 'password') == 'password'
+_ADMIN_USERNAME_DIGEST = hashlib.sha256(_ADMIN_USERNAME.encode()).digest()
+_ADMIN_PASSWORD_DIGEST = hashlib.sha256(os.environ.get('ADMIN_PASSWORD', 'password').encode()).digest()
+
+def _check_admin_credentials(username, password):
+    """Compare login credentials against the admin account in constant time"""
+    user_ok = hmac.compare_digest(hashlib.sha256(str(username).encode()).digest(), _ADMIN_USERNAME_DIGEST)
+    password_ok = hmac.compare_digest(hashlib.sha256(str(password).encode()).digest(), _ADMIN_PASSWORD_DIGEST)
+    return user_ok and password_ok
+
 def generate_token(user_id):
     """Generate a new JWT token for the given user_id"""
     payload = {
         'user_id': user_id,
         'exp': datetime.utcnow() + JWT_EXPIRATION_DELTA
     }
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    return jwt.encode(payload, _JWT_KEY, algorithm=JWT_ALGORITHM)
+
+def _decode_cached(token):
+    """Decode a JWT, reusing a recent successful validation of the same token.
+    
+    Cache keys are a truncated SHA-256 of the token so raw tokens are never kept.
+    Raises the same jwt exceptions as jwt.decode on a cache miss.
+    """
+    key = hashlib.sha256(token.encode()).hexdigest()[:32]
+    now = time.time()
+    
+    cached = _jwt_cache.get(key)
+    if cached is not None and now < cached[1]:
+        return cached[0]
+    
+    payload = jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS, options=_JWT_DECODE_OPTIONS)
+    expires_at = min(now + JWT_CACHE_TTL, payload.get('exp', float('inf')))
+    
+    with _jwt_cache_lock:
+        if len(_jwt_cache) >= JWT_CACHE_MAXSIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            _jwt_cache.pop(next(iter(_jwt_cache)), None)
+        _jwt_cache[key] = (payload, expires_at)
+    return payload
 
 def token_required(f):
     """Decorator to protect routes with JWT authentication"""
@@ -114,7 +321,7 @@ def token_required(f):
             return jsonify({'status': 'error', 'message': 'Authentication token is missing'}), 401
             
         try:
-            payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+            payload = _decode_cached(token)
             # Store user_id in g instead of request
             g.user_id = payload['user_id']
         except jwt.ExpiredSignatureError:
@@ -125,35 +332,46 @@ def token_required(f):
         return f(*args, **kwargs)
     return decorated
 
+def _resolve_index():
+    """Pick how '/' is served, once at startup: ('static'|'file'|'api', cached html)"""
+    if os.path.exists('frontend/dist/index.html') or os.path.exists('frontend/build/index.html'):
+        return 'static', None
+    if os.path.exists('index.html'):
+        with open('index.html', 'r') as f:
+            return 'file', f.read()
+    return 'api', None
+
+_INDEX_MODE, _INDEX_HTML = _resolve_index()
+
+# API information served by '/' when there is no frontend, encoded once
+_API_INFO_BODY = app.json.dumps({
+    "status": "PerplexityTrader API running",
+    "version": os.environ.get("APP_VERSION", "1.0.0"),
+    "environment": os.environ.get("FLASK_ENV", "production"),
+    "endpoints": [
+        "/status - Get current trading status",
+        "/start - Start the trading bot",
+        "/stop - Stop the trading bot",
+        "/configure - Configure trading parameters",
+        "/positions - Get open positions",
+        "/analysis - Get latest analysis result",
+        "/webhook - Process TradingView alerts",
+        "/health - Health check endpoint"
+    ]
+})
+
 @app.route('/')
 def index():
     """Render the main dashboard page"""
     try:
-        # Check if we have a frontend directory with an index.html
-        if os.path.exists('frontend/dist/index.html'):
-            return app.send_static_file('index.html')
-        elif os.path.exists('frontend/build/index.html'):
+        # Frontend location was resolved at startup
+        if _INDEX_MODE == 'static':
             return app.send_static_file('index.html')
-        elif os.path.exists('index.html'):
-            with open('index.html', 'r') as f:
-                return f.read()
+        elif _INDEX_MODE == 'file':
+            return _INDEX_HTML
         else:
             # If no frontend is available, return API information
-            return jsonify({
-                "status": "PerplexityTrader API running",
-                "version": os.environ.get("APP_VERSION", "1.0.0"),
-                "environment": os.environ.get("FLASK_ENV", "production"),
-                "endpoints": [
-                    "/status - Get current trading status",
-                    "/start - Start the trading bot",
-                    "/stop - Stop the trading bot",
-                    "/configure - Configure trading parameters",
-                    "/positions - Get open positions",
-                    "/analysis - Get latest analysis result",
-                    "/webhook - Process TradingView alerts",
-                    "/health - Health check endpoint"
-                ]
-            })
+            return _json_body_response(_API_INFO_BODY)
     except Exception as e:
         logger.error(f"Error serving index: {e}")
         return jsonify({"status": "error", "message": str(e)}), 500
@@ -161,12 +379,18 @@ def index():
 @app.route('/status', methods=['GET'])
 def get_status():
     """Get the current status of the trading bot"""
-    return jsonify({
-        "active": trading_state["active"],
-        "current_parameters": trading_state["current_parameters"],
-        "open_positions_count": len(trading_state["open_positions"]),
-        "last_analysis_time": trading_state["last_analysis"]["timestamp"] if trading_state["last_analysis"] else None
-    })
+    global _status_cache
+    version = _status_version
+    cached_version, body = _status_cache
+    if cached_version != version:
+        body = app.json.dumps({
+            "active": trading_state["active"],
+            "current_parameters": trading_state["current_parameters"],
+            "open_positions_count": len(trading_state["open_positions"]),
+            "last_analysis_time": trading_state["last_analysis"]["timestamp"] if trading_state["last_analysis"] else None
+        })
+        _status_cache = (version, body)
+    return _json_body_response(body)
 
 @app.route('/start', methods=['POST'])
 def start_trading():
@@ -177,6 +401,7 @@ def start_trading():
     # In a full implementation, you would start the trading agent in a separate process
     # For now, we'll just update the state
     trading_state["active"] = True
+    _invalidate_status()
     logger.info(f"Started trading with parameters: {trading_state['current_parameters']}")
     
     return jsonify({"status": "success", "message": "Trading bot started", "parameters": trading_state["current_parameters"]})
@@ -189,6 +414,7 @@ def stop_trading():
     
     # In a full implementation, you would stop the trading agent process
     trading_state["active"] = False
+    _invalidate_status()
     logger.info("Stopped trading")
     
     return jsonify({"status": "success", "message": "Trading bot stopped"})
@@ -198,7 +424,7 @@ def stop_trading():
 def configure():
     """Configure trading parameters"""
     try:
-        new_params = request.json
+        new_params = _body_json()
         
         # Validate required parameters
         required_params = ["symbol", "timeframe", "leverage", "stop_loss_pct", "position_size_pct", "max_positions"]
@@ -208,17 +434,18 @@ def configure():
         
         # Update in-memory trading parameters
         trading_state["current_parameters"] = new_params
+        _invalidate_status()
         logger.info(f"Updated trading parameters: {new_params}")
         
         # Save updated parameters to config file
         config_dir = "config"
-        os.makedirs(config_dir, exist_ok=True)
         with open(os.path.join(config_dir, "config.json"), "w") as f:
             json.dump({
                 "TRADING_PARAMS": new_params,
                 "RISK_PARAMS": RISK_PARAMS,
                 "AI_PARAMS": AI_PARAMS
             }, f, indent=2)
+        _cfg_cache['mtime'] = 0
         
         return jsonify({"status": "success", "message": "Trading parameters updated", "parameters": new_params})
     except Exception as e:
@@ -243,11 +470,12 @@ def get_analysis():
 def mock_analysis():
     """Mock endpoint to simulate receiving an analysis result (for testing)"""
     try:
-        analysis = request.json
+        analysis = _body_json()
         trading_state["last_analysis"] = {
             "timestamp": datetime.now().isoformat(),
             "result": analysis
         }
+        _invalidate_status()
         logger.info(f"Received mock analysis: {analysis}")
         
         return jsonify({"status": "success", "message": "Analysis received"})
@@ -268,7 +496,7 @@ def webhook():
     }
     """
     try:
-        data = request.json
+        data = _body_json()
         logger.info(f"Received webhook: {json.dumps(data)}")
         
         if not data:
@@ -286,17 +514,14 @@ def webhook():
         timeframe = data.get("timeframe", "5m")
         
         # Save webhook data to file for the agent to process
-        os.makedirs("analysis", exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = f"{time.time_ns()}_{next(_file_seq)}"
         filename = f"analysis/webhook_{timestamp}.json"
         
-        with open(filename, "w") as f:
-            json.dump(data, f)
-            
-        logger.info(f"Saved webhook data to {filename}")
+        _save_payload(filename, data)
+        logger.info(f"Saving webhook data to {filename}")
         
-        # Start the analysis in a background thread so we can return immediately
-        threading.Thread(target=run_analysis, args=(ticker, timeframe)).start()
+        # Queue the analysis on the agent pool so we can return immediately
+        AGENT_POOL.submit(run_analysis, ticker, timeframe)
         
         return jsonify({
             "status": "success",
@@ -312,7 +537,7 @@ def webhook():
 def process_vmanchu_alert():
     """Process a VuManChu Cipher B alert from TradingView"""
     try:
-        data = request.json
+        data = _body_json()
         
         # Check if data is None
         if data is None:
@@ -337,12 +562,10 @@ def process_vmanchu_alert():
         signal_type = data.get("signal_type", "UNKNOWN")
         
         # Save the alert to a file for reference
-        os.makedirs("alerts", exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = f"{time.time_ns()}_{next(_file_seq)}"
         filename = f"alerts/vmanchu_alert_{timestamp}_{symbol.replace('/', '_')}.json"
-        with open(filename, "w") as f:
-            json.dump(data, f, indent=2)
-        logger.info(f"Saved VuManChu alert to {filename}")
+        _save_payload(filename, data, indent=2)
+        logger.info(f"Saving VuManChu alert to {filename}")
         
         # Process the signal
         logger.info(f"Processing {signal_type} signal for {symbol} on {timeframe}")
@@ -363,6 +586,10 @@ def process_vmanchu_alert():
         logger.error(f"Error processing VuManChu alert: {e}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
+# Cipher B signal types with an unambiguous direction
+BULLISH_SIGNALS = frozenset({"GREEN_CIRCLE", "GOLD_CIRCLE", "BULL_FLAG", "BULL_DIAMOND"})
+BEARISH_SIGNALS = frozenset({"RED_CIRCLE", "BEAR_FLAG", "BEAR_DIAMOND"})
+
 def process_cipher_b_signal(symbol, timeframe, action, signal_type, alert_data):
     """Process a VuManChu Cipher B signal and make a trading decision"""
     try:
@@ -370,9 +597,9 @@ def process_cipher_b_signal(symbol, timeframe, action, signal_type, alert_data):
         trade_direction = alert_data.get("trade_direction")
         if not trade_direction:
             # If trade_direction wasn't provided, determine it based on signal type and action
-            if signal_type in ["GREEN_CIRCLE", "GOLD_CIRCLE", "BULL_FLAG", "BULL_DIAMOND"]:
+            if signal_type in BULLISH_SIGNALS:
                 trade_direction = "Bullish"
-            elif signal_type in ["RED_CIRCLE", "BEAR_FLAG", "BEAR_DIAMOND"]:
+            elif signal_type in BEARISH_SIGNALS:
                 trade_direction = "Bearish"
             else:
                 # For ambiguous signals like PURPLE_TRIANGLE or LITTLE_CIRCLE
@@ -394,11 +621,10 @@ def process_cipher_b_signal(symbol, timeframe, action, signal_type, alert_data):
             "--vmanchu_mode"
         ]
         
-        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, stderr = process.communicate()
+        process = subprocess.run(cmd, capture_output=True, timeout=AGENT_TIMEOUT)
         
         if process.returncode != 0:
-            logger.error(f"Error running agent for VuManChu signal: {stderr.decode()}")
+            logger.error(f"Error running agent for VuManChu signal: {process.stderr.decode()}")
         else:
             logger.info(f"Successfully processed VuManChu {action} signal for {symbol}")
             
@@ -412,6 +638,7 @@ def process_cipher_b_signal(symbol, timeframe, action, signal_type, alert_data):
                 "trade_direction": trade_direction,
                 "result": "Signal processed successfully"
             }
+            _invalidate_status()
             
     except Exception as e:
         logger.error(f"Failed to process VuManChu signal: {str(e)}", exc_info=True)
@@ -421,11 +648,10 @@ def run_analysis(ticker, timeframe):
     try:
         logger.info(f"Starting analysis for {ticker} on {timeframe} timeframe")
         cmd = ["python", "agent.py", "--ticker", ticker, "--timeframe", timeframe]
-        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, stderr = process.communicate()
+        process = subprocess.run(cmd, capture_output=True, timeout=AGENT_TIMEOUT)
         
         if process.returncode != 0:
-            logger.error(f"Error running agent: {stderr.decode()}")
+            logger.error(f"Error running agent: {process.stderr.decode()}")
         else:
             logger.info(f"Agent analysis completed successfully for {ticker}")
             
@@ -442,8 +668,7 @@ def test_claude():
         }), 500
     
     try:
-        # Get Claude model information
-        model = os.environ.get("CLAUDE_MODEL", "claude-3.7-sonnet")
+        model = CLAUDE_MODEL
         
         # Simple test message
         response = claude_client.messages.create(
@@ -480,21 +705,19 @@ def test_claude():
 def login():
     """Authenticate user and return JWT token"""
     try:
-        data = request.json
+        data = _body_json()
         
         if not data or not data.get('username') or not data.get('password'):
             logger.warning(f"Login attempt with missing credentials from {get_remote_address()}")
             return jsonify({'status': 'error', 'message': 'Username and password are required'}), 400
         
-        # Get admin credentials from environment variables with fallbacks
-        admin_username = os.environ.get('ADMIN_USERNAME', 'admin')
-        admin_password = os.environ.get('ADMIN_PASSWORD', 'password')
+        admin_username = _ADMIN_USERNAME
         
         # In production, warn if using default credentials
-        if os.environ.get('FLASK_ENV') == 'production' and admin_username == 'admin' and admin_password == 'password':
+        if _ADMIN_USING_DEFAULTS and os.environ.get('FLASK_ENV') == 'production':
             logger.warning("WARNING: Using default admin credentials in production environment!")
             
-        if data.get('username') == admin_username and data.get('password') == admin_password:
+        if _check_admin_credentials(data.get('username'), data.get('password')):
             token = generate_token('admin')
             logger.info(f"Successful login for user: {admin_username}")
             return jsonify({
@@ -522,9 +745,18 @@ def get_configuration():
         config_dir = "config"
         config_file = os.path.join(config_dir, "config.json")
         
-        if os.path.exists(config_file):
-            with open(config_file, "r") as f:
-                config = json.load(f)
+        try:
+            mtime = os.stat(config_file).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        
+        if mtime is not None:
+            # Only re-read the file when it has changed since the last load
+            if mtime != _cfg_cache['mtime']:
+                with open(config_file, "r") as f:
+                    _cfg_cache['data'] = json.load(f)
+                _cfg_cache['mtime'] = mtime
+            config = _cfg_cache['data']
         else:
             # Return default configuration from core.config
             config = {
@@ -541,25 +773,31 @@ def get_configuration():
 @app.route('/health')
 def health_check():
     """Health check endpoint for monitoring"""
+    global _health_cache
     try:
-        # Check if the application is running
-        status = {
-            "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
-            "version": os.environ.get("APP_VERSION", "1.0.0"),
-            "environment": os.environ.get("FLASK_ENV", "development")
-        }
-        
-        # Check if Claude client is initialized
-        if claude_client:
-            status["claude_client"] = "available"
-        else:
-            status["claude_client"] = "unavailable"
+        now = int(time.time())
+        cached_second, body = _health_cache
+        if cached_second != now:
+            # Check if the application is running
+            status = {
+                "status": "healthy",
+                "timestamp": datetime.utcfromtimestamp(now).isoformat(),
+                "version": os.environ.get("APP_VERSION", "1.0.0"),
+                "environment": os.environ.get("FLASK_ENV", "development")
+            }
             
-        # Check if WebSocket server is running
-        status["websocket_server"] = "running" if socketio is not None else "not running"
+            # Check if Claude client is initialized
+            if claude_client:
+                status["claude_client"] = "available"
+            else:
+                status["claude_client"] = "unavailable"
+                
+            # Check if WebSocket server is running
+            status["websocket_server"] = "running" if socketio is not None else "not running"
             
-        return jsonify(status)
+            body = app.json.dumps(status)
+            _health_cache = (now, body)
+        return _json_body_response(body)
     except Exception as e:
         logger.error(f"Health check failed: {e}")
         return jsonify({
@@ -579,10 +817,64 @@ def handle_disconnect():
     """Handle client disconnection"""
     logger.info(f"Client disconnected")
 
+# Socket updates are coalesced per event type and flushed on this interval (seconds)
+EMIT_FLUSH_INTERVAL = 0.02
+# Most updates of one event type sent per flush; the rest wait for the next one
+EMIT_MAX_BATCH = 64
+# Above this many connected clients a broadcast yields to other tasks between chunks
+BROADCAST_CHUNK_SIZE = 50
+
+_emit_queue = defaultdict(list)
+_emit_lock = threading.Lock()
+_emit_flusher_started = False
+
+def _broadcast_chunked(event_type, items, batch=BROADCAST_CHUNK_SIZE):
+    """Emit each update to every client, yielding between chunks of sids when many are connected"""
+    try:
+        sids = [sid for sid, _ in socketio.server.manager.get_participants('/', None)]
+    except KeyError:
+        # No client has joined the default namespace yet
+        sids = []
+    
+    if len(sids) <= batch:
+        for data in items:
+            socketio.emit(event_type, data)
+        return
+    
+    for i in range(0, len(sids), batch):
+        for sid in sids[i:i + batch]:
+            for data in items:
+                socketio.emit(event_type, data, to=sid)
+        socketio.sleep(0)
+
+def _flush_emit_queue():
+    """Background task sending queued updates, one event per update as clients expect"""
+    while True:
+        socketio.sleep(EMIT_FLUSH_INTERVAL)
+        with _emit_lock:
+            batches = []
+            for event_type in list(_emit_queue):
+                items = _emit_queue[event_type]
+                batches.append((event_type, items[:EMIT_MAX_BATCH]))
+                del items[:EMIT_MAX_BATCH]
+                if not items:
+                    del _emit_queue[event_type]
+        for event_type, items in batches:
+            try:
+                _broadcast_chunked(event_type, items)
+            except Exception as e:
+                logger.error(f"Error emitting {event_type} updates: {e}")
+
 # Function to emit updates to connected clients
 def emit_update(event_type, data):
-    """Emit an update to all connected clients"""
-    socketio.emit(event_type, data)
+    """Queue an update for all connected clients; the flusher emits it with the same payload shape"""
+    global _emit_flusher_started
+    with _emit_lock:
+        _emit_queue[event_type].append(data)
+        start_flusher = not _emit_flusher_started
+        _emit_flusher_started = True
+    if start_flusher:
+        socketio.start_background_task(_flush_emit_queue)
 
 # Update the run code to use socketio instead of app.run
 if __name__ == '__main__':
@@ -590,5 +882,6 @@ if __name__ == '__main__':
     os.makedirs("logs", exist_ok=True)
     os.makedirs("data", exist_ok=True)
     
-    # Start the Flask-SocketIO server
-    socketio.run(app, host='0.0.0.0', port=5001, debug=True) 
\ No newline at end of file
+    # Start the Flask-SocketIO server (served by gevent's WSGI server when installed)
+    # The reloader and interactive debugger are only enabled in development
+    socketio.run(app, host='0.0.0.0', port=5001, debug=os.environ.get('FLASK_ENV') == 'development') 
\ No newline at end of file
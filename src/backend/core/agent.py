@@ -656,10 +656,13 @@ async def get_account_info(client):
     try:
         # Get account data based on API
         if hasattr(client, 'get_user_account_data'):
-            # bluefin_client_sui approach
-            account_data = await client.get_user_account_data()
-            margin_data = await client.get_user_margin()
-            positions = await client.get_user_positions() or []
+            # bluefin_client_sui approach; the three reads are independent, so run them concurrently
+            account_data, margin_data, positions = await asyncio.gather(
+                client.get_user_account_data(),
+                client.get_user_margin(),
+                client.get_user_positions()
+            )
+            positions = positions or []
             
             account_info = {
                 "balance": float(account_data.get("totalCollateralValue", 0)),
@@ -2124,6 +2127,13 @@ async def ensure_leverage(symbol, target_leverage):
 
 # Define a simple Order class to track order state
 class Order:
+    # Fixed attribute set: no per-instance __dict__, and attribute access is a slot lookup
+    __slots__ = (
+        'symbol', 'side', 'quantity', 'order_type', 'price', 'leverage', 'hash', 'status',
+        'created_at', 'settlement_status', 'requeue_count', 'cancelled', 'fill_price',
+        'matched_quantity', 'is_maker'
+    )
+    
     def __init__(self, 
                  symbol: str, 
                  side: str, 
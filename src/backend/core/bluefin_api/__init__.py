@@ -8,7 +8,7 @@ for trading cryptocurrency futures, accessing market data, and managing accounts
 import os
 from typing import Optional
 
-from core.bluefin_client import (
+from core.bluefin_api.client import (
     BluefinClientInterface,
     BluefinApiClient,
     MockBluefinClient,
@@ -36,7 +36,8 @@ __version__ = "1.0.0"
 async def get_client(use_mock: bool = False,
                    api_key: Optional[str] = None,
                    api_secret: Optional[str] = None,
-                   api_url: Optional[str] = None) -> BluefinClientInterface:
+                   api_url: Optional[str] = None,
+                   use_price_feed: bool = False) -> BluefinClientInterface:
     """
     Convenience function to get a pre-configured Bluefin client.
     
@@ -45,6 +46,7 @@ async def get_client(use_mock: bool = False,
         api_key: Bluefin API key, defaults to environment variable
         api_secret: Bluefin API secret, defaults to environment variable
         api_url: API URL, defaults to environment variable or default URL
+        use_price_feed: Serve market prices from a WebSocket feed on BLUEFIN_WS_URL
         
     Returns:
         Initialized Bluefin client
@@ -53,7 +55,9 @@ async def get_client(use_mock: bool = False,
         use_mock=use_mock,
         api_key=api_key or CONFIG["api_key"],
         api_secret=api_secret or CONFIG["api_secret"],
-        api_url=api_url or CONFIG["api_url"]
+        api_url=api_url or CONFIG["api_url"],
+        use_price_feed=use_price_feed,
+        ws_url=CONFIG["ws_url"]
     )
 
 __all__ = [
@@ -7,7 +7,8 @@ API, supporting API key authentication method.
 Usage:
     from core.bluefin_api import get_client
     
-    # Create a client instance
+    # Create a client instance (clients are also async context managers
+    # that close their connection pool on exit)
     client = await get_client()
     
     # Get account information
@@ -24,17 +25,18 @@ Usage:
 """
 
 import os
-import json
 import time
+import asyncio
 import hmac
 import logging
-import asyncio
 import hashlib
 import aiohttp
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Any, Tuple
 from urllib.parse import urlencode
 from dotenv import load_dotenv
 
+from core.bluefin_api.websocket import BluefinWebSocketManager, WEBSOCKETS_AVAILABLE
+
 # Load environment variables
 load_dotenv()
 
@@ -68,6 +70,15 @@ DEFAULT_API_URL = "https://dapi.api.sui-prod.bluefin.io"
 DEFAULT_WS_URL = "wss://dstream.api.sui-prod.bluefin.io/ws"
 REQUEUE_ADJUSTMENT_THRESHOLD = 2  # Adjust price after this many requeues
 
+# Connection pool settings for the client's HTTP session
+HTTP_CONNECTOR_LIMIT = 100
+HTTP_KEEPALIVE_TIMEOUT = 60
+HTTP_DNS_CACHE_TTL = 300
+HTTP_TOTAL_TIMEOUT = 10
+
+# Seconds a REST-fetched market price is reused for the same symbol
+MARKET_PRICE_CACHE_TTL = 0.1
+
 class BluefinClientInterface:
     """Interface for Bluefin clients to implement."""
     
@@ -101,6 +112,26 @@ class BluefinClientInterface:
         """Close a position for the given symbol, optionally specifying quantity."""
         raise NotImplementedError("Method not implemented")
     
+    async def close_positions(self, symbols: List[str]) -> List[Any]:
+        """
+        Close positions for several symbols concurrently.
+        
+        Closes are submitted together, so the order in which they reach the
+        exchange is not guaranteed. A failure closing one symbol does not
+        affect the others.
+        
+        Args:
+            symbols: Market symbols whose positions should be closed
+            
+        Returns:
+            One entry per symbol, in the same order: the close_position result
+            or the exception it raised
+        """
+        return await asyncio.gather(
+            *(self.close_position(symbol) for symbol in symbols),
+            return_exceptions=True
+        )
+    
     async def set_leverage(self, symbol: str, leverage: int) -> Dict[str, Any]:
         """Set leverage for a symbol."""
         raise NotImplementedError("Method not implemented")
@@ -144,21 +175,54 @@ class BluefinClientInterface:
 class BluefinApiClient(BluefinClientInterface):
     """Client implementation for Bluefin Exchange using API key authentication."""
     
-    def __init__(self, api_key: str, api_secret: str, api_url: Optional[str] = None):
-        """Initialize the Bluefin API client."""
+    def __init__(self, api_key: str, api_secret: str, api_url: Optional[str] = None,
+                 session: Optional[aiohttp.ClientSession] = None):
+        """
+        Initialize the Bluefin API client.
+        
+        Args:
+            api_key: Bluefin API key
+            api_secret: Bluefin API secret
+            api_url: Custom API URL
+            session: Shared pooled session to reuse; the caller keeps ownership of it
+        """
         self.api_key = api_key
         self.api_secret = api_secret
         self.api_url = api_url or DEFAULT_API_URL
-        self.session = None
+        self.session = session
+        self._owns_session = session is None
         
-        # Set up logging
-        self.logger = logging.getLogger(__name__)
+        # Optional streaming quote source (BluefinWebSocketManager) consulted before REST
+        self.price_feed = None
+        self._owns_price_feed = False
+        
+        # symbol -> (price, monotonic expiry) for REST-fetched prices
+        self._price_cache: Dict[str, Tuple[float, float]] = {}
+    
+    async def __aenter__(self) -> "BluefinApiClient":
+        await self._init_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
     
     async def _init_session(self):
-        """Initialize HTTP session if needed."""
+        """Initialize HTTP session if needed.
+        
+        The session and its keep-alive connection pool live for the lifetime of
+        the client, so repeated requests skip the DNS lookup and TCP/TLS handshake.
+        """
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
-            return self.session
+            self._owns_session = True
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=HTTP_CONNECTOR_LIMIT,
+                    keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                    ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+                    enable_cleanup_closed=True
+                ),
+                timeout=aiohttp.ClientTimeout(total=HTTP_TOTAL_TIMEOUT)
+            )
         return self.session
     
     def _generate_signature(self, data: str) -> str:
@@ -217,11 +281,11 @@ class BluefinApiClient(BluefinClientInterface):
                 response_data = await response.json()
                 
                 if response.status != 200:
-                    self.logger.error(f"API Error: {response.status} - {response_data}")
+                    logger.error(f"API Error: {response.status} - {response_data}")
                 
                 return response_data
         except Exception as e:
-            self.logger.error(f"Request error: {str(e)}")
+            logger.error(f"Request error: {str(e)}")
             raise
     
     async def get_account_info(self) -> Dict[str, Any]:
@@ -321,8 +385,33 @@ class BluefinApiClient(BluefinClientInterface):
         # Using a placeholder implementation
         return {"status": "success", "leverage": leverage}
     
+    def attach_price_feed(self, price_feed: BluefinWebSocketManager, owned: bool = False) -> None:
+        """
+        Serve market prices from a WebSocket top-of-book feed when it has a fresh quote.
+        
+        Args:
+            price_feed: A connected BluefinWebSocketManager; a symbol's bookTicker
+                stream is subscribed the first time its price is requested
+            owned: Disconnect the feed when this client is closed
+        """
+        self.price_feed = price_feed
+        self._owns_price_feed = owned
+    
     async def get_market_price(self, symbol: str) -> float:
         """Get the current market price for a symbol."""
+        # A fresh streamed quote avoids the REST round-trip entirely
+        if self.price_feed is not None:
+            quote = self.price_feed.get_top_of_book(symbol)
+            if quote is not None:
+                bid, ask = quote
+                return (bid + ask) / 2
+            # Start streaming this symbol so later lookups can skip REST
+            self.price_feed.track_top_of_book(symbol)
+        
+        cached = self._price_cache.get(symbol)
+        if cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
+        
         # Get recent trades for the symbol
         params = {
             "symbol": symbol,
@@ -340,13 +429,15 @@ class BluefinApiClient(BluefinClientInterface):
                 # Access first element safely
                 latest_trade = next(iter(response), None)
                 if latest_trade and isinstance(latest_trade, dict) and "price" in latest_trade:
-                    return float(latest_trade["price"])
+                    price = float(latest_trade["price"])
+                    self._price_cache[symbol] = (price, time.monotonic() + MARKET_PRICE_CACHE_TTL)
+                    return price
                 else:
                     raise ValueError(f"Invalid trade data structure: {latest_trade}")
             else:
                 raise ValueError(f"Invalid response format for trades: {response}")
         except (KeyError, ValueError) as e:
-            self.logger.error(f"Error processing market price data: {str(e)}")
+            logger.error(f"Error processing market price data: {str(e)}")
             raise ValueError(f"Could not get market price for {symbol}: {str(e)}")
     
     async def get_user_trades_history(self, **kwargs) -> List[Dict[str, Any]]:
@@ -357,8 +448,12 @@ class BluefinApiClient(BluefinClientInterface):
     
     async def close(self) -> None:
         """Close the client connection."""
-        if self.session and not self.session.closed:
+        if self._owns_price_feed and self.price_feed is not None:
+            await self.price_feed.disconnect()
+        self.price_feed = None
+        if self._owns_session and self.session and not self.session.closed:
             await self.session.close()
+        self.session = None
 
 
 class MockBluefinClient(BluefinClientInterface):
@@ -369,6 +464,7 @@ class MockBluefinClient(BluefinClientInterface):
         self.address = "0xmock_address"
         self.api_key = "mock_api_key"
         self.positions = []
+        self._positions_by_symbol: Dict[str, Dict[str, Any]] = {}
         self.orders = {}
         self.market_prices = {
             "BTC-PERP": 40000.0,
@@ -376,21 +472,20 @@ class MockBluefinClient(BluefinClientInterface):
             "SUI-PERP": 1.0
         }
         
-        # Set up logging
-        self.logger = logging.getLogger(__name__)
-        self.logger.info("MockBluefinClient initialized - no real API calls will be made")
+        logger.info("MockBluefinClient initialized - no real API calls will be made")
     
     async def get_account_info(self) -> Dict[str, Any]:
         """Get mock account information."""
         return {
             "balance": 10000.0,
             "availableMargin": 8000.0,
-            "positions": self.positions
+            "positions": list(self.positions)
         }
     
     async def get_positions(self) -> List[Dict[str, Any]]:
         """Get mock positions."""
-        return self.positions
+        # Hand out a copy so callers can't add or remove positions behind the symbol index
+        return list(self.positions)
     
     async def place_order(self, 
                          symbol: str, 
@@ -424,7 +519,7 @@ class MockBluefinClient(BluefinClientInterface):
             order["status"] = "FILLED"
             
             # Update positions
-            position = next((p for p in self.positions if p.get("symbol") == symbol), None)
+            position = self._positions_by_symbol.get(symbol)
             
             if position:
                 # Update existing position
@@ -434,13 +529,15 @@ class MockBluefinClient(BluefinClientInterface):
             else:
                 # Create new position
                 new_qty = quantity if side == ORDER_SIDE.BUY else -quantity
-                self.positions.append({
+                position = {
                     "symbol": symbol,
                     "positionQty": str(new_qty),
                     "entryPrice": str(price if price is not None else self.market_prices.get(symbol, 1000.0)),
                     "markPrice": str(self.market_prices.get(symbol, 1000.0)),
                     "unrealizedPnl": "0"
-                })
+                }
+                self.positions.append(position)
+                self._positions_by_symbol[symbol] = position
         
         return order
     
@@ -458,7 +555,7 @@ class MockBluefinClient(BluefinClientInterface):
                             symbol: str, 
                             quantity: Optional[float] = None) -> Dict[str, Any]:
         """Close a mock position."""
-        position = next((p for p in self.positions if p.get("symbol") == symbol), None)
+        position = self._positions_by_symbol.get(symbol)
         
         if not position:
             return {"status": "success", "message": "No position to close"}
@@ -486,7 +583,9 @@ class MockBluefinClient(BluefinClientInterface):
         # Update position
         if quantity is None or abs(quantity) >= abs(position_size):
             # Remove position if fully closed
-            self.positions = [p for p in self.positions if p.get("symbol") != symbol]
+            closed = self._positions_by_symbol.pop(symbol, None)
+            if closed is not None:
+                self.positions.remove(closed)
         else:
             # Update position size
             new_size = position_size + close_quantity if side == ORDER_SIDE.BUY else position_size - close_quantity
@@ -515,7 +614,10 @@ async def create_bluefin_client(
     use_mock: bool = False,
     api_key: Optional[str] = None,
     api_secret: Optional[str] = None,
-    api_url: Optional[str] = None
+    api_url: Optional[str] = None,
+    session: Optional[aiohttp.ClientSession] = None,
+    use_price_feed: bool = False,
+    ws_url: Optional[str] = None
 ) -> BluefinClientInterface:
     """
     Create and initialize a Bluefin client based on available credentials.
@@ -525,6 +627,10 @@ async def create_bluefin_client(
         api_key: Bluefin API key
         api_secret: Bluefin API secret
         api_url: Custom API URL
+        session: Shared pooled aiohttp session for the API client to reuse
+        use_price_feed: Also connect a WebSocket top-of-book feed and serve market prices
+            from it when it has a fresh quote; off by default so clients stay REST-only
+        ws_url: Custom WebSocket URL for the price feed
         
     Returns:
         Initialized Bluefin client
@@ -542,9 +648,18 @@ async def create_bluefin_client(
     if api_key and api_secret:
         try:
             logger.info("Creating Bluefin API client")
-            return BluefinApiClient(api_key=api_key, api_secret=api_secret, api_url=api_url)
+            client = BluefinApiClient(api_key=api_key, api_secret=api_secret, api_url=api_url,
+                                      session=session)
         except Exception as e:
             logger.error(f"Failed to initialize Bluefin API client: {str(e)}")
             raise
+        
+        if use_price_feed and WEBSOCKETS_AVAILABLE:
+            price_feed = BluefinWebSocketManager(url=ws_url)
+            if await price_feed.connect():
+                client.attach_price_feed(price_feed, owned=True)
+            else:
+                logger.warning("Price feed unavailable; market prices will come from REST")
+        return client
     
     raise ValueError("No valid credentials provided for Bluefin client") 
\ No newline at end of file
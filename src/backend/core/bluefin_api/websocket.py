@@ -24,11 +24,12 @@ Usage:
 """
 
 import asyncio
+import itertools
 import json
 import logging
 import os
 import time
-from typing import Dict, List, Optional, Any, AsyncGenerator, Callable, Union
+from typing import Dict, List, Optional, Any, AsyncGenerator, Callable, Union, Tuple
 
 try:
     import websockets
@@ -41,6 +42,15 @@ except ImportError:
 # Default WebSocket URL
 DEFAULT_WS_URL = "wss://dstream.api.sui-prod.bluefin.io/ws"
 
+# Seconds a streamed best bid/ask stays usable before callers should fall back to REST
+TOP_OF_BOOK_MAX_AGE = 5
+
+# Messages buffered for consumers and for event handlers before the oldest are dropped
+MESSAGE_QUEUE_MAXSIZE = 10_000
+
+# Seconds to wait for the exchange to acknowledge a SUBSCRIBE/UNSUBSCRIBE request
+REQUEST_TIMEOUT = 5.0
+
 logger = logging.getLogger(__name__)
 
 
@@ -66,7 +76,10 @@ class BluefinWebSocketManager:
         self.websocket: Optional[WebSocketClientProtocol] = None
         self.subscribed_streams: List[str] = []
         self.running = False
-        self.message_queue: asyncio.Queue = asyncio.Queue()
+        # Filled only while a messages() consumer is iterating
+        self.message_queue: asyncio.Queue = asyncio.Queue(maxsize=MESSAGE_QUEUE_MAXSIZE)
+        self._message_consumers = 0
+        self.dropped_messages = 0
         self.reconnect_interval = 5  # seconds
         self.max_reconnect_attempts = 5
         self.reconnect_attempts = 0
@@ -74,8 +87,26 @@ class BluefinWebSocketManager:
         self.heartbeat_interval = 30  # seconds
         self.heartbeat_task = None
         
-        # Event handlers
+        # Event handlers, run by a dispatcher task so slow handlers never stall the socket reader
         self.event_handlers: Dict[str, List[Callable]] = {}
+        # event type -> ((callback, is_coroutine), ...), rebuilt on registration so dispatch does no introspection
+        self._handler_table: Dict[str, Tuple[Tuple[Callable, bool], ...]] = {}
+        self._event_queue: asyncio.Queue = asyncio.Queue(maxsize=MESSAGE_QUEUE_MAXSIZE)
+        self.dropped_events = 0
+        self._dispatch_task = None
+        
+        # Last trade id seen per symbol, used to detect missed trade events
+        self._last_trade_id: Dict[str, int] = {}
+        
+        # Latest best bid/ask per symbol from bookTicker events: symbol -> (bid, ask, monotonic time)
+        self.top_of_book: Dict[str, Tuple[float, float, float]] = {}
+        # Symbols whose bookTicker stream has been requested by track_top_of_book
+        self._book_ticker_symbols: set = set()
+        self._background_tasks: set = set()
+        
+        # Subscription requests awaiting their acknowledgement from the reader task: id -> Future
+        self._pending_requests: Dict[int, asyncio.Future] = {}
+        self._request_ids = itertools.count(1)
     
     async def connect(self) -> bool:
         """
@@ -95,8 +126,10 @@ class BluefinWebSocketManager:
             self.reconnect_attempts = 0
             self.last_message_time = time.time()
             
-            # Start message processor
+            # Start message processor and event handler dispatcher
             asyncio.create_task(self._process_messages())
+            if self._dispatch_task is None or self._dispatch_task.done():
+                self._dispatch_task = asyncio.create_task(self._dispatch_events())
             
             # Start heartbeat
             self._start_heartbeat()
@@ -116,6 +149,11 @@ class BluefinWebSocketManager:
             self.heartbeat_task.cancel()
             self.heartbeat_task = None
         
+        # Stop event handler dispatcher
+        if self._dispatch_task:
+            self._dispatch_task.cancel()
+            self._dispatch_task = None
+        
         # Close WebSocket
         if self.websocket:
             await self.websocket.close()
@@ -172,25 +210,13 @@ class BluefinWebSocketManager:
             streams = [streams]
         
         try:
-            # Create subscription message
-            message = {
-                "method": "SUBSCRIBE",
-                "params": streams,
-                "id": int(time.time())
-            }
-            
-            # Send subscription request
-            await self.websocket.send(json.dumps(message))
             logger.info(f"Subscription request sent for streams: {', '.join(streams)}")
-            
-            # Wait for subscription response
-            response = await asyncio.wait_for(self.websocket.recv(), timeout=5.0)
-            response_data = json.loads(response)
+            response_data = await self._request("SUBSCRIBE", streams)
             
             # Check for successful subscription
             if "result" in response_data and response_data["result"] is None:
                 logger.info(f"Successfully subscribed to streams: {', '.join(streams)}")
-                self.subscribed_streams.extend(streams)
+                self.subscribed_streams.extend(s for s in streams if s not in self.subscribed_streams)
                 return True
             else:
                 logger.error(f"Subscription failed: {response_data}")
@@ -217,20 +243,8 @@ class BluefinWebSocketManager:
             streams = [streams]
         
         try:
-            # Create unsubscription message
-            message = {
-                "method": "UNSUBSCRIBE",
-                "params": streams,
-                "id": int(time.time())
-            }
-            
-            # Send unsubscription request
-            await self.websocket.send(json.dumps(message))
             logger.info(f"Unsubscription request sent for streams: {', '.join(streams)}")
-            
-            # Wait for unsubscription response
-            response = await asyncio.wait_for(self.websocket.recv(), timeout=5.0)
-            response_data = json.loads(response)
+            response_data = await self._request("UNSUBSCRIBE", streams)
             
             # Check for successful unsubscription
             if "result" in response_data and response_data["result"] is None:
@@ -246,6 +260,49 @@ class BluefinWebSocketManager:
             logger.error(f"Error during unsubscription: {str(e)}")
             return False
     
+    async def _request(self, method: str, streams: List[str]) -> Dict[str, Any]:
+        """
+        Send a request and wait for its acknowledgement.
+        
+        The reader task owns recv(), so the reply is routed back by request id
+        instead of being read here.
+        
+        Args:
+            method: Request method (e.g., "SUBSCRIBE")
+            streams: Stream names the request applies to
+        
+        Returns:
+            Dict[str, Any]: The acknowledgement message
+        """
+        request_id = next(self._request_ids)
+        reply = asyncio.get_running_loop().create_future()
+        self._pending_requests[request_id] = reply
+        try:
+            await self.websocket.send(json.dumps({"method": method, "params": streams, "id": request_id}))
+            return await asyncio.wait_for(reply, timeout=REQUEST_TIMEOUT)
+        finally:
+            self._pending_requests.pop(request_id, None)
+    
+    def track_top_of_book(self, symbol: str) -> None:
+        """
+        Start streaming best bid/ask for a symbol in the background, once.
+        
+        Args:
+            symbol: Market symbol (e.g., "BTC-PERP")
+        """
+        if symbol in self._book_ticker_symbols or not self.running:
+            return
+        self._book_ticker_symbols.add(symbol)
+        task = asyncio.create_task(self._subscribe_book_ticker(symbol))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    async def _subscribe_book_ticker(self, symbol: str) -> None:
+        """Subscribe to a symbol's bookTicker stream, allowing a later retry on failure."""
+        stream = f"{symbol.replace('-', '').lower()}@bookTicker"
+        if not await self.subscribe(stream):
+            self._book_ticker_symbols.discard(symbol)
+    
     async def _process_messages(self) -> None:
         """Process incoming WebSocket messages."""
         if not self.websocket:
@@ -260,22 +317,102 @@ class BluefinWebSocketManager:
                 # Parse message
                 data = json.loads(message)
                 
-                # Add to queue
-                await self.message_queue.put(data)
+                # Acknowledgements go back to the subscribe/unsubscribe call waiting on them
+                reply = self._pending_requests.get(data.get("id")) if "result" in data else None
+                if reply is not None:
+                    if not reply.done():
+                        reply.set_result(data)
+                    continue
                 
-                # Trigger event handlers
-                await self._trigger_event_handlers(data)
+                self._update_top_of_book(data)
+                self._check_trade_sequence(data)
+                
+                # Hand off to consumers and handlers without ever blocking the reader
+                if self._message_consumers and self._enqueue(self.message_queue, data):
+                    self.dropped_messages += 1
+                    self._log_dropped("messages() consumers", self.dropped_messages)
+                if self.event_handlers and self._enqueue(self._event_queue, data):
+                    self.dropped_events += 1
+                    self._log_dropped("event handlers", self.dropped_events)
             except asyncio.CancelledError:
                 # Task was cancelled
                 break
             except Exception as e:
                 logger.error(f"Error processing WebSocket message: {str(e)}")
                 
-                # Attempt to reconnect
+                # Attempt to reconnect; a successful connect() starts a fresh reader task
                 if self.running:
-                    reconnected = await self.reconnect()
-                    if not reconnected:
-                        break
+                    await self.reconnect()
+                break
+    
+    @staticmethod
+    def _enqueue(queue: asyncio.Queue, data: Dict[str, Any]) -> bool:
+        """
+        Add a message to a bounded queue, dropping the oldest message when it is full.
+        
+        Returns:
+            bool: True if a message had to be dropped
+        """
+        dropped = queue.full()
+        if dropped:
+            queue.get_nowait()
+            queue.task_done()
+        queue.put_nowait(data)
+        return dropped
+    
+    @staticmethod
+    def _log_dropped(consumer: str, count: int) -> None:
+        """Warn about dropped messages on the first drop and every thousandth after."""
+        if count == 1 or count % 1000 == 0:
+            logger.warning("WebSocket %s are falling behind; %d messages dropped so far", consumer, count)
+    
+    def _check_trade_sequence(self, data: Dict[str, Any]) -> None:
+        """Log a warning when a trade event's id skips ahead of the previous one for its symbol."""
+        if data.get("e") != "trade":
+            return
+        symbol = data.get("s")
+        trade_id = data.get("t")
+        if symbol is None or not isinstance(trade_id, int):
+            return
+        last_id = self._last_trade_id.get(symbol)
+        if last_id is not None and trade_id > last_id + 1:
+            logger.warning("Missed %d trade event(s) for %s (ids %d-%d)", trade_id - last_id - 1, symbol, last_id + 1, trade_id - 1)
+        self._last_trade_id[symbol] = trade_id
+    
+    async def _dispatch_events(self) -> None:
+        """Run event handlers for queued messages, off the socket reader task."""
+        while True:
+            try:
+                data = await self._event_queue.get()
+                await self._trigger_event_handlers(data)
+                self._event_queue.task_done()
+            except asyncio.CancelledError:
+                break
+    
+    def _update_top_of_book(self, data: Dict[str, Any]) -> None:
+        """Record the best bid/ask carried by a bookTicker event."""
+        if data.get("e") != "bookTicker":
+            return
+        try:
+            self.top_of_book[data["s"]] = (float(data["b"]), float(data["a"]), time.monotonic())
+        except (KeyError, TypeError, ValueError):
+            logger.debug("Ignoring malformed bookTicker event: %s", data)
+    
+    def get_top_of_book(self, symbol: str, max_age: float = TOP_OF_BOOK_MAX_AGE) -> Optional[Tuple[float, float]]:
+        """
+        Get the latest streamed best bid and ask for a symbol.
+        
+        Args:
+            symbol: Symbol as it appears in the stream events (e.g., "BTC-PERP")
+            max_age: Maximum age of the quote in seconds
+        
+        Returns:
+            Tuple[float, float]: (bid, ask), or None if no fresh quote is available
+        """
+        quote = self.top_of_book.get(symbol)
+        if quote is None or time.monotonic() - quote[2] > max_age:
+            return None
+        return quote[0], quote[1]
     
     async def messages(self) -> AsyncGenerator[Dict[str, Any], None]:
         """
@@ -284,13 +421,22 @@ class BluefinWebSocketManager:
         Yields:
             Dict[str, Any]: WebSocket message
         """
-        while self.running:
-            try:
-                message = await self.message_queue.get()
-                yield message
-                self.message_queue.task_done()
-            except asyncio.CancelledError:
-                break
+        self._message_consumers += 1
+        try:
+            while self.running:
+                try:
+                    message = await self.message_queue.get()
+                    yield message
+                    self.message_queue.task_done()
+                except asyncio.CancelledError:
+                    break
+        finally:
+            self._message_consumers -= 1
+            if not self._message_consumers:
+                # Nobody is reading any more; don't hand stale messages to the next consumer
+                while not self.message_queue.empty():
+                    self.message_queue.get_nowait()
+                    self.message_queue.task_done()
     
     def _start_heartbeat(self) -> None:
         """Start the heartbeat task to keep the connection alive."""
@@ -326,6 +472,9 @@ class BluefinWebSocketManager:
             self.event_handlers[event_type] = []
         
         self.event_handlers[event_type].append(callback)
+        self._handler_table[event_type] = tuple(
+            (handler, asyncio.iscoroutinefunction(handler)) for handler in self.event_handlers[event_type]
+        )
         logger.info(f"Registered event handler for {event_type}")
     
     async def _trigger_event_handlers(self, data: Dict[str, Any]) -> None:
@@ -338,15 +487,14 @@ class BluefinWebSocketManager:
         # Check if message has an event type
         event_type = data.get("e")
         
-        if event_type and event_type in self.event_handlers:
-            for callback in self.event_handlers[event_type]:
-                try:
-                    if asyncio.iscoroutinefunction(callback):
-                        await callback(data)
-                    else:
-                        callback(data)
-                except Exception as e:
-                    logger.error(f"Error in event handler for {event_type}: {str(e)}")
+        for callback, is_coroutine in self._handler_table.get(event_type, ()):
+            try:
+                if is_coroutine:
+                    await callback(data)
+                else:
+                    callback(data)
+            except Exception as e:
+                logger.error(f"Error in event handler for {event_type}: {str(e)}")
 
 
 async def example():
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Tests for the Bluefin API client's market prices: the WebSocket top-of-book
+feed and the REST fallback.
+
+Run from src/backend with:
+    python -m unittest tests.test_bluefin_api_client
+"""
+
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from core.bluefin_api import client as client_module
+from core.bluefin_api.client import BluefinApiClient, create_bluefin_client
+from core.bluefin_api.websocket import BluefinWebSocketManager
+
+
+class TestMarketPriceFeed(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.client = BluefinApiClient(api_key="key", api_secret="secret")
+        self.client._request = AsyncMock(return_value=[{"price": "1.5"}])
+
+    async def test_fresh_quote_skips_rest(self):
+        feed = MagicMock()
+        feed.get_top_of_book.return_value = (1.0, 2.0)
+        self.client.attach_price_feed(feed)
+
+        self.assertEqual(await self.client.get_market_price("SUI-PERP"), 1.5)
+        self.client._request.assert_not_awaited()
+        feed.track_top_of_book.assert_not_called()
+
+    async def test_missing_quote_falls_back_to_rest_and_starts_streaming(self):
+        feed = MagicMock()
+        feed.get_top_of_book.return_value = None
+        self.client.attach_price_feed(feed)
+
+        self.assertEqual(await self.client.get_market_price("SUI-PERP"), 1.5)
+        self.client._request.assert_awaited_once()
+        feed.track_top_of_book.assert_called_once_with("SUI-PERP")
+
+    async def test_without_feed_prices_come_from_rest(self):
+        self.assertEqual(await self.client.get_market_price("SUI-PERP"), 1.5)
+        self.client._request.assert_awaited_once()
+
+    async def test_stale_streamed_quote_is_ignored(self):
+        feed = BluefinWebSocketManager(url="wss://example.invalid/ws")
+        feed.top_of_book["SUI-PERP"] = (1.0, 2.0, time.monotonic() - 60)
+        self.assertIsNone(feed.get_top_of_book("SUI-PERP", max_age=1.0))
+
+        feed.top_of_book["SUI-PERP"] = (1.0, 2.0, time.monotonic())
+        self.assertEqual(feed.get_top_of_book("SUI-PERP", max_age=1.0), (1.0, 2.0))
+
+
+class TestCreateBluefinClient(unittest.IsolatedAsyncioTestCase):
+
+    async def test_price_feed_is_opt_in(self):
+        with patch.object(client_module, "BluefinWebSocketManager") as manager:
+            client = await create_bluefin_client(api_key="key", api_secret="secret")
+        manager.assert_not_called()
+        self.assertIsNone(client.price_feed)
+
+    async def test_unreachable_feed_keeps_rest(self):
+        with patch.object(client_module, "WEBSOCKETS_AVAILABLE", True), \
+             patch.object(client_module, "BluefinWebSocketManager") as manager:
+            manager.return_value.connect = AsyncMock(return_value=False)
+            client = await create_bluefin_client(api_key="key", api_secret="secret", use_price_feed=True)
+        self.assertIsNone(client.price_feed)
+
+
+if __name__ == "__main__":
+    unittest.main()
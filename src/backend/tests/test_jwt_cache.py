@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Tests for the webhook server's cache of validated JWT payloads.
+
+Run from src/backend with:
+    python -m unittest tests.test_jwt_cache
+"""
+
+import unittest
+from unittest.mock import patch
+
+import jwt
+
+import app as webhook_app
+
+
+class TestDecodeCached(unittest.TestCase):
+
+    NOW = 1_700_000_000.0
+
+    def setUp(self):
+        webhook_app._jwt_cache.clear()
+
+    def tearDown(self):
+        webhook_app._jwt_cache.clear()
+
+    def decode_at(self, token, now, decode):
+        with patch.object(webhook_app.time, "time", return_value=now), \
+             patch.object(webhook_app.jwt, "decode", decode):
+            return webhook_app._decode_cached(token)
+
+    def test_valid_token_is_decoded_once_within_ttl(self):
+        payload = {"user_id": "admin", "exp": self.NOW + 3600}
+        with patch.object(webhook_app.jwt, "decode", return_value=payload) as decode:
+            self.assertEqual(self.decode_at("token", self.NOW, decode), payload)
+            self.assertEqual(self.decode_at("token", self.NOW + webhook_app.JWT_CACHE_TTL - 1, decode), payload)
+        self.assertEqual(decode.call_count, 1)
+
+    def test_entry_expires_after_ttl(self):
+        payload = {"user_id": "admin", "exp": self.NOW + 3600}
+        with patch.object(webhook_app.jwt, "decode", return_value=payload) as decode:
+            self.decode_at("token", self.NOW, decode)
+            self.decode_at("token", self.NOW + webhook_app.JWT_CACHE_TTL + 1, decode)
+        self.assertEqual(decode.call_count, 2)
+
+    def test_entry_never_outlives_token_exp(self):
+        payload = {"user_id": "admin", "exp": self.NOW + 5}
+        with patch.object(webhook_app.jwt, "decode", return_value=payload) as decode:
+            self.decode_at("token", self.NOW, decode)
+            decode.side_effect = jwt.ExpiredSignatureError("Signature has expired")
+            with self.assertRaises(jwt.ExpiredSignatureError):
+                self.decode_at("token", self.NOW + 6, decode)
+        self.assertEqual(decode.call_count, 2)
+
+    def test_invalid_token_is_not_cached(self):
+        with patch.object(webhook_app.jwt, "decode", side_effect=jwt.InvalidTokenError("bad")) as decode:
+            with self.assertRaises(jwt.InvalidTokenError):
+                self.decode_at("token", self.NOW, decode)
+        self.assertEqual(webhook_app._jwt_cache, {})
+
+    def test_raw_token_is_not_stored(self):
+        payload = {"user_id": "admin", "exp": self.NOW + 3600}
+        with patch.object(webhook_app.jwt, "decode", return_value=payload) as decode:
+            self.decode_at("secret-token", self.NOW, decode)
+        self.assertNotIn("secret-token", webhook_app._jwt_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
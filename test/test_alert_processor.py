@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+Tests for alert file processing in the trading agent: retries of alerts whose
+trade was never submitted, and dead-lettering of everything else.
+
+Run with:
+    python -m unittest test.test_alert_processor
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from core import agent
+
+
+class AlertDirTestCase(unittest.IsolatedAsyncioTestCase):
+    """Runs each test in a scratch working directory with an alerts/ folder."""
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        os.makedirs("alerts")
+        agent._alert_attempts.clear()
+
+    def tearDown(self):
+        agent._alert_attempts.clear()
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def write_alert(self, name="alert_1.json"):
+        path = os.path.join("alerts", name)
+        with open(path, "w") as f:
+            json.dump({"symbol": "SUI-PERP", "type": "buy"}, f)
+        return path
+
+    def dead_letters(self):
+        if not os.path.isdir(agent.ALERT_DEAD_LETTER_DIR):
+            return []
+        return os.listdir(agent.ALERT_DEAD_LETTER_DIR)
+
+
+class TestProcessAlerts(AlertDirTestCase):
+
+    async def test_handled_alert_is_deleted(self):
+        path = self.write_alert()
+        with patch.object(agent, "handle_alert", AsyncMock(return_value=True)):
+            await agent.process_alerts()
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(self.dead_letters(), [])
+
+    async def test_unsubmitted_trade_is_retried_then_dead_lettered(self):
+        path = self.write_alert()
+        handle = AsyncMock(side_effect=agent.TradeNotSubmitted("SUI-PERP: timeout"))
+        with patch.object(agent, "handle_alert", handle):
+            for attempt in range(1, agent.ALERT_MAX_ATTEMPTS):
+                await agent.process_alerts()
+                self.assertTrue(os.path.exists(path))
+                self.assertEqual(agent._alert_attempts[path], attempt)
+            await agent.process_alerts()
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(self.dead_letters(), ["alert_1.json"])
+        self.assertEqual(handle.await_count, agent.ALERT_MAX_ATTEMPTS)
+
+    async def test_failed_trade_is_dead_lettered_without_retry(self):
+        path = self.write_alert()
+        with patch.object(agent, "handle_alert", AsyncMock(return_value=False)):
+            await agent.process_alerts()
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(self.dead_letters(), ["alert_1.json"])
+        self.assertEqual(agent._alert_attempts, {})
+
+    async def test_unexpected_error_is_dead_lettered_without_retry(self):
+        path = self.write_alert()
+        with patch.object(agent, "handle_alert", AsyncMock(side_effect=ValueError("bad alert"))):
+            await agent.process_alerts()
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(self.dead_letters(), ["alert_1.json"])
+
+    async def test_attempts_are_pruned_for_removed_files(self):
+        path = self.write_alert()
+        with patch.object(agent, "handle_alert", AsyncMock(side_effect=agent.TradeNotSubmitted("SUI-PERP"))):
+            await agent.process_alerts()
+        self.assertIn(path, agent._alert_attempts)
+
+        os.unlink(path)
+        await agent.process_alerts()
+        self.assertEqual(agent._alert_attempts, {})
+
+
+class TestHandleAlert(unittest.IsolatedAsyncioTestCase):
+
+    ALERT = {"symbol": "SUI-PERP", "type": "buy"}
+
+    async def test_unsubmitted_trade_propagates(self):
+        trade = AsyncMock(side_effect=agent.TradeNotSubmitted("SUI-PERP"))
+        with patch.object(agent, "MOCK_TRADING", False), patch.object(agent, "execute_trade", trade):
+            with self.assertRaises(agent.TradeNotSubmitted):
+                await agent.handle_alert("alerts/a.json", self.ALERT)
+
+    async def test_failed_trade_returns_false(self):
+        with patch.object(agent, "MOCK_TRADING", False), \
+             patch.object(agent, "execute_trade", AsyncMock(return_value=None)):
+            self.assertFalse(await agent.handle_alert("alerts/a.json", self.ALERT))
+
+    async def test_placed_trade_returns_true(self):
+        with patch.object(agent, "MOCK_TRADING", False), \
+             patch.object(agent, "execute_trade", AsyncMock(return_value={"id": "1"})):
+            self.assertTrue(await agent.handle_alert("alerts/a.json", self.ALERT))
+
+
+class TestExecuteTradeSubmission(unittest.IsolatedAsyncioTestCase):
+    """execute_trade only reports TradeNotSubmitted before an order is placed."""
+
+    def patches(self, market_price, place_order):
+        return (
+            patch.object(agent, "client", object()),
+            patch.object(agent, "ensure_leverage", AsyncMock(return_value=None)),
+            patch.object(agent, "get_market_price", market_price),
+            patch.object(agent, "_place_order_fn", place_order),
+        )
+
+    async def test_missing_price_raises_before_placing(self):
+        place_order = AsyncMock()
+        price = AsyncMock(side_effect=agent.MarketPriceUnavailable("SUI-PERP"))
+        p1, p2, p3, p4 = self.patches(price, place_order)
+        with p1, p2, p3, p4:
+            with self.assertRaises(agent.TradeNotSubmitted):
+                await agent.execute_trade("SUI-PERP", "BUY", position_size=1.0, leverage=2)
+        place_order.assert_not_awaited()
+
+    async def test_error_after_placing_is_not_retryable(self):
+        place_order = AsyncMock(side_effect=asyncio.TimeoutError())
+        p1, p2, p3, p4 = self.patches(AsyncMock(return_value=1.0), place_order)
+        with p1, p2, p3, p4:
+            result = await agent.execute_trade("SUI-PERP", "BUY", position_size=1.0, leverage=2)
+        self.assertIsNone(result)
+        place_order.assert_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Tests for ensure_leverage: caching, sharing of in-flight adjustments, and
+serialization of concurrent adjustments for one symbol.
+
+Run with:
+    python -m unittest test.test_leverage
+"""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from core import agent
+
+
+class TestEnsureLeverage(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        agent._leverage_cache.clear()
+        agent._leverage_inflight.clear()
+
+    def tearDown(self):
+        agent._leverage_cache.clear()
+        agent._leverage_inflight.clear()
+
+    async def test_confirmed_leverage_is_cached(self):
+        set_leverage = AsyncMock(return_value={"success": True})
+        with patch.object(agent, "_set_leverage_fn", set_leverage):
+            self.assertTrue(await agent.ensure_leverage("SUI-PERP", 5))
+            self.assertTrue(await agent.ensure_leverage("SUI-PERP", 5))
+        set_leverage.assert_awaited_once_with("SUI-PERP", 5)
+
+    async def test_identical_calls_share_one_request(self):
+        release = asyncio.Event()
+
+        async def set_leverage(symbol, leverage):
+            await release.wait()
+            return {"success": True}
+
+        set_mock = AsyncMock(side_effect=set_leverage)
+        with patch.object(agent, "_set_leverage_fn", set_mock):
+            calls = [asyncio.create_task(agent.ensure_leverage("SUI-PERP", 5)) for _ in range(3)]
+            await asyncio.sleep(0)
+            release.set()
+            self.assertEqual(await asyncio.gather(*calls), [True, True, True])
+        self.assertEqual(set_mock.await_count, 1)
+
+    async def test_different_leverage_waits_for_inflight_change(self):
+        active = 0
+        max_active = 0
+        applied = []
+
+        async def set_leverage(symbol, leverage):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            applied.append(leverage)
+            active -= 1
+            return {"success": True}
+
+        with patch.object(agent, "_set_leverage_fn", AsyncMock(side_effect=set_leverage)):
+            results = await asyncio.gather(
+                agent.ensure_leverage("SUI-PERP", 5),
+                agent.ensure_leverage("SUI-PERP", 10),
+            )
+        self.assertEqual(results, [True, True])
+        self.assertEqual(max_active, 1)
+        self.assertEqual(applied, [5, 10])
+        self.assertEqual(agent._leverage_cache["SUI-PERP"][1], 10)
+
+    async def test_waiter_takes_over_when_first_caller_is_cancelled(self):
+        started = asyncio.Event()
+        calls = 0
+
+        async def set_leverage(symbol, leverage):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                started.set()
+                await asyncio.sleep(10)
+            return {"success": True}
+
+        with patch.object(agent, "_set_leverage_fn", AsyncMock(side_effect=set_leverage)):
+            first = asyncio.create_task(agent.ensure_leverage("SUI-PERP", 5))
+            await started.wait()
+            second = asyncio.create_task(agent.ensure_leverage("SUI-PERP", 5))
+            await asyncio.sleep(0)
+            first.cancel()
+            self.assertTrue(await second)
+        self.assertTrue(first.cancelled())
+        self.assertEqual(calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
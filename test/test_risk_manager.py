@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+"""
+Tests for position sizing in the trading agent.
+
+Run with:
+    python -m unittest test.test_risk_manager
+"""
+
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from core import agent
+
+
+class TestLotStepRounding(unittest.TestCase):
+    """Position sizes are truncated to the lot step without float artifacts."""
+
+    def test_exact_sizes_keep_their_last_lot(self):
+        # Decimal(0.3) is 0.2999..., so quantizing the raw float used to lose a lot
+        for size in (0.3, 0.7, 2.3, 0.009):
+            self.assertEqual(agent.round_down_to_lot_step("BTC-PERP", size), size)
+
+    def test_rounds_down_to_lot_step(self):
+        self.assertEqual(agent.round_down_to_lot_step("BTC-PERP", 1.23456), 1.234)
+        self.assertEqual(agent.round_down_to_lot_step("SUI-PERP", 0.0019999), 0.001)
+
+    def test_unknown_symbol_uses_default_lot_step(self):
+        self.assertEqual(agent.round_down_to_lot_step("XYZ-PERP", 0.0015), 0.001)
+
+
+class TestCalculatePositionSize(unittest.IsolatedAsyncioTestCase):
+    """calculate_position_size returns lot-aligned sizes."""
+
+    async def test_exact_size_is_not_undersized(self):
+        # 300 USDC * 1% risk / (20 USD * 50% stop) = 0.3
+        with patch.object(agent, "_get_margin_balance", AsyncMock(return_value=300.0)), \
+             patch.object(agent, "get_market_price", AsyncMock(return_value=20.0)):
+            size = await agent.calculate_position_size(
+                "SUI-PERP", "BUY", risk_percentage=0.01, stop_loss_percentage=0.5
+            )
+        self.assertEqual(size, 0.3)
+
+
+if __name__ == "__main__":
+    unittest.main()